@@ -0,0 +1,295 @@
+"""
+Time the stages of yaml2sbml on synthetic models of increasing size.
+
+Run as `python benchmarks/benchmark_suite.py` (or `tox -e benchmarks`). The
+results are stored as JSON in `benchmarks/results/`, together with the
+versions and the git commit. Compare them to earlier results via
+`--compare <results.json>`, which reports every benchmark, that became
+slower by more than `--threshold`.
+
+Model families (see `model_generators.py`):
+    fsp: finite state projection, size = number of ODEs.
+    assignments: Sorensen-like, size = number of assignments.
+    conditions: size = number of conditions, with size / 10 observables.
+"""
+import argparse
+import copy
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import libsbml as sbml
+
+import yaml2sbml
+from yaml2sbml.formula_cache import FORMULA_CACHE
+from yaml2sbml.yaml2sbml import _load_yaml_file, _parse_yaml_dict
+from yaml2sbml.yaml2PEtab import _create_petab_tables_from_yaml
+from yaml2sbml.yaml_validation import _validate_yaml_from_dict
+
+from model_generators import create_fsp_model, create_assignment_model, \
+    create_condition_model
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'results')
+
+# model generators by family, taking the size as argument.
+FAMILIES = {
+    'fsp': lambda size: create_fsp_model(10, size // 10),
+    'assignments': create_assignment_model,
+    'conditions': lambda size: create_condition_model(size,
+                                                      max(size // 10, 1)),
+}
+
+# benchmarks, that got slower by less than this (in seconds), are not
+# reported as regressions, since timings of fast operations are noisy.
+MIN_REGRESSION_TIME = 1e-3
+
+SIZES = {
+    'quick': [100, 1000],
+    'full': [100, 1000, 10000],
+}
+
+
+def get_benchmarks(model: yaml2sbml.YamlModel, tmp_dir: str) -> dict:
+    """
+    Define the benchmarks for a model.
+
+    Arguments:
+        model: the synthetic model.
+        tmp_dir: directory for the files of the benchmarks.
+
+    Returns:
+        dict from the benchmark names to pairs of a function, that is timed,
+        and an optional setup function, whose result is passed to it.
+    """
+    yaml_file = os.path.join(tmp_dir, 'model.yaml')
+    model.write_to_yaml(yaml_file, overwrite=True)
+    yaml_dict = _load_yaml_file(yaml_file)
+
+    ode_ids = model.get_ode_ids()
+    odes = [model.get_ode_by_id(ode_id) for ode_id in ode_ids]
+
+    def add_odes(new_model):
+        for ode in odes:
+            new_model.add_ode(ode['stateId'], ode['rightHandSide'],
+                              ode['initialValue'])
+
+    def get_odes(_):
+        for ode_id in ode_ids:
+            model.get_ode_by_id(ode_id)
+
+    def delete_odes(model_copy):
+        for ode_id in ode_ids[::2]:
+            model_copy.delete_ode(ode_id)
+
+    return {
+        'load_yaml_file': (lambda _: _load_yaml_file(yaml_file), None),
+        'validate_yaml_from_dict':
+            (lambda _: _validate_yaml_from_dict(yaml_dict), None),
+        # parse all formulas again in each run
+        'parse_yaml_dict':
+            (lambda _: _parse_yaml_dict(yaml_dict, 'model'),
+             FORMULA_CACHE.clear),
+        'create_petab_tables_from_yaml':
+            (lambda _: _create_petab_tables_from_yaml(yaml_dict, tmp_dir,
+                                                      'model'), None),
+        'yaml_model_add_ode': (add_odes, yaml2sbml.YamlModel),
+        'yaml_model_get_ode_by_id': (get_odes, None),
+        'yaml_model_delete_ode': (delete_odes, lambda: copy.deepcopy(model)),
+    }
+
+
+def run_benchmark(function, setup, repeat: int) -> float:
+    """
+    Time a benchmark.
+
+    Arguments:
+        function: function, that is timed. Called with the result of `setup`.
+        setup: function, that prepares each run and is not timed, or None.
+        repeat: number of repetitions.
+
+    Returns:
+        the minimal wall time in seconds.
+    """
+    times = []
+
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+
+        start_time = time.perf_counter()
+        function(argument)
+        times.append(time.perf_counter() - start_time)
+
+    return min(times)
+
+
+def run_suite(families: list, sizes: list, benchmarks: list,
+              repeat: int) -> list:
+    """
+    Run the benchmarks for all families and sizes.
+
+    Arguments:
+        families: names of the model families, see `FAMILIES`.
+        sizes: sizes of the models.
+        benchmarks: names of the benchmarks, None for all.
+        repeat: number of repetitions, the minimum is reported.
+
+    Returns:
+        results: one dict per benchmark, family and size with the keys
+            'family', 'size', 'benchmark' and 'time' (in seconds).
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            warnings.catch_warnings():
+        # e.g. that observables are not part of the SBML
+        warnings.simplefilter('ignore')
+
+        # import the dependencies and compile the schema, before timing.
+        for (function, setup) in \
+                get_benchmarks(FAMILIES['conditions'](10), tmp_dir).values():
+            run_benchmark(function, setup, 1)
+
+        for family in families:
+            for size in sizes:
+                model = FAMILIES[family](size)
+
+                for (name, (function, setup)) in \
+                        get_benchmarks(model, tmp_dir).items():
+                    if benchmarks and name not in benchmarks:
+                        continue
+
+                    benchmark_time = run_benchmark(function, setup, repeat)
+                    results.append({'family': family,
+                                    'size': size,
+                                    'benchmark': name,
+                                    'time': benchmark_time})
+                    print(f'{family:<12} {size:>6} {name:<30} '
+                          f'{benchmark_time:>9.4f} s')
+
+    return results
+
+
+def get_metadata() -> dict:
+    """Collect the versions and the machine, that the results belong to."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            universal_newlines=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'yaml2sbml': yaml2sbml.__version__,
+            'libsbml': sbml.getLibSBMLDottedVersion(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor()}
+
+
+def compare_results(results: list, reference: list,
+                    threshold: float) -> list:
+    """
+    Compare results to reference results.
+
+    Arguments:
+        results: results of `run_suite`.
+        reference: earlier results of `run_suite`.
+        threshold: ratio of the times, above which a benchmark is
+            considered as regression, e.g. 1.2 for 20% slower. See also
+            `MIN_REGRESSION_TIME`.
+
+    Returns:
+        regressions: descriptions of the slower benchmarks.
+    """
+    reference_times = {(result['family'], result['size'],
+                        result['benchmark']): result['time']
+                       for result in reference}
+    regressions = []
+
+    for result in results:
+        key = (result['family'], result['size'], result['benchmark'])
+        if key not in reference_times:
+            continue
+
+        ratio = result['time'] / reference_times[key]
+        description = f'{key[0]:<12} {key[1]:>6} {key[2]:<30} ' \
+                      f'{reference_times[key]:>9.4f} s -> ' \
+                      f'{result["time"]:>9.4f} s ({ratio:.2f}x)'
+        print(description)
+
+        if ratio > threshold and \
+                result['time'] - reference_times[key] > MIN_REGRESSION_TIME:
+            regressions.append(description)
+
+    return regressions
+
+
+def main():
+    """Run the suite, store the results and compare them, if requested."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-f', '--families', nargs='+', default=list(FAMILIES),
+                        choices=list(FAMILIES),
+                        help='model families, defaults to all.')
+    parser.add_argument('-s', '--sizes', nargs='+', type=int, default=None,
+                        help='model sizes, defaults to the sizes of '
+                             '--quick or of the full suite.')
+    parser.add_argument('-b', '--benchmarks', nargs='+', default=None,
+                        help='names of the benchmarks, defaults to all.')
+    parser.add_argument('--quick', action='store_true',
+                        help='only run the small sizes.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of repetitions.')
+    parser.add_argument('-o', '--output', type=str, default=None,
+                        help='JSON file for the results, defaults to '
+                             'benchmarks/results/<date>_<commit>.json.')
+    parser.add_argument('--compare', type=str, default=None,
+                        help='JSON file with earlier results.')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='ratio of the times, that is reported as '
+                             'regression by --compare. Defaults to 1.2.')
+    args = parser.parse_args()
+
+    sizes = args.sizes or SIZES['quick' if args.quick else 'full']
+    metadata = get_metadata()
+    results = run_suite(args.families, sizes, args.benchmarks, args.repeat)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(
+            RESULTS_DIR,
+            f'{metadata["date"].replace(":", "-")}_{metadata["commit"]}.json')
+
+    with open(output, 'w') as f_out:
+        json.dump({'metadata': metadata, 'results': results}, f_out,
+                  indent=2)
+    print(f'Results were written to {output}.')
+
+    if args.compare is not None:
+        with open(args.compare, 'r') as f_in:
+            reference = json.load(f_in)
+
+        print(f'Comparison to {args.compare} '
+              f'(commit {reference["metadata"]["commit"]}):')
+        regressions = compare_results(results, reference['results'],
+                                      args.threshold)
+
+        if regressions:
+            print(f'{len(regressions)} benchmark(s) are slower by more than '
+                  f'a factor of {args.threshold}:')
+            print('\n'.join(regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
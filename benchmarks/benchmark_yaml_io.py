@@ -0,0 +1,87 @@
+"""
+Compare the YAML loader and dumper of yaml2sbml with the pure-Python ones.
+
+Run as `python benchmarks/benchmark_yaml_io.py`. Models are the Sorensen
+example and a synthetic finite state projection (FSP) model, as in the
+documentation.
+"""
+import argparse
+import os
+import tempfile
+import timeit
+
+import yaml
+
+from yaml2sbml.file_io import _load_yaml, _dump_yaml, _YamlLoader
+
+from model_generators import create_fsp_model
+
+SORENSEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                        'doc', 'examples', 'Sorensen', 'Sorensen1985.yaml')
+
+
+def benchmark_yaml_io(yaml_file: str, repeat: int) -> dict:
+    """
+    Time loading and dumping a YAML file with both implementations.
+
+    Arguments:
+        yaml_file: path to the YAML model.
+        repeat: number of repetitions, the minimum is reported.
+
+    Returns:
+        times in seconds for loading and dumping with the pure-Python
+        implementation (`yaml.full_load`/`yaml.dump`) and yaml2sbml.
+    """
+    with open(yaml_file, 'r') as f_in:
+        yaml_contents = f_in.read()
+
+    yaml_dict = yaml.full_load(yaml_contents)
+    assert _load_yaml(yaml_contents) == yaml_dict
+
+    def get_time(function):
+        return min(timeit.repeat(function, number=1, repeat=repeat))
+
+    return {
+        'load_python': get_time(lambda: yaml.full_load(yaml_contents)),
+        'load_yaml2sbml': get_time(lambda: _load_yaml(yaml_contents)),
+        'dump_python': get_time(lambda: yaml.dump(yaml_dict,
+                                                  sort_keys=False)),
+        'dump_yaml2sbml': get_time(lambda: _dump_yaml(yaml_dict,
+                                                      sort_keys=False)),
+    }
+
+
+def main():
+    """Run the benchmark and print a table of the timings."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--r_max', type=int, default=20,
+                        help='mRNA abundances of the FSP model.')
+    parser.add_argument('--p_max', type=int, default=200,
+                        help='protein abundances of the FSP model.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of repetitions.')
+    args = parser.parse_args()
+
+    print(f'yaml2sbml uses {_YamlLoader.__name__}.')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fsp_file = os.path.join(tmp_dir, 'fsp.yaml')
+        create_fsp_model(args.r_max, args.p_max).write_to_yaml(fsp_file)
+
+        for (name, yaml_file) in [('Sorensen', SORENSEN),
+                                  (f'FSP {args.r_max}x{args.p_max}',
+                                   fsp_file)]:
+            times = benchmark_yaml_io(yaml_file, args.repeat)
+            size = os.path.getsize(yaml_file) / 1024 ** 2
+
+            print(f'{name} ({size:.2f} MB):')
+            for operation in ['load', 'dump']:
+                python_time = times[f'{operation}_python']
+                yaml2sbml_time = times[f'{operation}_yaml2sbml']
+                print(f'    {operation}: {python_time:.3f} s -> '
+                      f'{yaml2sbml_time:.3f} s '
+                      f'({python_time / yaml2sbml_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
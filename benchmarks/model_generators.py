@@ -0,0 +1,146 @@
+"""
+Synthetic YAML models of adjustable size for the benchmarks.
+
+Each generator returns a `YamlModel`. The families resemble the models of
+the documentation: finite state projections (many coupled ODEs),
+Sorensen-like models (many assignments) and models for parameter
+estimation with many conditions and observables.
+"""
+from itertools import product
+
+from yaml2sbml import YamlModel
+
+
+def create_fsp_model(r_max: int, p_max: int) -> YamlModel:
+    """
+    Create the FSP model of gene expression of the documentation.
+
+    Arguments:
+        r_max: number of mRNA abundances.
+        p_max: number of protein abundances.
+
+    Returns:
+        model: YamlModel with `r_max * p_max` ODEs.
+    """
+    model = YamlModel()
+
+    model.add_parameters(['k_1', 'k_2', 'k_3', 'k_4'],
+                         nominal_values=[2, 1, 10, 3])
+
+    state_ids = []
+    right_hand_sides = []
+
+    for r, p in product(range(r_max), range(p_max)):
+        rhs = f'-(k_1 + (k_2 + k_3)*{r} + k_4*{p}) * x_{r}_{p}'
+
+        if r > 0:
+            rhs += f' + k_1 * x_{r-1}_{p}'
+        if r + 1 < r_max:
+            rhs += f' + k_2 * {r+1} * x_{r+1}_{p}'
+        if p > 0:
+            rhs += f' + k_3 * {r} * x_{r}_{p-1}'
+        if p + 1 < p_max:
+            rhs += f' + k_4 * {p+1} * x_{r}_{p+1}'
+
+        state_ids.append(f'x_{r}_{p}')
+        right_hand_sides.append(rhs)
+
+    model.add_odes(state_ids, right_hand_sides, initial_values=0)
+
+    return model
+
+
+def create_assignment_model(n_assignments: int) -> YamlModel:
+    """
+    Create a model, that consists mostly of assignments, as Sorensen1985.
+
+    Each compartment `i` has a state `c_i`, whose ODE uses the flux
+    assignment `flux_i`. Every flux is computed from a chain of assignments
+    with rational functions, such that there are `n_assignments` in total.
+
+    Arguments:
+        n_assignments: number of assignments, a multiple of 4.
+
+    Returns:
+        model: YamlModel with `n_assignments / 4` ODEs.
+    """
+    model = YamlModel()
+    n_states = max(n_assignments // 4, 1)
+
+    model.add_parameters(['v_max', 'k_m', 'q', 'r'],
+                         nominal_values=[1.5, 0.3, 2, 0.1])
+
+    assignment_ids = []
+    formulas = []
+    state_ids = []
+    right_hand_sides = []
+
+    for i in range(n_states):
+        j = (i + 1) % n_states
+
+        assignment_ids.extend([f'gradient_{i}', f'saturation_{i}',
+                               f'hill_{i}', f'flux_{i}'])
+        formulas.extend([f'c_{i} - c_{j}',
+                         f'c_{i} / (k_m + c_{i})',
+                         f'saturation_{i}^q / (1 + saturation_{i}^q)',
+                         f'v_max * hill_{i} * gradient_{i}'])
+
+        state_ids.append(f'c_{i}')
+        right_hand_sides.append(f'-flux_{i} + r * flux_{(i - 1) % n_states}')
+
+    model.add_assignments(assignment_ids, formulas)
+    model.add_odes(state_ids, right_hand_sides, initial_values=1)
+
+    return model
+
+
+def create_condition_model(n_conditions: int,
+                           n_observables: int,
+                           n_states: int = 10) -> YamlModel:
+    """
+    Create a model with many experimental conditions and observables.
+
+    Each condition sets the initial values of all states, each observable
+    is a scaled sum of two states.
+
+    Arguments:
+        n_conditions: number of conditions.
+        n_observables: number of observables.
+        n_states: number of states in a linear chain.
+
+    Returns:
+        model: YamlModel with `n_conditions` conditions and `n_observables`
+            observables.
+    """
+    model = YamlModel()
+
+    rate_ids = [f'k_{i}' for i in range(n_states)]
+    init_ids = [f'init_{i}' for i in range(n_states)]
+    model.add_parameters(rate_ids + init_ids + ['scale', 'sigma'],
+                         nominal_values=1,
+                         parameter_scales='log10',
+                         lower_bounds=1e-3,
+                         upper_bounds=1e3,
+                         estimates=1)
+
+    right_hand_sides = ['-k_0 * x_0']
+    right_hand_sides.extend(f'k_{i - 1} * x_{i - 1} - k_{i} * x_{i}'
+                            for i in range(1, n_states))
+    model.add_odes([f'x_{i}' for i in range(n_states)],
+                   right_hand_sides,
+                   initial_values=init_ids)
+
+    model.add_observables(
+        [f'y_{i}' for i in range(n_observables)],
+        [f'scale * (x_{i % n_states} + x_{(i + 1) % n_states})'
+         for i in range(n_observables)],
+        'sigma',
+        observable_transformations='log',
+        noise_distributions='normal')
+
+    for i in range(n_conditions):
+        model.add_condition(f'condition_{i}',
+                            {init_id: (i + k) % 7 + 1
+                             for (k, init_id) in enumerate(init_ids)})
+
+    return model
@@ -1,6 +1,8 @@
 import os
 import shutil
+import threading
 
+from yaml2sbml.server import _create_server, TOKEN_VARIABLE
 from yaml2sbml.yaml2sbml import _parse_yaml
 
 
@@ -31,6 +33,25 @@ def test_yaml2sbml_cli(script_runner):
     os.remove(sbml_dir)
 
 
+def test_yaml2sbml_cli_check_level(script_runner):
+    """Test the option `--check_level` of the command `yaml2sbml`."""
+    path = os.path.dirname(os.path.abspath(__file__))
+
+    yaml_dir = os.path.join(path, 'test_yaml2sbml', 'ode_input1.yaml')
+    sbml_dir = os.path.join(path, 'test_sbml.xml')
+
+    ret = script_runner.run(['yaml2sbml', yaml_dir, sbml_dir,
+                             '--check_level', 'identifiers'])
+    assert ret.success
+    assert 'SBML consistency check (identifiers) took' in ret.stdout
+
+    ret = script_runner.run(['yaml2sbml', yaml_dir, sbml_dir, '-c', 'none'])
+    assert ret.success
+    assert 'SBML consistency check' not in ret.stdout
+
+    os.remove(sbml_dir)
+
+
 def test_yaml2petab_cli(script_runner):
     """Test the command line command `yaml2petab."""
     path = os.path.dirname(os.path.abspath(__file__))
@@ -59,3 +80,178 @@ def test_yaml2sbml_validate_cli(script_runner):
     yaml_dir = os.path.join(path, 'test_yaml2sbml/ode_input1.yaml')
 
     script_runner.run('yaml2sbml_validate', yaml_dir)
+
+
+def test_profile_cli(script_runner, tmp_path):
+    """Test the option `--profile` of the commands."""
+    path = os.path.dirname(os.path.abspath(__file__))
+    yaml_dir = os.path.join(path, 'test_yaml2sbml', 'ode_input2.yaml')
+
+    ret = script_runner.run(['yaml2sbml', yaml_dir,
+                             str(tmp_path / 'model.xml'), '--profile'])
+    assert ret.success
+    for stage in ['load YAML', 'validate schema', 'build SBML',
+                  'check consistency', 'write SBML']:
+        assert stage in ret.stdout
+
+    ret = script_runner.run(['yaml2petab', yaml_dir, str(tmp_path),
+                             'model.xml', '--profile'])
+    assert ret.success
+    assert 'lint PEtab tables' in ret.stdout
+
+    ret = script_runner.run(['yaml2sbml_validate', yaml_dir, '--profile'])
+    assert ret.success
+    assert 'validate schema' in ret.stdout
+
+    ret = script_runner.run(['yaml2sbml_validate', yaml_dir])
+    assert 'validate schema' not in ret.stdout
+
+
+def test_yaml2sbml_cache_cli(script_runner, tmp_path):
+    """Test the command line command `yaml2sbml_cache`."""
+    path = os.path.dirname(os.path.abspath(__file__))
+    yaml_dir = os.path.join(path, 'test_yaml2sbml', 'ode_input1.yaml')
+    sbml_dir = os.path.join(str(tmp_path), 'test_sbml.xml')
+    cache_dir = os.path.join(str(tmp_path), 'cache')
+
+    script_runner.run(['yaml2sbml', yaml_dir, sbml_dir,
+                       '--cache_dir', cache_dir])
+
+    ret = script_runner.run(['yaml2sbml_cache', 'info',
+                             '--cache_dir', cache_dir])
+    assert ret.success
+    assert 'Number of entries: 1' in ret.stdout
+
+    ret = script_runner.run(['yaml2sbml_cache', 'clear',
+                             '--cache_dir', cache_dir])
+    assert ret.success
+
+
+def test_yaml2sbml_batch_cli(script_runner, tmp_path):
+    """Test the command line command `yaml2sbml_batch`."""
+    path = os.path.dirname(os.path.abspath(__file__))
+    yaml_dir = os.path.join(path, 'test_yaml2sbml')
+    output_dir = os.path.join(str(tmp_path), 'sbml')
+
+    # manifest with one valid and one invalid model
+    manifest_dir = os.path.join(str(tmp_path), 'manifest.txt')
+    with open(manifest_dir, 'w') as f_out:
+        f_out.write('# models\n')
+        f_out.write(os.path.join(yaml_dir, 'ode_input1.yaml') + '\n')
+        f_out.write(os.path.join(yaml_dir, 'ode_input_invalid_formula.yaml'))
+
+    ret = script_runner.run(['yaml2sbml_batch', '--manifest', manifest_dir,
+                             '-o', output_dir, '-j', '2'])
+    assert not ret.success
+    assert '1/2 models succeeded' in ret.stdout
+    assert os.path.isfile(os.path.join(output_dir, 'ode_input1.xml'))
+
+    ret = script_runner.run(['yaml2sbml_batch',
+                             os.path.join(yaml_dir, 'ode_input2.yaml'),
+                             '-m', 'validate'])
+    assert ret.success
+    assert '1/1 models succeeded' in ret.stdout
+
+
+def test_yaml2sbml_client_cli(script_runner, tmp_path):
+    """Test the command `yaml2sbml_client` with a server in a thread."""
+    path = os.path.dirname(os.path.abspath(__file__))
+    for file_name in ['ode_input2.yaml', 'ode_input_typos.yaml']:
+        shutil.copy(os.path.join(path, 'test_yaml2sbml', file_name),
+                    str(tmp_path))
+    yaml_dir = os.path.join(str(tmp_path), 'ode_input2.yaml')
+    sbml_dir = os.path.join(str(tmp_path), 'model.xml')
+
+    env = {key: value for (key, value) in os.environ.items()
+           if key != TOKEN_VARIABLE}
+
+    # TCP requires a token
+    ret = script_runner.run(['yaml2sbml_server', '--port', '0'], env=env)
+    assert not ret.success
+
+    server = _create_server(port=0, token='secret', root_dir=str(tmp_path))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    port = str(server.server_address[1])
+
+    try:
+        ret = script_runner.run(['yaml2sbml_client', '--port', port, 'ping'],
+                                env=env)
+        assert not ret.success
+        assert 'Invalid token' in ret.stdout
+
+        env[TOKEN_VARIABLE] = 'secret'
+
+        ret = script_runner.run(['yaml2sbml_client', '--port', port,
+                                 '--profile', 'sbml', yaml_dir, sbml_dir],
+                                env=env)
+        assert ret.success
+        assert 'build SBML' in ret.stdout
+        assert os.path.isfile(sbml_dir)
+
+        ret = script_runner.run(['yaml2sbml_client', '--port', port,
+                                 'validate', os.path.join(
+                                     str(tmp_path), 'ode_input_typos.yaml')],
+                                env=env)
+        assert not ret.success
+
+        ret = script_runner.run(['yaml2sbml_client', '--port', port,
+                                 'shutdown'], env=env)
+        assert ret.success
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+
+def test_yaml2sbml_diff_cli(script_runner, tmp_path):
+    """Test the command `yaml2sbml_diff`."""
+    path = os.path.dirname(os.path.abspath(__file__))
+    yaml_dir = os.path.join(path, 'test_yaml2sbml', 'ode_input2.yaml')
+
+    ret = script_runner.run(['yaml2sbml_diff', yaml_dir, yaml_dir])
+    assert ret.success
+    assert ret.stdout == ''
+
+    with open(yaml_dir, 'r') as f_in:
+        yaml_string = f_in.read()
+    new_yaml_dir = os.path.join(str(tmp_path), 'model.yaml')
+    with open(new_yaml_dir, 'w') as f_out:
+        f_out.write(yaml_string.replace('S1: 42', 'S1: 43'))
+
+    ret = script_runner.run(['yaml2sbml_diff', yaml_dir, new_yaml_dir])
+    assert not ret.success
+    assert ret.stdout == '~ conditions: condition1\n'
+
+
+def test_prune_cli(script_runner, tmp_path):
+    """Test the option `--prune` of `yaml2sbml` and `yaml2petab`."""
+    path = os.path.dirname(os.path.abspath(__file__))
+    yaml_dir = os.path.join(path, 'test_yaml2sbml', 'ode_input2.yaml')
+
+    with open(yaml_dir, 'r') as f_in:
+        yaml_string = f_in.read()
+    new_yaml_dir = os.path.join(str(tmp_path), 'model.yaml')
+    with open(new_yaml_dir, 'w') as f_out:
+        f_out.write(yaml_string.replace(
+            'functions:',
+            '    - parameterId: k_unused\n'
+            '      nominalValue: 1\n\n'
+            'functions:'))
+
+    sbml_dir = os.path.join(str(tmp_path), 'model.xml')
+    ret = script_runner.run(['yaml2sbml', new_yaml_dir, sbml_dir, '--prune'])
+    assert ret.success
+    assert 'Pruned 1 unused entities (parameters: k_unused).' in ret.stdout
+
+    with open(sbml_dir, 'r') as f_in:
+        assert 'k_unused' not in f_in.read()
+
+    ret = script_runner.run(['yaml2sbml', new_yaml_dir, sbml_dir, '--prune',
+                             '--streaming'])
+    assert not ret.success
+
+    ret = script_runner.run(['yaml2petab', yaml_dir, str(tmp_path),
+                             'model.xml', '--prune'])
+    assert ret.success
+    assert 'Pruned 0 unused entities.' in ret.stdout
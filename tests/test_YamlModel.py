@@ -1,9 +1,13 @@
+import copy
 import os
 import shutil
 
 import unittest
 import tempfile
 
+import numpy as np
+import pandas as pd
+
 from yaml2sbml.YamlModel import YamlModel
 from yaml2sbml.yaml_validation import validate_yaml
 
@@ -39,6 +43,12 @@ class TestYamlModel(unittest.TestCase):
         # check if save+reload did change the model
         self.assertDictEqual(model._yaml_model, reloaded_model._yaml_model)
 
+        # compressed files
+        saved_yaml_file = os.path.join(self.test_dir, 'test_yaml.yaml.gz')
+        model.write_to_yaml(saved_yaml_file)
+        reloaded_model = YamlModel.load_from_yaml(saved_yaml_file)
+        self.assertDictEqual(model._yaml_model, reloaded_model._yaml_model)
+
     def test_time(self):
         """
         Test all functionality regarding the time keyword.
@@ -256,6 +266,125 @@ class TestYamlModel(unittest.TestCase):
         model.delete_condition(condition_id)
         self.assertListEqual(model.get_condition_ids(), [])
 
+    def test_id_index(self):
+        """Test that ids keep insertion order and are indexed consistently."""
+        model = YamlModel()
+
+        for i in range(5):
+            model.add_parameter(f'p{i}', nominal_value=i)
+
+        # deleting and overwriting keeps the order of the remaining ids
+        model.delete_parameter('p2')
+        model.add_parameter('p1', nominal_value=42, overwrite=True)
+
+        self.assertListEqual(model.get_parameter_ids(),
+                             ['p0', 'p3', 'p4', 'p1'])
+        self.assertEqual(model.get_parameter_by_id('p1')['nominalValue'], 42)
+
+        with self.assertRaises(IndexError):
+            model.get_parameter_by_id('p2')
+        with self.assertRaises(ValueError):
+            model.delete_parameter('p2')
+
+        # reduced model dict contains the blocks as lists
+        self.assertListEqual(
+            [p['parameterId'] for p in
+             model._get_reduced_model_dict()['parameters']],
+            ['p0', 'p3', 'p4', 'p1'])
+
+    def test_bulk_add(self):
+        """Test adding multiple entries at once."""
+        model = YamlModel()
+        model.add_ode('x0', '1', 0)
+
+        state_ids = [f'x{i}' for i in range(1, 4)]
+        model.add_odes(state_ids,
+                       [f'-k * {x}' for x in state_ids],
+                       np.zeros(3))
+        model.add_parameters(['k'], nominal_values=np.array([1.0]))
+
+        self.assertListEqual(model.get_ode_ids(), ['x0'] + state_ids)
+        self.assertDictEqual(model.get_ode_by_id('x2'),
+                             {'stateId': 'x2',
+                              'rightHandSide': '-k * x2',
+                              'initialValue': 0.0})
+
+        # duplicates in the input and existing ids
+        with self.assertRaises(ValueError):
+            model.add_odes(['y', 'y'], '1', 0)
+        with self.assertRaises(ValueError):
+            model.add_odes(['x0', 'y'], '1', 0)
+        # wrong number of values
+        with self.assertRaises(ValueError):
+            model.add_odes(['y', 'z'], ['1'], 0)
+        # a single id instead of a sequence
+        with self.assertRaisesRegex(ValueError, 'have to be a sequence'):
+            model.add_parameters('k1', nominal_values=1)
+        with self.assertRaisesRegex(ValueError, 'have to be a sequence'):
+            model.add_parameters(np.int64(1))
+
+        model.add_odes(['x0', 'y'], '1', 0, overwrite=True)
+        self.assertListEqual(model.get_ode_ids(),
+                             state_ids + ['x0', 'y'])
+
+        # add from DataFrame, missing values are omitted
+        observable_df = pd.DataFrame(
+            {'observableFormula': ['x1', 'x2'],
+             'noiseFormula': [1, 2],
+             'observableName': ['obs_1', None]},
+            index=pd.Index(['obs_1', 'obs_2'], name='observableId'))
+        model.add_entries_from_df('observables', observable_df)
+
+        self.assertDictEqual(model.get_observable_by_id('obs_2'),
+                             {'observableId': 'obs_2',
+                              'observableFormula': 'x2',
+                              'noiseFormula': 2})
+
+        model.validate_model()
+
+        # numpy values are written as Python types
+        model.add_parameter('k_np',
+                            nominal_value=observable_df['noiseFormula'][0],
+                            estimate=np.int64(1))
+        yaml_dir = os.path.join(self.test_dir, 'bulk_model.yaml')
+        model.write_to_yaml(yaml_dir)
+        loaded_model = YamlModel.load_from_yaml(yaml_dir)
+        self.assertEqual(loaded_model.get_ode_by_id('x2')['initialValue'], 0)
+        self.assertDictEqual(loaded_model.get_parameter_by_id('k_np'),
+                             {'parameterId': 'k_np',
+                              'nominalValue': 1,
+                              'estimate': 1})
+
+    def test_snapshot(self):
+        """Test that the reduced model dict is reused until modification."""
+        model = YamlModel()
+        model.add_ode('x', '-k * x', 1)
+        model.add_parameter('k', nominal_value=1)
+
+        snapshot = model._get_reduced_model_dict()
+        self.assertIs(model._get_reduced_model_dict(), snapshot)
+
+        model.validate_model()
+        model.write_to_sbml(os.path.join(self.test_dir, 'model.xml'))
+        self.assertIs(model._get_reduced_model_dict(), snapshot)
+
+        # modifications create a new snapshot, old snapshot is unchanged
+        model.add_parameter('k', nominal_value=2, overwrite=True)
+        model.set_time('t')
+
+        new_snapshot = model._get_reduced_model_dict()
+        self.assertIsNot(new_snapshot, snapshot)
+        self.assertNotIn('time', snapshot)
+        self.assertEqual(snapshot['parameters'][0]['nominalValue'], 1)
+        self.assertEqual(new_snapshot['parameters'][0]['nominalValue'], 2)
+
+        # entries are handed out as copies, that do not affect the model
+        model.get_parameter_by_id('k')['nominalValue'] = 3
+        self.assertIs(model._get_reduced_model_dict(), new_snapshot)
+        self.assertEqual(model.get_parameter_by_id('k')['nominalValue'], 2)
+        with self.assertRaises(IndexError):
+            model.get_parameter_by_id('unknown')
+
     def test_valid_model(self):
         """Test whether the resulting models are valid."""
         model = YamlModel()
@@ -284,6 +413,85 @@ class TestYamlModel(unittest.TestCase):
 
         validate_yaml(yaml_dir)
 
+    def test_live_sbml(self):
+        """
+        Test, that the patched SBML of `live_sbml=True` equals a rebuild.
+        """
+        yaml_dir = os.path.join(self.test_input_folder, 'ode_input2.yaml')
+        model = YamlModel.load_from_yaml(yaml_dir, live_sbml=True)
+        live_sbml_dir = os.path.join(self.test_dir, 'model.xml')
+        sbml_dir = os.path.join(self.test_dir, 'rebuilt', 'model.xml')
+        os.mkdir(os.path.dirname(sbml_dir))
+
+        def assert_sbml_equal():
+            model.write_to_sbml(live_sbml_dir, overwrite=True)
+            rebuilt_model = copy.deepcopy(model)
+            self.assertIsNone(rebuilt_model._sbml_document)
+            rebuilt_model.write_to_sbml(sbml_dir, overwrite=True)
+
+            with open(live_sbml_dir, 'r') as f_live, \
+                    open(sbml_dir, 'r') as f_rebuilt:
+                self.assertEqual(f_live.read(), f_rebuilt.read())
+
+        with self.assertWarns(UserWarning):
+            assert_sbml_equal()
+        document = model._sbml_document
+
+        edits = [
+            lambda: model.add_parameter('k_new', nominal_value=2),
+            lambda: model.add_parameter('c1', overwrite=True,
+                                        nominal_value=3),
+            lambda: model.add_ode('S4', 'k_new * S3', 'k4'),
+            lambda: model.add_ode('S1', 'v1 - k_new * S1', 1,
+                                  overwrite=True),
+            lambda: model.add_assignment('a_1', 'S1 + S2'),
+            lambda: model.add_function('f_1', 'x', 'x^2'),
+            lambda: model.add_parameters(['k_bulk', 'Km'], overwrite=True,
+                                         nominal_values=[1, 2]),
+            lambda: model.set_time('t_new'),
+            lambda: model.add_parameter('k_after_time', nominal_value=4),
+            lambda: model.delete_ode('S2'),
+            lambda: model.delete_assignment('a_1'),
+            lambda: model.delete_function('f_1'),
+            lambda: model.delete_parameter('k_bulk'),
+            lambda: model.delete_time(),
+        ]
+
+        for edit in edits:
+            edit()
+            with self.assertWarns(UserWarning):
+                assert_sbml_equal()
+
+        # patched, not rebuilt
+        self.assertIs(model._sbml_document, document)
+
+        # an invalid edit drops the live SBML and is reported on export
+        model.add_ode('S5', 'k_new *', 1)
+        self.assertIsNone(model._sbml_document)
+        with self.assertRaises(RuntimeError):
+            model.write_to_sbml(live_sbml_dir, overwrite=True)
+
+        model.delete_ode('S5')
+        with self.assertWarns(UserWarning):
+            assert_sbml_equal()
+
+        # identifiers, that are used in another block, drop the live SBML
+        edits = [
+            (lambda: model.add_parameter('S1', nominal_value=1),
+             lambda: model.delete_parameter('S1')),
+            (lambda: model.add_function('Compartment', 'x', 'x'),
+             lambda: model.delete_function('Compartment')),
+            (lambda: model.set_time('k_new'), model.delete_time),
+        ]
+
+        for (edit, undo) in edits:
+            edit()
+            self.assertIsNone(model._sbml_document)
+
+            undo()
+            with self.assertWarns(UserWarning):
+                assert_sbml_equal()
+
 
 if __name__ == '__main__':
     suite = unittest.TestSuite()
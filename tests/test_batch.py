@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from yaml2sbml.batch import convert_batch, _collect_yaml_files, \
+    _get_number_of_jobs
+
+
+class TestBatch(unittest.TestCase):
+    """TestCase class for testing the batch conversion."""
+
+    def setUp(self):
+        this_dir, _ = os.path.split(__file__)
+        self.test_folder = os.path.join(this_dir, 'test_yaml2sbml')
+        self.test_dir = tempfile.mkdtemp()
+
+        self.yaml_files = [
+            os.path.join(self.test_folder, 'ode_input1.yaml'),
+            os.path.join(self.test_folder, 'ode_input2.yaml'),
+            os.path.join(self.test_folder, 'ode_input_invalid_formula.yaml'),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_convert_batch_sbml(self):
+        """Test SBML conversion with failures in a process pool."""
+        results = convert_batch(self.yaml_files, self.test_dir, jobs=2)
+
+        self.assertListEqual([result['success'] for result in results],
+                             [True, True, False])
+        self.assertIsNotNone(results[2]['error'])
+
+        for name in ['ode_input1', 'ode_input2']:
+            self.assertTrue(os.path.isfile(
+                os.path.join(self.test_dir, name + '.xml')))
+
+    def test_convert_batch_petab(self):
+        """Test PEtab conversion in the current process."""
+        results = convert_batch(self.yaml_files[1:2], self.test_dir,
+                                mode='petab')
+
+        self.assertTrue(results[0]['success'])
+        self.assertTrue(os.path.isfile(
+            os.path.join(self.test_dir, 'ode_input2', 'ode_input2.yaml')))
+
+    def test_convert_batch_validate(self):
+        """Test validation, that does not need an output directory."""
+        results = convert_batch(self.yaml_files, mode='validate')
+
+        self.assertListEqual([result['success'] for result in results],
+                             [True, True, True])
+
+    def test_system_exit(self):
+        """Test, that a SystemExit of one model does not end the batch."""
+        with mock.patch('yaml2sbml.batch.yaml2sbml',
+                        side_effect=[SystemExit('Could not create '
+                                                'SBMLDocument object'), []]):
+            results = convert_batch(self.yaml_files[:2], self.test_dir)
+
+        self.assertListEqual([result['success'] for result in results],
+                             [False, True])
+        self.assertEqual(results[0]['error'],
+                         'SystemExit: Could not create SBMLDocument object')
+
+    def test_invalid_arguments(self):
+        """Test errors for invalid modes and colliding model names."""
+        with self.assertRaises(ValueError):
+            convert_batch(self.yaml_files, self.test_dir, mode='sbml2')
+
+        with self.assertRaises(ValueError):
+            convert_batch(self.yaml_files[:1] * 2, self.test_dir)
+
+        with self.assertRaises(ValueError):
+            convert_batch(self.yaml_files, mode='validate', jobs=-1)
+
+    def test_number_of_jobs(self):
+        """Test, that 0 and None use one process per CPU."""
+        self.assertEqual(_get_number_of_jobs(3), 3)
+        self.assertEqual(_get_number_of_jobs(0), os.cpu_count())
+        self.assertEqual(_get_number_of_jobs(None), os.cpu_count())
+
+        for jobs in [-1, 1.5]:
+            with self.assertRaises(ValueError):
+                _get_number_of_jobs(jobs)
+
+        results = convert_batch(self.yaml_files[:2], mode='validate', jobs=0)
+        self.assertListEqual([result['success'] for result in results],
+                             [True, True])
+
+    def test_collect_yaml_files(self):
+        """Test collecting files from directories and manifests."""
+        yaml_files = _collect_yaml_files([self.test_folder])
+        self.assertIn(self.yaml_files[0], yaml_files)
+        self.assertEqual(len(yaml_files),
+                         len([file for file in os.listdir(self.test_folder)
+                              if file.endswith('.yaml')]))
+
+        manifest_dir = os.path.join(self.test_dir, 'manifest.txt')
+        with open(manifest_dir, 'w') as f_out:
+            f_out.write('# comment\n\n')
+            f_out.write(self.yaml_files[0] + '\n')
+            f_out.write(self.yaml_files[0] + '\n')
+
+        self.assertListEqual(_collect_yaml_files([], manifest_dir),
+                             self.yaml_files[:1])
+
+        # outputs inside of the input directory are not collected
+        output_dir = os.path.join(self.test_dir, 'output')
+        os.makedirs(os.path.join(output_dir, 'model'))
+        shutil.copy(self.yaml_files[0], self.test_dir)
+        shutil.copy(self.yaml_files[0], os.path.join(output_dir, 'model'))
+
+        self.assertEqual(len(_collect_yaml_files([self.test_dir])), 2)
+        self.assertListEqual(
+            _collect_yaml_files([self.test_dir], output_dir=output_dir),
+            [os.path.join(self.test_dir, 'ode_input1.yaml')])
+
+
+if __name__ == '__main__':
+    suite = unittest.TestSuite()
+    suite.addTest(TestBatch())
+    unittest.main()
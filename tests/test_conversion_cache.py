@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+from unittest import mock
+
+from yaml2sbml import yaml2sbml, yaml2petab, conversion_cache
+from yaml2sbml.conversion_cache import ConversionCache
+
+
+class TestConversionCache(unittest.TestCase):
+    """TestCase class for testing the conversion cache."""
+
+    def setUp(self):
+        this_dir, _ = os.path.split(__file__)
+        self.test_folder = os.path.join(this_dir, 'test_yaml2sbml')
+
+        # temporary output and cache directory
+        self.test_dir = tempfile.mkdtemp()
+        self.cache = ConversionCache(os.path.join(self.test_dir, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_yaml2sbml_cache(self):
+        """Test, that cached SBML is reused for the same input."""
+        yaml_dir = os.path.join(self.test_folder, 'ode_input1.yaml')
+        sbml_dir = os.path.join(self.test_dir, 'model.xml')
+
+        yaml2sbml(yaml_dir, sbml_dir, cache=self.cache)
+        with open(sbml_dir, 'r') as f_in:
+            sbml_uncached = f_in.read()
+        os.remove(sbml_dir)
+
+        # second call does not convert the model again
+        with mock.patch('yaml2sbml.yaml2sbml._load_yaml_model') as load_yaml:
+            yaml2sbml(yaml_dir, sbml_dir, cache=self.cache)
+            load_yaml.assert_not_called()
+
+        with open(sbml_dir, 'r') as f_in:
+            self.assertEqual(f_in.read(), sbml_uncached)
+
+        # different options give a different key
+        yaml2sbml(yaml_dir, sbml_dir, check_level='none', cache=self.cache)
+        self.assertEqual(self.cache.info()['n_entries'], 2)
+
+    def test_yaml2petab_cache(self):
+        """Test, that cached PEtab problems are reused for the same input."""
+        yaml_dir = os.path.join(self.test_folder, 'ode_input2.yaml')
+        output_dir = os.path.join(self.test_dir, 'petab')
+
+        yaml2petab(yaml_dir, output_dir, 'model', 'problem.yaml',
+                   cache=self.cache)
+        files_uncached = sorted(os.listdir(output_dir))
+        shutil.rmtree(output_dir)
+
+        with mock.patch('yaml2sbml.yaml2PEtab._yaml2petab') as _yaml2petab:
+            yaml2petab(yaml_dir, output_dir, 'model', 'problem.yaml',
+                       cache=self.cache)
+            _yaml2petab.assert_not_called()
+
+        self.assertListEqual(sorted(os.listdir(output_dir)), files_uncached)
+
+    def test_subdirectories_and_warnings(self):
+        """Test, that a cache hit restores paths and warnings of a run."""
+        yaml_dir = os.path.join(self.test_folder, 'ode_input2.yaml')
+        output_dir = os.path.join(self.test_dir, 'petab')
+        petab_yaml_dir = os.path.join(output_dir, 'problem', 'problem.yaml')
+
+        written_files = yaml2petab(yaml_dir, output_dir, 'model.xml',
+                                   os.path.join('problem', 'problem.yaml'),
+                                   cache=self.cache)
+        self.assertIn(petab_yaml_dir, written_files)
+        with open(petab_yaml_dir, 'r') as f_in:
+            self.assertIn('../model.xml', f_in.read())
+        shutil.rmtree(output_dir)
+
+        cached_files = yaml2petab(yaml_dir, output_dir, 'model.xml',
+                                  os.path.join('problem', 'problem.yaml'),
+                                  cache=self.cache)
+        self.assertListEqual(sorted(cached_files), sorted(written_files))
+        self.assertTrue(os.path.isfile(petab_yaml_dir))
+
+        # the warnings of the conversion are emitted for cache hits as well
+        sbml_dir = os.path.join(self.test_dir, 'model.xml')
+        for _ in range(2):
+            with self.assertWarnsRegex(UserWarning,
+                                       'Observables are not represented'):
+                yaml2sbml(yaml_dir, sbml_dir, cache=self.cache)
+
+        # the report of pruning is not cached
+        n_entries = self.cache.info()['n_entries']
+        with self.assertLogs('yaml2sbml.pruning'), \
+                self.assertWarns(UserWarning):
+            yaml2sbml(yaml_dir, sbml_dir, cache=self.cache, prune=True)
+        self.assertEqual(self.cache.info()['n_entries'], n_entries)
+
+        # warnings of dependencies are not stored
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter('always')
+            warnings.warn_explicit('deprecated', DeprecationWarning,
+                                   os.path.join('pandas', 'core.py'), 1)
+            warnings.warn_explicit('model warning', UserWarning,
+                                   conversion_cache.__file__, 1)
+        self.cache.put('key', [sbml_dir], self.test_dir, caught_warnings)
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter('always')
+            self.cache.get('key')
+        self.assertListEqual([str(w.message) for w in caught_warnings],
+                             ['model warning'])
+
+        # outputs outside of the output directory are not cached
+        with self.assertRaises(ValueError):
+            self.cache.put('key', [sbml_dir], output_dir)
+
+    def test_eviction_and_clear(self):
+        """Test the size limit and clearing of the cache."""
+        yaml_dir = os.path.join(self.test_folder, 'ode_input1.yaml')
+        sbml_dir = os.path.join(self.test_dir, 'model.xml')
+
+        yaml2sbml(yaml_dir, sbml_dir, cache=self.cache)
+        entry_size = self.cache.info()['size']
+
+        # only one entry fits into the cache
+        self.cache.max_size = entry_size
+        yaml2sbml(yaml_dir, sbml_dir, check_level='none', cache=self.cache)
+        self.assertEqual(self.cache.info()['n_entries'], 1)
+
+        self.cache.clear()
+        self.assertEqual(self.cache.info()['n_entries'], 0)
+
+
+if __name__ == '__main__':
+    suite = unittest.TestSuite()
+    suite.addTest(TestConversionCache())
+    unittest.main()
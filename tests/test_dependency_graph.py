@@ -0,0 +1,118 @@
+import os
+import unittest
+
+from yaml2sbml import YamlModel, DependencyGraph
+from yaml2sbml.yaml2sbml import _create_sbml_document, _load_yaml_file, \
+    _load_yaml_model
+
+
+class TestDependencyGraph(unittest.TestCase):
+    """TestCase class for testing the dependency graph of a model."""
+
+    def setUp(self):
+        this_dir, _ = os.path.split(__file__)
+        self.yaml_dir = os.path.join(this_dir, 'test_yaml2sbml',
+                                     'ode_input2.yaml')
+
+    def test_graph(self):
+        """Test the forward and reverse indexes of the graph."""
+        graph = DependencyGraph.from_model(self.yaml_dir)
+
+        self.assertEqual(len(graph), 17)
+        self.assertIn(('time', 't'), graph)
+
+        # arguments of functions are no dependencies, the entity itself
+        # neither. Built-in functions, e.g. log10, are no symbols.
+        self.assertListEqual(graph.get_symbols(('functions', 'MM')), [])
+        self.assertListEqual(
+            graph.get_dependencies(('odes', 'S3')),
+            [('functions', 'hill'), ('odes', 'S2'), ('parameters', 'Shalve'),
+             ('parameters', 'Vh'), ('parameters', 'h'), ('parameters', 'k4'),
+             ('parameters', 'c1')])
+        self.assertNotIn('log10', graph.get_symbols(('odes', 'S3')))
+        self.assertListEqual(graph.get_users('log10'), [])
+
+        # conditions refer to their targets
+        self.assertListEqual(graph.get_users('Km'),
+                             [('odes', 'S1'), ('odes', 'S2'),
+                              ('conditions', 'condition1')])
+        self.assertListEqual(graph.get_definitions('Km'),
+                             [('parameters', 'Km')])
+        self.assertListEqual(graph.get_users('unknown'), [])
+
+        self.assertSetEqual(
+            set(graph.get_all_users([('parameters', 'v1')])),
+            {('parameters', 'v1'), ('odes', 'S1'), ('odes', 'S2'),
+             ('odes', 'S3'), ('observables', 'Obs_1'),
+             ('observables', 'Obs_2'), ('conditions', 'condition1')})
+        parameters = [('parameters', parameter_id) for parameter_id in
+                      ['c1', 'Shalve', 'Vh', 'h', 'Vmm', 'Km', 'v1']]
+        self.assertSetEqual(
+            set(graph.get_all_dependencies([('observables', 'Obs_1')])),
+            {('observables', 'Obs_1'), ('odes', 'S1'), ('odes', 'S2'),
+             ('functions', 'MM'), ('functions', 'hill'), *parameters})
+
+        # removing and re-adding keeps the indexes consistent
+        graph.remove_entry('parameters', 'Km')
+        self.assertListEqual(graph.get_definitions('Km'), [])
+        self.assertNotIn(('parameters', 'Km'), graph.get_dependencies(
+            ('odes', 'S1')))
+        graph.add_entry('odes', {'stateId': 'S1',
+                                 'rightHandSide': '-k_new * S1',
+                                 'initialValue': 1e-3})
+        self.assertListEqual(graph.get_symbols(('odes', 'S1')),
+                             ['k_new', 'S1'])
+        self.assertListEqual(graph.get_users('Km'),
+                             [('odes', 'S2'), ('conditions', 'condition1')])
+
+    def test_conversion(self):
+        """Test, that the graph can be built during the conversion."""
+        reference_graph = DependencyGraph.from_model(self.yaml_dir)
+
+        for streaming in [False, True]:
+            graph = DependencyGraph()
+            with self.assertWarns(UserWarning):
+                _create_sbml_document(
+                    _load_yaml_model(self.yaml_dir, streaming),
+                    'model',
+                    check_level='none',
+                    dependency_graph=graph)
+
+            self.assertEqual(len(graph), len(reference_graph))
+            for node in reference_graph._symbols:
+                self.assertListEqual(graph.get_symbols(node),
+                                     reference_graph.get_symbols(node))
+
+    def test_yaml_model(self):
+        """Test, that the graph of a YamlModel is kept up to date."""
+        model = YamlModel.load_from_yaml(self.yaml_dir)
+        graph = model.get_dependency_graph()
+        self.assertIs(model.get_dependency_graph(), graph)
+
+        model.set_time('t_new')
+        model.add_parameter('k_new')
+        model.add_ode('S4', 'k_new * S3 * t_new', 0)
+        model.delete_ode('S1')
+        model.add_parameters(['k_new', 'k_other'], overwrite=True)
+
+        rebuilt_graph = DependencyGraph.from_model(model)
+        self.assertDictEqual(graph._symbols, rebuilt_graph._symbols)
+        self.assertDictEqual(graph._users, rebuilt_graph._users)
+        self.assertDictEqual(graph._definitions, rebuilt_graph._definitions)
+        self.assertListEqual(graph.get_users('t_new'), [('odes', 'S4')])
+        self.assertNotIn(('time', 't'), graph)
+
+        model.delete_time()
+        self.assertListEqual(graph.get_definitions('t_new'), [])
+
+        # the same as for the dict
+        self.assertEqual(
+            len(DependencyGraph.from_model(_load_yaml_file(self.yaml_dir))),
+            len(DependencyGraph.from_model(
+                YamlModel.load_from_yaml(self.yaml_dir))))
+
+
+if __name__ == '__main__':
+    suite = unittest.TestSuite()
+    suite.addTest(TestDependencyGraph())
+    unittest.main()
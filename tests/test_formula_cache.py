@@ -0,0 +1,66 @@
+import os
+import unittest
+
+import libsbml as sbml
+
+from yaml2sbml.yaml2sbml import _parse_yaml
+from yaml2sbml.formula_cache import FormulaCache, FORMULA_CACHE
+
+
+class TestFormulaCache(unittest.TestCase):
+    """TestCase class for testing the cache of parsed formulas."""
+
+    def test_parse(self):
+        """Test, that formulas are parsed once and clones are returned."""
+        cache = FormulaCache()
+
+        math_ast_1 = cache.parse('k1 * x1 + 2')
+        math_ast_2 = cache.parse('k1 * x1 + 2')
+        self.assertDictEqual(cache.info(), {'hits': 1, 'misses': 1,
+                                            'size': 1, 'max_size': 10000})
+
+        # modifying a clone does not change the cached tree
+        math_ast_1.addChild(sbml.parseL3Formula('3'))
+        self.assertEqual(sbml.formulaToL3String(math_ast_2), 'k1 * x1 + 2')
+        self.assertEqual(sbml.formulaToL3String(cache.parse('k1 * x1 + 2')),
+                         'k1 * x1 + 2')
+
+        # invalid formulas
+        self.assertIsNone(cache.parse('k1 *'))
+        self.assertIsNone(cache.get_mathml('k1 *'))
+
+        cache.clear()
+        self.assertDictEqual(cache.info(), {'hits': 0, 'misses': 0,
+                                            'size': 0, 'max_size': 10000})
+
+    def test_max_size(self):
+        """Test, that the least recently used formula is evicted."""
+        cache = FormulaCache(max_size=2)
+
+        cache.parse('a')
+        cache.parse('b')
+        cache.parse('a')
+        cache.parse('c')
+
+        cache.parse('a')
+        self.assertEqual(cache.hits, 2)
+        cache.parse('b')
+        self.assertEqual(cache.misses, 4)
+
+    def test_conversion(self):
+        """Test, that the conversion uses the cache."""
+        this_dir, _ = os.path.split(__file__)
+        yaml_dir = os.path.join(this_dir, 'test_yaml2sbml', 'ode_input1.yaml')
+
+        _parse_yaml(yaml_dir, 'Test_Model')
+        hits = FORMULA_CACHE.hits
+
+        # all formulas are known already
+        _parse_yaml(yaml_dir, 'Test_Model')
+        self.assertGreater(FORMULA_CACHE.hits, hits)
+
+
+if __name__ == '__main__':
+    suite = unittest.TestSuite()
+    suite.addTest(TestFormulaCache())
+    unittest.main()
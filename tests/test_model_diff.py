@@ -0,0 +1,73 @@
+import copy
+import os
+import unittest
+
+from yaml2sbml import YamlModel, get_fingerprints, diff_models
+from yaml2sbml.model_diff import is_unchanged
+from yaml2sbml.yaml2sbml import _load_yaml_file
+
+
+class TestModelDiff(unittest.TestCase):
+    """TestCase class for testing fingerprints and model diffs."""
+
+    def setUp(self):
+        this_dir, _ = os.path.split(__file__)
+        self.yaml_dir = os.path.join(this_dir, 'test_yaml2sbml',
+                                     'ode_input2.yaml')
+
+    def test_fingerprints(self):
+        """Test, that fingerprints only depend on the entities."""
+        fingerprints = get_fingerprints(self.yaml_dir)
+
+        self.assertListEqual(list(fingerprints['parameters']),
+                             ['c1', 'Shalve', 'Vh', 'h', 'Vmm', 'Km', 'v1',
+                              'k4'])
+        self.assertListEqual(list(fingerprints['time']), ['variable'])
+        self.assertDictEqual(fingerprints['assignments'], {})
+
+        # the same for the dict, a YamlModel and reordered keys
+        yaml_dict = _load_yaml_file(self.yaml_dir)
+        self.assertDictEqual(get_fingerprints(yaml_dict), fingerprints)
+        self.assertDictEqual(
+            get_fingerprints(YamlModel.load_from_yaml(self.yaml_dir)),
+            fingerprints)
+
+        yaml_dict['odes'][0] = dict(reversed(list(
+            yaml_dict['odes'][0].items())))
+        self.assertDictEqual(get_fingerprints(yaml_dict), fingerprints)
+
+    def test_diff(self):
+        """Test the diff of two models."""
+        old_model = YamlModel.load_from_yaml(self.yaml_dir)
+        new_model = copy.deepcopy(old_model)
+
+        self.assertTrue(is_unchanged(diff_models(old_model, new_model)))
+
+        new_model.add_parameter('k_new', nominal_value=1)
+        new_model.add_parameter('c1', overwrite=True, nominal_value=2)
+        new_model.delete_ode('S3')
+        new_model.add_condition('condition2', {'S1': 1})
+        new_model.set_time('t_new')
+
+        diff = diff_models(self.yaml_dir, new_model)
+
+        self.assertDictEqual(diff['parameters'], {'added': ['k_new'],
+                                                  'removed': [],
+                                                  'changed': ['c1']})
+        self.assertListEqual(diff['odes']['removed'], ['S3'])
+        self.assertListEqual(diff['conditions']['added'], ['condition2'])
+        self.assertListEqual(diff['time']['changed'], ['variable'])
+        self.assertTrue(is_unchanged({key: diff[key] for key
+                                      in ['assignments', 'functions',
+                                          'observables']}))
+
+        # stored fingerprints give the same diff
+        self.assertDictEqual(diff_models(get_fingerprints(self.yaml_dir),
+                                         get_fingerprints(new_model)),
+                             diff)
+
+
+if __name__ == '__main__':
+    suite = unittest.TestSuite()
+    suite.addTest(TestModelDiff())
+    unittest.main()
@@ -0,0 +1,93 @@
+import contextlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from yaml2sbml import yaml2sbml, yaml2petab, validate_yaml
+from yaml2sbml.profiling import Profile
+from yaml2sbml.yaml2sbml import _log_to_console, _CONSOLE_HANDLER
+
+
+class TestProfiling(unittest.TestCase):
+    """TestCase class for testing the profile of conversion stages."""
+
+    def setUp(self):
+        this_dir, _ = os.path.split(__file__)
+        self.yaml_dir = os.path.join(this_dir, 'test_yaml2sbml',
+                                     'ode_input2.yaml')
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_stages(self):
+        """Test, that the stages of the conversions are recorded."""
+        sbml_dir = os.path.join(self.test_dir, 'model.xml')
+        records = []
+
+        with Profile(callback=records.append) as profile:
+            yaml2sbml(self.yaml_dir, sbml_dir)
+            yaml2sbml(self.yaml_dir, sbml_dir, writer='direct',
+                      streaming=True)
+
+        self.assertListEqual(
+            [record['stage'] for record in profile.records],
+            ['load YAML', 'validate schema', 'build SBML',
+             'check consistency', 'write SBML', 'build SBML', 'write SBML',
+             'check consistency'])
+        self.assertListEqual(records, profile.records)
+
+        stats = profile.stats()
+        self.assertListEqual(list(stats), ['load YAML', 'validate schema',
+                                           'build SBML', 'check consistency',
+                                           'write SBML'])
+        self.assertEqual(stats['build SBML']['calls'], 2)
+        self.assertAlmostEqual(
+            stats['build SBML']['time'],
+            sum(record['time'] for record in profile.records
+                if record['stage'] == 'build SBML'))
+
+        for stage in stats:
+            self.assertIn(stage, profile.summary())
+
+        # stages are only recorded inside of the with block
+        yaml2sbml(self.yaml_dir, sbml_dir)
+        self.assertEqual(len(profile.records), 8)
+
+    def test_petab_and_validation_stages(self):
+        """Test the stages of the PEtab conversion and the validation."""
+        with Profile() as profile:
+            yaml2petab(self.yaml_dir, self.test_dir, 'model.xml',
+                       'problem.yaml')
+            validate_yaml(self.yaml_dir)
+
+        self.assertListEqual(
+            list(profile.stats()),
+            ['load YAML', 'validate schema', 'build SBML',
+             'check consistency', 'write SBML', 'create PEtab tables',
+             'write PEtab tables', 'write PEtab YAML', 'lint PEtab tables'])
+        self.assertEqual(profile.stats()['load YAML']['calls'], 2)
+
+    def test_log_to_console(self):
+        """Test, that repeated CLI calls print each message once."""
+        package_logger = logging.getLogger('yaml2sbml')
+        level = package_logger.level
+        self.addCleanup(package_logger.setLevel, level)
+        self.addCleanup(package_logger.removeHandler, _CONSOLE_HANDLER)
+
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            for _ in range(3):
+                _log_to_console()
+            logging.getLogger('yaml2sbml.test').info('message')
+
+        self.assertEqual(stdout.getvalue(), 'message\n')
+
+
+if __name__ == '__main__':
+    suite = unittest.TestSuite()
+    suite.addTest(TestProfiling())
+    unittest.main()
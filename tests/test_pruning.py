@@ -0,0 +1,116 @@
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+
+import libsbml as sbml
+import pandas as pd
+
+from yaml2sbml import YamlModel, yaml2sbml, yaml2petab, get_unused_entities
+from yaml2sbml.pruning import prune_yaml_dict
+
+
+class TestPruning(unittest.TestCase):
+    """TestCase class for testing the removal of unused entities."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+        model = YamlModel()
+        model.set_time('t')
+        model.add_parameters(['k1', 'x0', 'sigma', 'k_fun', 'k_cond',
+                              'k_unused', 'k_dead'],
+                             nominal_values=1,
+                             parameter_scales='lin',
+                             lower_bounds=0,
+                             upper_bounds=10,
+                             estimates=1)
+        model.add_function('f', 'x, k', 'k * x^2')
+        model.add_function('g', 'x', 'x')
+        model.add_assignment('a_used', 'f(t, k_fun)')
+        model.add_assignment('a_dead', '2 * k_dead')
+        model.add_ode('x', '-k1 * x + a_used', 'x0')
+        model.add_observable('obs', 'x', 'sigma')
+        model.add_condition('c1', {'k1': 'k_cond'})
+
+        self.model = model
+        self.yaml_dir = os.path.join(self.test_dir, 'model.yaml')
+        model.write_to_yaml(self.yaml_dir)
+
+        self.unused_entities = {'parameters': ['k_unused', 'k_dead'],
+                                'assignments': ['a_dead'],
+                                'functions': ['g']}
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_unused_entities(self):
+        """Test, that only entities without a path from a root are unused."""
+        self.assertDictEqual(get_unused_entities(self.yaml_dir),
+                             self.unused_entities)
+
+        yaml_dict = self.model._get_reduced_model_dict()
+        yaml_dict_copy = copy.deepcopy(yaml_dict)
+
+        with self.assertLogs('yaml2sbml.pruning') as logs:
+            pruned_yaml_dict = prune_yaml_dict(yaml_dict)
+
+        self.assertIn('Pruned 4 unused entities (parameters: k_unused, '
+                      'k_dead; assignments: a_dead; functions: g).',
+                      logs.output[0])
+        self.assertDictEqual(yaml_dict, yaml_dict_copy)
+        self.assertListEqual(
+            [entry['parameterId'] for entry in pruned_yaml_dict['parameters']],
+            ['k1', 'x0', 'sigma', 'k_fun', 'k_cond'])
+        self.assertDictEqual(get_unused_entities(pruned_yaml_dict),
+                             {'parameters': [],
+                              'assignments': [],
+                              'functions': []})
+
+    def test_yaml2sbml(self):
+        """Test pruning in yaml2sbml with both writers."""
+        for writer in ['libsbml', 'direct']:
+            sbml_dir = os.path.join(self.test_dir, f'model_{writer}.xml')
+            with self.assertWarns(UserWarning):
+                yaml2sbml(self.yaml_dir, sbml_dir, writer=writer, prune=True)
+
+            model = sbml.readSBMLFromFile(sbml_dir).getModel()
+            self.assertIsNone(model.getParameter('k_unused'))
+            self.assertIsNone(model.getParameter('a_dead'))
+            self.assertIsNone(model.getFunctionDefinition('g'))
+            self.assertIsNotNone(model.getParameter('k_cond'))
+            self.assertIsNotNone(model.getFunctionDefinition('f'))
+
+        with self.assertRaises(ValueError):
+            yaml2sbml(self.yaml_dir, sbml_dir, streaming=True, prune=True)
+
+    def test_yaml2petab(self):
+        """Test, that pruned parameters are not in the parameter table."""
+        yaml2petab(self.yaml_dir, self.test_dir, 'model.xml', prune=True)
+
+        parameter_df = pd.read_csv(
+            os.path.join(self.test_dir, 'parameters_model.tsv'), sep='\t')
+        self.assertListEqual(list(parameter_df['parameterId']),
+                             ['k1', 'x0', 'sigma', 'k_fun', 'k_cond'])
+
+    def test_yaml_model(self):
+        """Test pruning of a YamlModel."""
+        graph = self.model.get_dependency_graph()
+
+        self.assertDictEqual(self.model.prune(), self.unused_entities)
+        self.assertListEqual(self.model.get_parameter_ids(),
+                             ['k1', 'x0', 'sigma', 'k_fun', 'k_cond'])
+        self.assertListEqual(self.model.get_function_ids(), ['f'])
+        self.assertNotIn(('parameters', 'k_dead'), graph)
+
+        self.assertDictEqual(self.model.prune(),
+                             {'parameters': [],
+                              'assignments': [],
+                              'functions': []})
+
+
+if __name__ == '__main__':
+    suite = unittest.TestSuite()
+    suite.addTest(TestPruning())
+    unittest.main()
@@ -0,0 +1,171 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from yaml2sbml.server import Client, _create_server, _handle_request
+from yaml2sbml.yaml2sbml import _parse_yaml
+
+
+class TestServer(unittest.TestCase):
+    """TestCase class for testing the conversion server and its client."""
+
+    def setUp(self):
+        this_dir, _ = os.path.split(__file__)
+        self.test_folder = os.path.join(this_dir, 'test_yaml2sbml')
+        self.test_dir = tempfile.mkdtemp()
+
+        # the server only accesses files below its root directory
+        self.root_dir = os.path.join(self.test_dir, 'root')
+        os.mkdir(self.root_dir)
+        for file_name in ['ode_input2.yaml', 'ode_input_typos.yaml']:
+            shutil.copy(os.path.join(self.test_folder, file_name),
+                        self.root_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def start_server(self, socket_path=None, port=None, token=None):
+        """Run a server in a thread and return it."""
+        server = _create_server(socket_path, port, token=token,
+                                root_dir=self.root_dir)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        def stop_server():
+            server.shutdown()
+            thread.join()
+            server.server_close()
+
+        self.addCleanup(stop_server)
+
+        return server
+
+    def test_requests(self):
+        """Test the commands of the server via TCP."""
+        server = self.start_server(port=0, token='secret')
+        yaml_dir = os.path.join(self.root_dir, 'ode_input2.yaml')
+        sbml_dir = os.path.join(self.root_dir, 'model.xml')
+
+        with Client(port=server.server_address[1], token='secret') as client:
+            self.assertTrue(client.request('ping')['success'])
+
+            response = client.request('validate', yaml_file=yaml_dir)
+            self.assertTrue(response['success'])
+
+            response = client.request('sbml', yaml_file=yaml_dir,
+                                      sbml_file=sbml_dir, profile=True)
+            self.assertTrue(response['success'])
+            self.assertListEqual(response['written_files'], [sbml_dir])
+            self.assertIn('build SBML', response['profile'])
+            # observables are not part of the SBML
+            self.assertEqual(len(response['warnings']), 2)
+
+            with open(sbml_dir, 'r') as f_in:
+                self.assertEqual(f_in.read(), _parse_yaml(yaml_dir, 'model'))
+
+            response = client.request('sbml', yaml_file=yaml_dir,
+                                      sbml_file=sbml_dir,
+                                      skip_unchanged=True)
+            self.assertListEqual(response['written_files'], [])
+
+            response = client.request('petab', yaml_file=yaml_dir,
+                                      output_dir=self.root_dir,
+                                      sbml_name='model.xml',
+                                      petab_yaml_name='problem.yaml')
+            self.assertTrue(response['success'])
+            # SBML, PEtab YAML, parameter, condition and observable table
+            self.assertEqual(len(response['written_files']), 5)
+
+            # errors are reported, the connection stays open
+            response = client.request('validate', yaml_file=os.path.join(
+                self.root_dir, 'ode_input_typos.yaml'))
+            self.assertFalse(response['success'])
+            self.assertTrue(response['error'].startswith('ValidationError'))
+
+            response = client.request('invalid')
+            self.assertFalse(response['success'])
+            self.assertTrue(response['error'].startswith('ValueError'))
+
+            self.assertTrue(client.request('ping')['success'])
+
+    def test_access(self):
+        """Test, that TCP requires the token and paths are restricted."""
+        with self.assertRaises(ValueError):
+            _create_server(port=0)
+
+        server = self.start_server(port=0, token='secret')
+        yaml_dir = os.path.join(self.root_dir, 'ode_input2.yaml')
+
+        for token in [None, 'wrong']:
+            with Client(port=server.server_address[1], token=token) \
+                    as client:
+                response = client.request('shutdown')
+                self.assertFalse(response['success'])
+                self.assertEqual(response['error'],
+                                 'PermissionError: Invalid token.')
+
+                # the connection is closed
+                with self.assertRaises(ConnectionError):
+                    client.request('ping')
+
+        os.symlink(self.test_dir, os.path.join(self.root_dir, 'link'))
+        outside_files = [os.path.join(self.root_dir, '..', 'model.xml'),
+                         os.path.join(self.root_dir, 'link', 'model.xml')]
+
+        with Client(port=server.server_address[1], token='secret') as client:
+            for sbml_dir in outside_files:
+                response = client.request('sbml', yaml_file=yaml_dir,
+                                          sbml_file=sbml_dir)
+                self.assertTrue(
+                    response['error'].startswith('PermissionError'))
+
+            response = client.request('petab', yaml_file=yaml_dir,
+                                      output_dir=self.root_dir,
+                                      sbml_name='../model.xml')
+            self.assertTrue(response['error'].startswith('PermissionError'))
+
+            self.assertFalse(
+                os.path.exists(os.path.join(self.test_dir, 'model.xml')))
+
+        # relative paths are relative to the root directory
+        response = _handle_request(
+            {'command': 'validate',
+             'arguments': {'yaml_file': 'ode_input2.yaml'}},
+            root_dir=self.root_dir)
+        self.assertTrue(response['success'])
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'no Unix sockets')
+    def test_unix_socket_and_shutdown(self):
+        """Test the server on a Unix socket and the command shutdown."""
+        socket_path = os.path.join(self.test_dir, 'server.sock')
+
+        # the default address
+        with mock.patch('yaml2sbml.server.DEFAULT_SOCKET_PATH',
+                        socket_path):
+            server = _create_server()
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+
+            # only accessible by the user
+            self.assertEqual(os.stat(socket_path).st_mode & 0o777, 0o600)
+
+            # a second server on the same socket is refused
+            with self.assertRaises(RuntimeError):
+                _create_server(socket_path)
+
+            with Client() as client:
+                self.assertTrue(client.request('shutdown')['success'])
+
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+        server.server_close()
+
+
+if __name__ == '__main__':
+    suite = unittest.TestSuite()
+    suite.addTest(TestServer())
+    unittest.main()
@@ -0,0 +1,162 @@
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+
+import jsonschema
+
+from yaml2sbml.yaml2sbml import _load_yaml_file
+from yaml2sbml.yaml2PEtab import yaml2petab
+from yaml2sbml.watch import SBMLBuilder, PEtabBuilder, watch, \
+    _get_changed_blocks
+
+
+class TestWatch(unittest.TestCase):
+    """TestCase class for testing the incremental rebuilds of watch mode."""
+
+    def setUp(self):
+        this_dir, _ = os.path.split(__file__)
+        self.yaml_dir = os.path.join(this_dir, 'test_yaml2sbml',
+                                     'ode_input2.yaml')
+        self.yaml_dict = _load_yaml_file(self.yaml_dir)
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_changed_blocks(self):
+        """Test the comparison of two models block by block."""
+        new_yaml_dict = copy.deepcopy(self.yaml_dict)
+        new_yaml_dict['conditions'][0]['S1'] = 43
+        del new_yaml_dict['observables']
+
+        self.assertSetEqual(_get_changed_blocks(None, self.yaml_dict),
+                            set(self.yaml_dict))
+        self.assertSetEqual(_get_changed_blocks(self.yaml_dict,
+                                                new_yaml_dict),
+                            {'conditions', 'observables'})
+
+        # the order of the blocks determines the order of the SBML.
+        reordered_yaml_dict = dict(reversed(list(self.yaml_dict.items())))
+        self.assertSetEqual(_get_changed_blocks(self.yaml_dict,
+                                                reordered_yaml_dict),
+                            set(self.yaml_dict))
+
+    def test_sbml_builder(self):
+        """Test, that the SBML is only rebuilt, if it is affected."""
+        sbml_dir = os.path.join(self.test_dir, 'model.xml')
+        builder = SBMLBuilder(sbml_dir)
+
+        with self.assertWarns(UserWarning):
+            self.assertListEqual(builder.update(self.yaml_dict), [sbml_dir])
+        document = builder.sbml_document
+
+        # conditions are not part of the SBML
+        new_yaml_dict = copy.deepcopy(self.yaml_dict)
+        new_yaml_dict['conditions'][0]['S1'] = 43
+        self.assertListEqual(builder.update(new_yaml_dict), [])
+        self.assertIs(builder.sbml_document, document)
+
+        new_yaml_dict = copy.deepcopy(new_yaml_dict)
+        new_yaml_dict['odes'][0]['initialValue'] = 0.2
+        with self.assertWarns(UserWarning):
+            self.assertListEqual(builder.update(new_yaml_dict), [sbml_dir])
+        self.assertIsNot(builder.sbml_document, document)
+
+        # only changed blocks are validated, but all of the structure
+        for invalid_yaml_dict in [{**new_yaml_dict, 'unknown': []},
+                                  {**new_yaml_dict, 'odes': [{'stateId': 1}]}]:
+            with self.assertRaises(jsonschema.exceptions.ValidationError):
+                builder.update(invalid_yaml_dict)
+
+        # the structure is reported as by the validation of the whole model
+        invalid_yaml_dict = {key: value for (key, value)
+                             in new_yaml_dict.items() if key != 'odes'}
+        with self.assertRaises(jsonschema.exceptions.ValidationError) as \
+                context:
+            builder.update(invalid_yaml_dict)
+        self.assertEqual(context.exception.message,
+                         "'odes' is a required property")
+
+        # an empty, e.g. half-saved, file is skipped
+        with self.assertLogs('yaml2sbml.watch', 'WARNING'):
+            self.assertListEqual(builder.update(None), [])
+        self.assertIs(builder.yaml_dict, new_yaml_dict)
+
+        # an invalid model keeps the previous one
+        invalid_yaml_dict = copy.deepcopy(new_yaml_dict)
+        invalid_yaml_dict['odes'][0]['rightHandSide'] = 'k_1 *'
+        with self.assertRaises(Exception):
+            builder.update(invalid_yaml_dict)
+        self.assertIs(builder.yaml_dict, new_yaml_dict)
+
+    def test_petab_builder(self):
+        """Test, that only the affected PEtab files are rebuilt."""
+        # the same outputs as yaml2petab
+        reference_dir = os.path.join(self.test_dir, 'reference')
+        output_dir = os.path.join(self.test_dir, 'petab')
+        reference_files = yaml2petab(self.yaml_dir, reference_dir,
+                                     'model.xml', 'problem.yaml')
+
+        builder = PEtabBuilder(output_dir, 'model.xml', 'problem.yaml')
+        written_files = builder.update(self.yaml_dict)
+
+        self.assertListEqual(
+            sorted(os.path.basename(file) for file in written_files),
+            sorted(os.path.basename(file) for file in reference_files))
+        for file in reference_files:
+            with open(file, 'r') as f_reference, \
+                    open(os.path.join(output_dir, os.path.basename(file)),
+                         'r') as f_out:
+                self.assertEqual(f_out.read(), f_reference.read())
+
+        document = builder.sbml_document
+        condition_table_dir = os.path.join(
+            output_dir, 'experimental_conditions_model.tsv')
+
+        new_yaml_dict = copy.deepcopy(self.yaml_dict)
+        new_yaml_dict['conditions'][0]['S1'] = 43
+        self.assertListEqual(builder.update(new_yaml_dict),
+                             [condition_table_dir])
+        self.assertIs(builder.sbml_document, document)
+
+        # the condition table is linted against the SBML in memory
+        new_yaml_dict = copy.deepcopy(new_yaml_dict)
+        new_yaml_dict['conditions'][0]['unknown'] = 1
+        with self.assertRaises(Exception), self.assertWarns(UserWarning):
+            builder.update(new_yaml_dict)
+
+        new_yaml_dict = copy.deepcopy(self.yaml_dict)
+        new_yaml_dict['parameters'][0]['upperBound'] = 20
+        written_files = builder.update(new_yaml_dict)
+        self.assertIn(os.path.join(output_dir, 'parameters_model.tsv'),
+                      written_files)
+        self.assertIn(condition_table_dir, written_files)
+        self.assertIsNot(builder.sbml_document, document)
+
+    def test_watch(self):
+        """Test, that changes of the watched files trigger rebuilds."""
+        file = os.path.join(self.test_dir, 'model.yaml')
+        calls = []
+
+        def rebuild(changed_files):
+            calls.append(changed_files)
+
+            # change the file, the second rebuild fails
+            with open(file, 'a') as f_out:
+                f_out.write('# changed\n')
+            if len(calls) == 2:
+                raise ValueError('invalid model')
+
+        with self.assertLogs('yaml2sbml.watch') as logs:
+            watch([file], rebuild, interval=0.01, max_rebuilds=3)
+
+        self.assertListEqual(calls, [[file]] * 3)
+        self.assertIn('ValueError: invalid model', logs.output[1])
+
+
+if __name__ == '__main__':
+    suite = unittest.TestSuite()
+    suite.addTest(TestWatch())
+    unittest.main()
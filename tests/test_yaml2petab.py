@@ -2,6 +2,8 @@ import os
 import shutil
 import unittest
 
+import pandas as pd
+
 import yaml2sbml.yaml2PEtab as yaml2PEtab
 
 
@@ -17,7 +19,7 @@ class TestYaml2PEtab(unittest.TestCase):
         self.output_folder = os.path.join(this_dir, 'test_yaml2sbml_output')
 
     def tearDown(self):
-        shutil.rmtree(self.output_folder)
+        shutil.rmtree(self.output_folder, ignore_errors=True)
 
     def test_petab_export(self):
         """
@@ -33,6 +35,119 @@ class TestYaml2PEtab(unittest.TestCase):
             os.path.join(self.output_folder, 'sbml_test.xml'),
             self.output_folder)
 
+    def test_petab_export_skip_unchanged(self):
+        """
+        Test, that unchanged PEtab files are not rewritten.
+        """
+        input_yaml_dir = os.path.join(self.input_folder, 'ode_input2.yaml')
+
+        written_files = yaml2PEtab.yaml2petab(input_yaml_dir,
+                                              self.output_folder,
+                                              'sbml_test.xml',
+                                              'problem.yaml')
+        self.assertEqual(len(written_files), 5)
+
+        written_files = yaml2PEtab.yaml2petab(input_yaml_dir,
+                                              self.output_folder,
+                                              'sbml_test.xml',
+                                              'problem.yaml',
+                                              skip_unchanged=True)
+        self.assertListEqual(written_files, [])
+
+        # only the PEtab YAML changes
+        written_files = yaml2PEtab.yaml2petab(input_yaml_dir,
+                                              self.output_folder,
+                                              'sbml_test.xml',
+                                              'problem.yaml',
+                                              'measurements.tsv',
+                                              skip_unchanged=True)
+        self.assertListEqual(
+            written_files,
+            [os.path.join(self.output_folder, 'problem.yaml')])
+
+    def test_petab_export_compressed(self):
+        """
+        Test, that the SBML and the PEtab tables can be compressed.
+        """
+        input_yaml_dir = os.path.join(self.input_folder, 'ode_input2.yaml')
+
+        written_files = yaml2PEtab.yaml2petab(input_yaml_dir,
+                                              self.output_folder,
+                                              'sbml_test.xml.xz',
+                                              'problem.yaml')
+        self.assertListEqual(
+            sorted(os.path.basename(file) for file in written_files),
+            ['experimental_conditions_sbml_test.tsv.xz',
+             'observables_sbml_test.tsv.xz',
+             'parameters_sbml_test.tsv.xz',
+             'problem.yaml',
+             'sbml_test.xml.xz'])
+
+        yaml2PEtab.validate_petab_tables(
+            os.path.join(self.output_folder, 'sbml_test.xml.xz'),
+            self.output_folder)
+
+        parameter_df = pd.read_csv(
+            os.path.join(self.output_folder, 'parameters_sbml_test.tsv.xz'),
+            sep='\t')
+        self.assertIn('parameterId', parameter_df.columns)
+
+    def test_petab_export_validates_tables(self):
+        """
+        Test that invalid PEtab tables are detected without reading files.
+        """
+        yaml_dict = yaml2PEtab._load_yaml_file(
+            os.path.join(self.input_folder, 'ode_input2.yaml'))
+
+        # condition for an id, that is not part of the model
+        yaml_dict['conditions'][0]['unknown_id'] = 1
+
+        with self.assertRaises(AssertionError):
+            yaml2PEtab._yaml2petab(yaml_dict,
+                                   self.output_folder,
+                                   'sbml_test.xml')
+
+    def test_create_petab_table(self):
+        """
+        Test column order, missing values and warnings of PEtab tables.
+        """
+        block_list = [{'observableId': 'obs_1',
+                       'observableFormula': 'x_1',
+                       'noiseFormula': 1},
+                      {'observableId': 'obs_2',
+                       'observableName': 'name_2',
+                       'observableFormula': 'x_2',
+                       'noiseFormula': 'sigma',
+                       'unknownColumn': 'value'}]
+
+        with self.assertWarns(UserWarning):
+            table = yaml2PEtab._create_petab_table(
+                block_list,
+                ['observableId', 'observableFormula', 'noiseFormula'],
+                ['observableName'])
+
+        self.assertListEqual(list(table.columns),
+                             ['observableId', 'observableFormula',
+                              'noiseFormula', 'observableName',
+                              'unknownColumn'])
+        self.assertListEqual(list(table['observableId']), ['obs_1', 'obs_2'])
+        self.assertTrue(pd.isna(table.loc[0, 'observableName']))
+
+        # integers are written as floats, as before, until the first formula
+        # of a column.
+        self.assertListEqual(list(table['noiseFormula']), [1., 'sigma'])
+
+        table = yaml2PEtab._create_petab_table(
+            [{'conditionId': 'c1', 'S1': 10, 'Km': 1},
+             {'conditionId': 'c2', 'S1': 0.5, 'Km': 'k'},
+             {'conditionId': 'c3', 'Km': 2}],
+            ['conditionId', 'S1', 'Km'], [])
+        self.assertEqual(table.to_csv(sep='\t', index=False),
+                         'conditionId\tS1\tKm\n'
+                         'c1\t10.0\t1.0\n'
+                         'c2\t0.5\tk\n'
+                         'c3\t\t2\n')
+
 
 if __name__ == '__main__':
     suite = unittest.TestSuite()
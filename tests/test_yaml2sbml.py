@@ -1,7 +1,14 @@
+import gzip
+import io
 import os
 import unittest
+import warnings
 
-from yaml2sbml.yaml2sbml import yaml2sbml, _parse_yaml
+import yaml
+from jsonschema import ValidationError
+from yaml2sbml.yaml2sbml import yaml2sbml, _parse_yaml, \
+    _create_sbml_document, _write_sbml_document, _load_yaml_file
+from yaml2sbml.file_io import _load_yaml, _dump_yaml, _open_file, zstandard
 
 
 class TestYaml2SBML(unittest.TestCase):
@@ -96,6 +103,241 @@ class TestYaml2SBML(unittest.TestCase):
             _parse_yaml(yaml_dir,
                         'Test_Model')
 
+    def test_skip_unchanged(self):
+        """
+        Test, that unchanged SBML files are not rewritten.
+        """
+        yaml_dir = os.path.join(self.test_folder, 'ode_input1.yaml')
+        sbml_test_dir = os.path.join(self.test_folder, 'sbml_test.xml')
+
+        self.assertListEqual(yaml2sbml(yaml_dir, sbml_test_dir),
+                             [sbml_test_dir])
+
+        # set the modification time into the past
+        os.utime(sbml_test_dir, (0, 0))
+
+        self.assertListEqual(
+            yaml2sbml(yaml_dir, sbml_test_dir, skip_unchanged=True), [])
+        self.assertEqual(os.path.getmtime(sbml_test_dir), 0)
+
+        # a different output is written
+        self.assertListEqual(
+            yaml2sbml(os.path.join(self.test_folder, 'ode_input2.yaml'),
+                      sbml_test_dir, skip_unchanged=True,
+                      observables_as_assignments=True),
+            [sbml_test_dir])
+
+        os.remove(sbml_test_dir)
+
+    def test_check_levels(self):
+        """
+        Check, that the consistency check can be skipped or reduced.
+        """
+        yaml_dir = os.path.join(self.test_folder, 'ode_input2.yaml')
+
+        # observable formula 's * S3' contains an undefined id 's'
+        with self.assertWarns(RuntimeWarning):
+            sbml_full = _parse_yaml(yaml_dir, 'Test_Model',
+                                    observables_as_assignments=True)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', category=RuntimeWarning)
+            sbml_none = _parse_yaml(yaml_dir, 'Test_Model',
+                                    observables_as_assignments=True,
+                                    check_level='none')
+            _parse_yaml(yaml_dir, 'Test_Model',
+                        observables_as_assignments=True,
+                        check_level='identifiers')
+
+        self.assertEqual(sbml_full, sbml_none)
+
+        with self.assertRaises(ValueError):
+            _parse_yaml(yaml_dir, 'Test_Model', check_level='invalid')
+
+    def test_streaming(self):
+        """
+        Check, that the streaming conversion gives the same SBML.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+
+            for (file_name, observables_as_assignments) in \
+                    [('ode_input1.yaml', False), ('ode_input2.yaml', True),
+                     ('ode_input2.yaml', False)]:
+                yaml_dir = os.path.join(self.test_folder, file_name)
+
+                self.assertEqual(
+                    _parse_yaml(yaml_dir, 'Test_Model',
+                                observables_as_assignments),
+                    _parse_yaml(yaml_dir, 'Test_Model',
+                                observables_as_assignments, streaming=True))
+
+        # invalid entries are reported with their position
+        yaml_dir = os.path.join(self.test_folder,
+                                'ode_input_empty_section.yaml')
+        with self.assertRaises(ValidationError) as context:
+            _parse_yaml(yaml_dir, 'Test_Model', streaming=True)
+        self.assertListEqual(list(context.exception.path), ['observables'])
+
+        # unknown and missing blocks are reported as for the whole model
+        for file_name in ['ode_input_typos.yaml',
+                          'ode_input_typos_required.yaml']:
+            yaml_dir = os.path.join(self.test_folder, file_name)
+            with self.assertRaises(ValidationError) as context:
+                _parse_yaml(yaml_dir, 'Test_Model')
+            message = context.exception.message
+
+            with self.assertRaises(ValidationError) as context:
+                _parse_yaml(yaml_dir, 'Test_Model', streaming=True)
+            self.assertEqual(context.exception.message, message)
+
+    def test_direct_writer(self):
+        """
+        Check, that the direct XML writer gives the same SBML as libsbml.
+        """
+        sbml_test_dir = os.path.join(self.test_folder, 'sbml_test.xml')
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+
+            for (file_name, observables_as_assignments) in \
+                    [('ode_input1.yaml', False), ('ode_input2.yaml', True)]:
+                yaml_dir = os.path.join(self.test_folder, file_name)
+
+                yaml2sbml(yaml_dir, sbml_test_dir, observables_as_assignments)
+                with open(sbml_test_dir, 'r') as f_in:
+                    sbml_libsbml = f_in.read()
+
+                for streaming in [False, True]:
+                    yaml2sbml(yaml_dir, sbml_test_dir,
+                              observables_as_assignments,
+                              streaming=streaming, writer='direct')
+                    with open(sbml_test_dir, 'r') as f_in:
+                        self.assertEqual(f_in.read(), sbml_libsbml)
+
+        os.remove(sbml_test_dir)
+
+        # the model name, that is the file name, is escaped as in libsbml
+        yaml_dir = os.path.join(self.test_folder, 'ode_input1.yaml')
+        sbml_special_dir = os.path.join(self.test_folder,
+                                        'sbml_test & "<special>\'.xml')
+        yaml2sbml(yaml_dir, sbml_special_dir)
+        with open(sbml_special_dir, 'r') as f_in:
+            sbml_libsbml = f_in.read()
+
+        yaml2sbml(yaml_dir, sbml_special_dir, writer='direct')
+        with open(sbml_special_dir, 'r') as f_in:
+            self.assertEqual(f_in.read(), sbml_libsbml)
+        self.assertIn('name="sbml_test &amp; &quot;&lt;special&gt;&apos;"',
+                      sbml_libsbml)
+        os.remove(sbml_special_dir)
+
+        # errors are raised as in the libsbml writer, no file is left
+        yaml_dir = os.path.join(self.test_folder,
+                                'ode_input_invalid_SBML_identifier.yaml')
+        with self.assertRaises(RuntimeError):
+            yaml2sbml(yaml_dir, sbml_test_dir, writer='direct')
+        self.assertListEqual(
+            [file for file in os.listdir(self.test_folder)
+             if file.startswith('sbml_test')], [])
+
+        with self.assertRaises(ValueError):
+            yaml2sbml(yaml_dir, sbml_test_dir, writer='invalid')
+
+    def test_write_sbml_to_file(self):
+        """
+        Check writing SBML to (compressed) files and file-like objects.
+        """
+        yaml_dir = os.path.join(self.test_folder, 'ode_input1.yaml')
+        sbml_test_dir = os.path.join(self.test_folder, 'sbml_test.xml')
+        sbml_string = _parse_yaml(yaml_dir, 'sbml_test')
+
+        for writer in ['libsbml', 'direct']:
+            yaml2sbml(yaml_dir, sbml_test_dir + '.gz', writer=writer)
+            with gzip.open(sbml_test_dir + '.gz', 'rt') as f_in:
+                self.assertEqual(f_in.read(), sbml_string)
+
+            # compressed files are identical for identical content
+            os.utime(sbml_test_dir + '.gz', (0, 0))
+            self.assertListEqual(
+                yaml2sbml(yaml_dir, sbml_test_dir + '.gz', writer=writer,
+                          skip_unchanged=True), [])
+            os.remove(sbml_test_dir + '.gz')
+
+        document = _create_sbml_document(_load_yaml_file(yaml_dir),
+                                         'sbml_test')
+
+        text_stream = io.StringIO()
+        _write_sbml_document(document, text_stream)
+        self.assertEqual(text_stream.getvalue(), sbml_string)
+
+        binary_stream = io.BytesIO()
+        _write_sbml_document(document, binary_stream)
+        self.assertEqual(binary_stream.getvalue().decode(), sbml_string)
+
+    def test_compressed_files(self):
+        """
+        Check reading YAML and writing SBML, that are compressed.
+        """
+        yaml_dir = os.path.join(self.test_folder, 'ode_input1.yaml')
+        sbml_test_dir = os.path.join(self.test_folder, 'sbml_test.xml')
+        sbml_string = _parse_yaml(yaml_dir, 'sbml_test')
+
+        with open(yaml_dir, 'r') as f_in:
+            yaml_contents = f_in.read()
+
+        compressions = ['.gz', '.bz2', '.xz']
+        if zstandard is not None:
+            compressions.append('.zst')
+
+        for compression in compressions:
+            compressed_yaml_dir = sbml_test_dir[:-4] + '.yaml' + compression
+            with _open_file(compressed_yaml_dir, 'w') as f_out:
+                f_out.write(yaml_contents)
+            self.assertTrue(f_out.closed)
+
+            for writer in ['libsbml', 'direct']:
+                for streaming in [False, True]:
+                    yaml2sbml(compressed_yaml_dir, sbml_test_dir + compression,
+                              writer=writer, streaming=streaming)
+                    with _open_file(sbml_test_dir + compression) as f_in:
+                        self.assertEqual(f_in.read(), sbml_string)
+
+                os.remove(sbml_test_dir + compression)
+
+            os.remove(compressed_yaml_dir)
+
+        if zstandard is None:
+            with self.assertRaises(ImportError):
+                yaml2sbml(yaml_dir, sbml_test_dir + '.zst')
+
+        # the underlying file is closed together with the gzip file.
+        with _open_file(sbml_test_dir + '.gz', 'w') as f_out:
+            gzip_file = f_out.buffer
+            f_out.write(sbml_string)
+        self.assertTrue(gzip_file._raw_file.closed)
+        with open(sbml_test_dir + '.gz', 'rb') as f_in:
+            # no time stamp and no file name in the header.
+            self.assertEqual(f_in.read(10)[3:8], bytes(5))
+        os.remove(sbml_test_dir + '.gz')
+
+    def test_yaml_loader_and_dumper(self):
+        """
+        Check, that the (C) loader and dumper agree with pure Python.
+        """
+        for file_name in os.listdir(self.test_folder):
+            if not file_name.endswith('.yaml'):
+                continue
+
+            with open(os.path.join(self.test_folder, file_name)) as f_in:
+                yaml_contents = f_in.read()
+            yaml_dict = yaml.load(yaml_contents, Loader=yaml.SafeLoader)
+
+            self.assertEqual(_load_yaml(yaml_contents), yaml_dict)
+            self.assertEqual(
+                _dump_yaml(yaml_dict, sort_keys=False),
+                yaml.dump(yaml_dict, Dumper=yaml.SafeDumper, sort_keys=False))
+
 
 if __name__ == '__main__':
     suite = unittest.TestSuite()
@@ -1,8 +1,10 @@
 import os
+import subprocess
+import sys
 import unittest
 
 
-from yaml2sbml.yaml_validation import validate_yaml
+from yaml2sbml.yaml_validation import validate_yaml, _get_schema_validator
 from jsonschema.exceptions import ValidationError
 
 
@@ -56,6 +58,30 @@ class TestYamlValidation(unittest.TestCase):
         with self.assertRaises(ValidationError):
             validate_yaml(file_in)
 
+    def test_schema_validator_is_reused(self):
+        # Test that the schema is only loaded and compiled once.
+        validator = _get_schema_validator()
+
+        file_in = os.path.join(self.test_folder, 'ode_input2.yaml')
+        validate_yaml(file_in)
+
+        self.assertIs(_get_schema_validator(), validator)
+
+    def test_validation_without_heavy_imports(self):
+        # libsbml, pandas and petab are not imported for the validation.
+        file_in = os.path.join(self.test_folder, 'ode_input1.yaml')
+        code = ('import sys, yaml2sbml; '
+                f'yaml2sbml.validate_yaml({file_in!r}); '
+                'print(sorted({"libsbml", "pandas", "petab"} '
+                '& set(sys.modules)))')
+
+        output = subprocess.run([sys.executable, '-c', code],
+                                stdout=subprocess.PIPE,
+                                universal_newlines=True,
+                                check=True).stdout
+
+        self.assertEqual(output.splitlines()[-1], '[]')
+
 
 if __name__ == '__main__':
     suite = unittest.TestSuite()
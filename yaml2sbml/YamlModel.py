@@ -1,48 +1,108 @@
 """A Model Editor for creating YAML models."""
-import yaml
 import os.path
-import copy
-from typing import Union
+from typing import Sequence, Union
 from pathlib import Path
 
-from .yaml2sbml import _parse_yaml_dict, _load_yaml_file
+from .yaml2sbml import _create_sbml_document, _write_sbml_document, \
+    _load_yaml_file, _check_consistency
+from .live_sbml import _add_sbml_entry, _delete_sbml_entry, _set_sbml_time
 from .yaml2PEtab import _yaml2petab
 from .yaml_validation import _validate_yaml_from_dict
+from .file_io import _dump_yaml, _open_file, _strip_compression_extension
+from .profiling import _stage
+from .lazy_import import _lazy_import
+
+sbml = _lazy_import('libsbml')
+
+# key of the identifier for each block, that consists of a list of entries.
+_ID_KEYS = {'odes': 'stateId',
+            'parameters': 'parameterId',
+            'assignments': 'assignmentId',
+            'functions': 'functionId',
+            'observables': 'observableId',
+            'conditions': 'conditionId'}
 
 
 class YamlModel:
     """Functionality to set up, edit, load and write yaml models."""
 
-    def __init__(self):
-        """Initialize a YAML model."""
+    def __init__(self, live_sbml: bool = False):
+        """
+        Initialize a YAML model.
+
+        Each block, that consists of a list of entries, is stored as a dict,
+        that maps the id of an entry to the entry itself. Since dicts keep the
+        insertion order, the dict serves as the block list and as an index
+        at the same time, such that entries can be added, looked up and
+        deleted in constant time.
+
+        Arguments:
+            live_sbml:
+                Indicates, whether the SBML document should be kept after
+                the first export via `write_to_sbml` and patched on each
+                edit, instead of being rebuilt for each export. This makes
+                exports after small edits of large models cheap. The SBML is
+                identical.
+        """
         self._yaml_model = {'time': {},
-                            'odes': [],
-                            'parameters': [],
-                            'assignments': [],
-                            'functions': [],
-                            'observables': [],
-                            'conditions': []}
+                            'odes': {},
+                            'parameters': {},
+                            'assignments': {},
+                            'functions': {},
+                            'observables': {},
+                            'conditions': {}}
+
+        # read-only snapshot of the reduced model dict, see
+        # `_get_reduced_model_dict`. Reset on every modification.
+        self._snapshot = None
+
+        # SBML document, that is kept in sync with the model, if
+        # `live_sbml=True`. Created by `write_to_sbml`.
+        self._live_sbml = live_sbml
+        self._sbml_document = None
+
+        # dependency graph, that is kept in sync with the model. Created by
+        # `get_dependency_graph`.
+        self._dependency_graph = None
+
+    def __getstate__(self):
+        """Drop the live SBML document, which can not be copied, for copies."""
+        state = self.__dict__.copy()
+        state['_sbml_document'] = None
+
+        return state
 
     @staticmethod
-    def load_from_yaml(yaml_dir: str):
+    def load_from_yaml(yaml_dir: str, live_sbml: bool = False):
         """
         Create a model instance from a YAML file.
 
         Arguments:
             yaml_dir:
                 directory to the YAML file, that should be imported
+            live_sbml:
+                see `YamlModel.__init__`.
 
         Returns:
             cls:
                 new model
         """
-        new_model = YamlModel()
+        new_model = YamlModel(live_sbml)
 
         yaml_contents = _load_yaml_file(yaml_dir)
-        new_model._yaml_model.update(yaml_contents)
 
-        # check, if the model is valid
-        new_model.validate_model()
+        # check, if the model is valid. Empty blocks are ignored.
+        _validate_yaml_from_dict({key: val for (key, val)
+                                  in yaml_contents.items() if val})
+
+        new_model._model_modified()
+
+        for (block_key, block) in yaml_contents.items():
+            if block_key in _ID_KEYS:
+                new_model._yaml_model[block_key] = \
+                    _index_block(block or [], block_key)
+            else:
+                new_model._yaml_model[block_key] = block or {}
 
         return new_model
 
@@ -54,7 +114,8 @@ class YamlModel:
 
         Arguments:
             yaml_dir:
-                path/file, where the YAML should be written
+                path/file, where the YAML should be written. If it ends
+                with .gz, .bz2, .xz or .zst, the YAML is compressed.
             overwrite:
                 Indicates, whether an existing YAML should be overwritten
 
@@ -62,7 +123,8 @@ class YamlModel:
             ValueError
             FileExistsError
         """
-        if not (yaml_dir.endswith('.yaml') or yaml_dir.endswith('.yml')):
+        if not _strip_compression_extension(yaml_dir).endswith(('.yaml',
+                                                                '.yml')):
             raise ValueError('yaml_dir should contain path to the yaml '
                              'and hence end with .yaml or .yml')
 
@@ -74,9 +136,9 @@ class YamlModel:
         reduced_model_dict = self._get_reduced_model_dict()
 
         # translate to string
-        yaml_as_string = yaml.dump(reduced_model_dict,
-                                   sort_keys=False,
-                                   indent=6)
+        yaml_as_string = _dump_yaml(reduced_model_dict,
+                                    sort_keys=False,
+                                    indent=6)
 
         # post-process: add empty line around blocks
         for key in self._yaml_model.keys():
@@ -84,51 +146,73 @@ class YamlModel:
                                                     f'\n{key}:')
         yaml_as_string = yaml_as_string.replace('-     ', '\n    - ')
 
-        with open(yaml_dir, 'w') as file:
+        with _open_file(yaml_dir, 'w') as file:
             file.write(yaml_as_string)
 
     def write_to_sbml(self,
                       sbml_dir: str,
-                      overwrite: bool = False):
+                      overwrite: bool = False,
+                      check_level: str = 'full',
+                      skip_unchanged: bool = False) -> bool:
         """
         Write the model as an SBML file to the directory given in `sbml_dir`.
 
         Arguments:
             sbml_dir:
-                path/file, where the sbml should be written
+                path/file, where the sbml should be written. If it ends
+                with .gz, the SBML is compressed with gzip.
             overwrite:
                 Indicates, whether an existing yaml should be overwritten
+            check_level:
+                consistency check of the generated SBML, one of 'none',
+                'identifiers' or 'full'.
+            skip_unchanged:
+                Indicates, whether an existing, identical SBML should be
+                left untouched. Requires `overwrite=True`.
+
+        Returns:
+            written:
+                Indicates, whether the file was written.
 
         Raises:
             ValueError
             FileExistsError
         """
         # Check file ending.
-        if not (sbml_dir.endswith('.xml') or sbml_dir.endswith('.sbml')):
+        if not _strip_compression_extension(sbml_dir).endswith(('.xml',
+                                                                '.sbml')):
             raise ValueError('sbml_dir should contain path to the sbml '
                              'and hence end with .xml or .sbml')
 
         # model name = sbml name without file extension
-        model_name = Path(sbml_dir).stem
+        model_name = Path(_strip_compression_extension(sbml_dir)).stem
 
         if (not overwrite) and os.path.exists(sbml_dir):
             raise FileExistsError(f'Can not write SBML model. File {sbml_dir}'
                                   f' already exists. Consider to set '
                                   f'overwrite=True.')
 
-        # generate SBML as string
-        reduced_model_dict = self._get_reduced_model_dict()
-        sbml_as_string = _parse_yaml_dict(reduced_model_dict,
-                                          model_name)
+        # generate SBML and write it directly to the file
+        if self._live_sbml:
+            sbml_document = self._get_live_sbml_document(model_name,
+                                                         check_level)
+        else:
+            sbml_document = _create_sbml_document(
+                self._get_reduced_model_dict(),
+                model_name,
+                check_level=check_level)
 
-        with open(sbml_dir, 'w') as f_out:
-            f_out.write(sbml_as_string)
+        with _stage('write SBML'):
+            return _write_sbml_document(sbml_document, sbml_dir,
+                                        skip_unchanged)
 
     def write_to_petab(self,
                        output_dir: str,
                        model_name: str,
                        petab_yaml_name: str = None,
-                       measurement_table_name: str = None):
+                       measurement_table_name: str = None,
+                       check_level: str = 'full',
+                       skip_unchanged: bool = False) -> list:
         """
         Write the YamlModel as a PEtab problem.
 
@@ -144,14 +228,25 @@ class YamlModel:
             model_name: name of SBML model
             petab_yaml_name: name of the YAML organizing the PEtab problem.
             measurement_table_name: Name of measurement table
+            check_level: consistency check of the generated SBML, one of
+                'none', 'identifiers' or 'full'.
+            skip_unchanged: indicates, whether existing output files, that
+                are identical to the generated ones, should be left untouched.
+
+        Returns:
+            written_files: paths of the output files, that were (re)written.
         """
         reduced_model_dict = self._get_reduced_model_dict()
 
-        _yaml2petab(reduced_model_dict,
-                    output_dir,
-                    model_name,
-                    petab_yaml_name,
-                    measurement_table_name)
+        _, written_files = _yaml2petab(reduced_model_dict,
+                                       output_dir,
+                                       model_name,
+                                       petab_yaml_name,
+                                       measurement_table_name,
+                                       check_level,
+                                       skip_unchanged)
+
+        return written_files
 
     def validate_model(self):
         """
@@ -162,22 +257,132 @@ class YamlModel:
         """
         _validate_yaml_from_dict(self._get_reduced_model_dict())
 
+    def prune(self) -> dict:
+        """
+        Delete the parameters, assignments and functions, that are not used.
+
+        Entities are kept, if an ODE, an observable or a condition refers to
+        them, directly or indirectly, see `pruning.get_unused_entities`. The
+        deleted entities are logged.
+
+        Returns:
+            pruned_entities: dict from the blocks to the lists of the ids of
+                the deleted entities.
+        """
+        from .pruning import get_unused_entities, _log_pruned_entities
+
+        pruned_entities = get_unused_entities(self)
+
+        for (block_key, entity_ids) in pruned_entities.items():
+            for entity_id in entity_ids:
+                self._delete_entry(block_key, entity_id)
+
+        _log_pruned_entities(pruned_entities)
+
+        return pruned_entities
+
     def _get_reduced_model_dict(self) -> dict:
         """
         Return a reduced model dict, where keys without an entry are deleted.
 
-        Return a copy of the model dict!!
+        The reduced model dict is a snapshot of the model, that is created
+        once and reused, until the model is modified. It shares the entries
+        with the model, which are never modified in place by the model
+        editor (they are replaced instead) and are only handed out as copies
+        (see `_get_entry_by_id`). Hence, the snapshot stays valid without
+        copying the data, but it must not be modified by the caller!
 
         Returns:
             reduced_model_dict
         """
-        reduced_model_dict = {}
+        if self._snapshot is None:
+            reduced_model_dict = {}
+
+            for (key, val) in self._yaml_model.items():
+                if val and key in _ID_KEYS:
+                    reduced_model_dict[key] = list(val.values())
+                elif val:
+                    reduced_model_dict[key] = val
+
+            self._snapshot = reduced_model_dict
+
+        return self._snapshot
+
+    def _model_modified(self):
+        """Invalidate the snapshot of the model after a modification."""
+        self._snapshot = None
+
+    def _get_live_sbml_document(self,
+                                model_name: str,
+                                check_level: str) -> 'sbml.SBMLDocument':
+        """
+        Return the live SBML document, see `live_sbml` of `__init__`.
+
+        The document is built, if it does not exist yet, and checked with
+        `check_level` on each call.
+        """
+        if self._sbml_document is None:
+            self._sbml_document = _create_sbml_document(
+                self._get_reduced_model_dict(),
+                model_name,
+                check_level='none')
+
+        model = self._sbml_document.getModel()
+        model.setId(model_name)
+        model.setName(model_name)
+
+        with _stage('check consistency'):
+            _check_consistency(self._sbml_document, check_level)
+
+        return self._sbml_document
+
+    def _patch_sbml(self, patch, *args):
+        """
+        Apply an edit to the live SBML document, if there is one.
+
+        If the edit can not be represented in SBML, e.g. due to an invalid
+        formula, the document is dropped. The next export rebuilds it and
+        reports the error.
+
+        Arguments:
+            patch: function from `live_sbml.py`, that is called with the
+                SBML model and `args`.
+        """
+        if self._sbml_document is None:
+            return
+
+        try:
+            patch(self._sbml_document.getModel(), *args)
+        except (RuntimeError, ValueError, TypeError):
+            self._sbml_document = None
+
+    def get_dependency_graph(self):
+        """
+        Return the dependency graph of the model, see `DependencyGraph`.
 
-        for (key, val) in self._yaml_model.items():
-            if val:
-                reduced_model_dict[key] = copy.deepcopy(val)
+        The graph is built on the first call and updated on each edit
+        afterwards, at the cost of the size of the edited entries. It must
+        not be modified.
 
-        return reduced_model_dict
+        Returns:
+            graph: the `DependencyGraph` of the model.
+        """
+        if self._dependency_graph is None:
+            from .dependency_graph import DependencyGraph
+            self._dependency_graph = DependencyGraph.from_model(self)
+
+        return self._dependency_graph
+
+    def _patch_dependency_graph(self, method: str, *args):
+        """
+        Apply an edit to the dependency graph, if it was built.
+
+        Arguments:
+            method: name of the method of `DependencyGraph`, that is called
+                with `args`, e.g. 'add_entry'.
+        """
+        if self._dependency_graph is not None:
+            getattr(self._dependency_graph, method)(*args)
 
     # functionalities regarding the time
     def is_set_time(self):
@@ -187,10 +392,20 @@ class YamlModel:
     def set_time(self,
                  time_variable: str):
         """Set time variable."""
+        self._model_modified()
+        self._patch_sbml(_set_sbml_time, self._yaml_model,
+                         self.get_time(), time_variable)
+        self._patch_dependency_graph('remove_entry', 'time', self.get_time())
         self._yaml_model['time'] = {'variable': time_variable}
+        self._patch_dependency_graph('add_entry', 'time',
+                                     self._yaml_model['time'])
 
     def delete_time(self):
         """Delete time variable."""
+        self._model_modified()
+        self._patch_sbml(_set_sbml_time, self._yaml_model,
+                         self.get_time(), None)
+        self._patch_dependency_graph('remove_entry', 'time', self.get_time())
         self._yaml_model['time'] = {}
 
     def get_time(self):
@@ -237,7 +452,7 @@ class YamlModel:
                 optional.
         """
         # if parameter exists: delete if overwrite
-        if parameter_id in self.get_parameter_ids():
+        if parameter_id in self._yaml_model['parameters']:
             if overwrite:
                 self.delete_parameter(parameter_id)
             else:
@@ -276,7 +491,7 @@ class YamlModel:
                 bool, indicates if an existing state/ODE should be overwritten
         """
         # if state exists: delete if overwrite
-        if state_id in self.get_ode_ids():
+        if state_id in self._yaml_model['odes']:
             if overwrite:
                 self.delete_ode(state_id)
             else:
@@ -308,7 +523,7 @@ class YamlModel:
                 bool, indicates if an existing assignment should be overwritten
         """
         # if assignment exists: delete if overwrite
-        if assignment_id in self.get_assignment_ids():
+        if assignment_id in self._yaml_model['assignments']:
             if overwrite:
                 self.delete_assignment(assignment_id)
             else:
@@ -342,7 +557,7 @@ class YamlModel:
                 bool, indicates if an existing function should be overwritten
         """
         # if function exists: delete if overwrite
-        if function_id in self.get_function_ids():
+        if function_id in self._yaml_model['functions']:
             if overwrite:
                 self.delete_function(function_id)
             else:
@@ -388,7 +603,7 @@ class YamlModel:
                 Observable transformation ('lin'/'log'/'log10'). Optional
         """
         # if observable exists: delete if overwrite
-        if observable_id in self.get_observable_ids():
+        if observable_id in self._yaml_model['observables']:
             if overwrite:
                 self.delete_observable(observable_id)
             else:
@@ -431,7 +646,7 @@ class YamlModel:
                 Condition name. Optional.
         """
         # if condition exists: delete if overwrite
-        if condition_id in self.get_condition_ids():
+        if condition_id in self._yaml_model['conditions']:
             if overwrite:
                 self.delete_condition(condition_id)
             else:
@@ -445,6 +660,265 @@ class YamlModel:
 
         self._add_entry(entry_dict, 'conditions')
 
+    # functions adding multiple values at once
+    def add_parameters(self,
+                       parameter_ids: Sequence[str],
+                       overwrite: bool = False,
+                       nominal_values: Sequence[float] = None,
+                       parameter_names: Sequence[str] = None,
+                       parameter_scales: Sequence[str] = None,
+                       lower_bounds: Sequence[float] = None,
+                       upper_bounds: Sequence[float] = None,
+                       estimates: Sequence[int] = None):
+        """
+        Add multiple parameters at once.
+
+        Equivalent to calling `add_parameter` for each parameter id, but
+        checks for duplicates only once. All arguments except for
+        `parameter_ids` and `overwrite` can be given as sequence/NumPy array
+        with one value per parameter, as a single value, that is used for all
+        parameters, or as `None`.
+
+        Arguments:
+            parameter_ids:
+                sequence of parameter ids
+            overwrite:
+                bool, indicates if existing parameters should be overwritten
+            nominal_values:
+                nominal values of the parameters.
+            parameter_names:
+                names of the parameters in PEtab parameter table, optional.
+            parameter_scales:
+                scales of the parameters in PEtab parameter table, optional.
+            lower_bounds:
+                lower bounds of the parameters in PEtab parameter table,
+                optional.
+            upper_bounds:
+                upper bounds of the parameters in PEtab parameter table,
+                optional.
+            estimates:
+                estimate flags of the parameters in PEtab parameter table,
+                optional.
+        """
+        self._add_entries({'parameterId': parameter_ids,
+                           'nominalValue': nominal_values,
+                           'parameterName': parameter_names,
+                           'parameterScale': parameter_scales,
+                           'lowerBound': lower_bounds,
+                           'upperBound': upper_bounds,
+                           'estimate': estimates},
+                          'parameters',
+                          overwrite)
+
+    def add_odes(self,
+                 state_ids: Sequence[str],
+                 right_hand_sides: Sequence[Union[float, str]],
+                 initial_values: Sequence[Union[float, str]],
+                 overwrite: bool = False):
+        """
+        Add multiple states/ODEs at once.
+
+        Equivalent to calling `add_ode` for each state id, but checks for
+        duplicates only once. `right_hand_sides` and `initial_values` can be
+        given as sequence/NumPy array with one value per state or as a single
+        value, that is used for all states.
+
+        Arguments:
+            state_ids:
+                sequence of state ids
+            right_hand_sides:
+                right hand sides of the ODEs.
+            initial_values:
+                initial values of the ODEs at t=0
+            overwrite:
+                bool, indicates if existing states/ODEs should be overwritten
+        """
+        self._add_entries({'stateId': state_ids,
+                           'rightHandSide': right_hand_sides,
+                           'initialValue': initial_values},
+                          'odes',
+                          overwrite)
+
+    def add_assignments(self,
+                        assignment_ids: Sequence[str],
+                        formulas: Sequence[str],
+                        overwrite: bool = False):
+        """
+        Add multiple assignments at once.
+
+        Equivalent to calling `add_assignment` for each assignment id, but
+        checks for duplicates only once.
+
+        Arguments:
+            assignment_ids:
+                sequence of assignment ids
+            formulas:
+                right hand sides of the assignment definitions.
+            overwrite:
+                bool, indicates if existing assignments should be overwritten
+        """
+        self._add_entries({'assignmentId': assignment_ids,
+                           'formula': formulas},
+                          'assignments',
+                          overwrite)
+
+    def add_observables(self,
+                        observable_ids: Sequence[str],
+                        observable_formulas: Sequence[str],
+                        noise_formulas: Sequence[str],
+                        overwrite: bool = False,
+                        observable_names: Sequence[str] = None,
+                        observable_transformations: Sequence[str] = None,
+                        noise_distributions: Sequence[str] = None):
+        """
+        Add multiple observables at once.
+
+        Equivalent to calling `add_observable` for each observable id, but
+        checks for duplicates only once. All arguments except for
+        `observable_ids` and `overwrite` can be given as sequence/NumPy array
+        with one value per observable or as a single value, that is used for
+        all observables.
+
+        Arguments:
+            observable_ids:
+                sequence of observable ids
+            observable_formulas:
+                formulas of the observable functions
+            noise_formulas:
+                formulas of the noise
+            overwrite:
+                bool, indicates if existing observables should be overwritten
+            observable_names:
+                Observable names. Optional.
+            observable_transformations:
+                Observable transformations ('lin'/'log'/'log10'). Optional
+            noise_distributions:
+                Noise distributions. Optional
+        """
+        self._add_entries({'observableId': observable_ids,
+                           'observableName': observable_names,
+                           'observableFormula': observable_formulas,
+                           'observableTransformation':
+                               observable_transformations,
+                           'noiseFormula': noise_formulas,
+                           'noiseDistribution': noise_distributions},
+                          'observables',
+                          overwrite)
+
+    def add_entries_from_df(self,
+                            block_key: str,
+                            df,
+                            overwrite: bool = False):
+        """
+        Add all rows of a pandas DataFrame to the block `block_key`.
+
+        The column names have to coincide with the keys of the YAML format
+        (which are the column names of the corresponding PEtab table), e.g.
+        `stateId`, `rightHandSide` and `initialValue` for the block `odes`.
+        The id column can also be given as index of `df`. Missing values
+        (`NaN`/`None`) are omitted.
+
+        Arguments:
+            block_key:
+                name of the block, e.g. 'parameters' or 'odes'.
+            df:
+                pandas.DataFrame, that contains one entry per row.
+            overwrite:
+                bool, indicates if existing entries should be overwritten
+        """
+        if block_key not in _ID_KEYS:
+            raise ValueError(f'Could not add entries to block {block_key}. '
+                             f'Valid blocks are {list(_ID_KEYS.keys())}.')
+
+        if df.index.name == _ID_KEYS[block_key]:
+            df = df.reset_index()
+
+        self._add_entries({col: df[col] for col in df.columns},
+                          block_key,
+                          overwrite)
+
+    def _add_entries(self,
+                     columns: dict,
+                     block_key: str,
+                     overwrite: bool):
+        """
+        Add multiple entries, given column-wise, to a block in one pass.
+
+        Arguments:
+        columns:
+            dict, that maps keys of the entries to sequences of values, to
+            single values, that are used for all entries, or to None.
+            Contains the id key of the block.
+        block_key:
+            name of the block (e.g. 'parameters')
+        overwrite:
+            bool, indicates if existing entries should be overwritten
+
+        Raises:
+            ValueError, if the ids are no sequence, a column has not one
+            value per id, or an id occurs multiple times or already exists
+            and `overwrite=False`.
+        """
+        index_key = _ID_KEYS[block_key]
+        ids = columns[index_key]
+
+        if hasattr(ids, 'tolist'):
+            ids = ids.tolist()
+
+        if isinstance(ids, str) or not hasattr(ids, '__iter__'):
+            raise ValueError(f'Could not add {block_key}: The {index_key}s '
+                             f'have to be a sequence, e.g. a list, but '
+                             f'{ids!r} is given.')
+
+        ids = list(ids)
+        n_entries = len(ids)
+
+        columns = {key: _to_column(val, n_entries)
+                   for (key, val) in columns.items() if val is not None}
+
+        for (key, val) in columns.items():
+            if len(val) != n_entries:
+                raise ValueError(f'Could not add {block_key}: {key} has '
+                                 f'{len(val)} values, but {n_entries} ids '
+                                 f'are given.')
+
+        # check for duplicates once for all new ids
+        if len(set(ids)) != n_entries:
+            raise ValueError(f'Could not add {block_key}: The given '
+                             f'{index_key}s contain duplicates.')
+
+        block = self._yaml_model[block_key]
+        existing_ids = block.keys() & ids
+
+        if existing_ids and not overwrite:
+            raise ValueError(f'Could not add {block_key}: Entries with the '
+                             f'{index_key}s {sorted(existing_ids)} already '
+                             f'exist.')
+
+        self._model_modified()
+
+        for entry_id in existing_ids:
+            del block[entry_id]
+            self._patch_sbml(_delete_sbml_entry, block_key, entry_id)
+            self._patch_dependency_graph('remove_entry', block_key, entry_id)
+
+        # build all entries, filter out missing values only in rows, that
+        # contain missing values.
+        keys = list(columns.keys())
+        incomplete_rows = {i for col in columns.values()
+                           for (i, value) in enumerate(col)
+                           if value is None or value != value}
+
+        for (i, row) in enumerate(zip(*columns.values())):
+            if i in incomplete_rows:
+                block[ids[i]] = _filter_missing_values(dict(zip(keys, row)))
+            else:
+                block[ids[i]] = dict(zip(keys, row))
+
+            self._patch_sbml(_add_sbml_entry, self._yaml_model, block_key,
+                             block[ids[i]])
+            self._patch_dependency_graph('add_entry', block_key, block[ids[i]])
+
     def _add_entry(self,
                    entry_dict: dict,
                    block_key: str):
@@ -461,50 +935,53 @@ class YamlModel:
         """
         # filter out None values and append
         filtered_dict = _filter_none_values(entry_dict)
-        self._yaml_model[block_key].append(filtered_dict)
+        entry_id = filtered_dict[_ID_KEYS[block_key]]
+
+        self._model_modified()
+        self._yaml_model[block_key][entry_id] = filtered_dict
+        self._patch_sbml(_add_sbml_entry, self._yaml_model, block_key,
+                         filtered_dict)
+        self._patch_dependency_graph('add_entry', block_key, filtered_dict)
 
     # functionalities to get ids
     def get_parameter_ids(self):
         """Return a list with all parameter ids."""
-        return self._get_ids('parameters', 'parameterId')
+        return self._get_ids('parameters')
 
     def get_ode_ids(self):
         """Return a list with all state ids."""
-        return self._get_ids('odes', 'stateId')
+        return self._get_ids('odes')
 
     def get_assignment_ids(self):
         """Return a list with all assignment ids."""
-        return self._get_ids('assignments', 'assignmentId')
+        return self._get_ids('assignments')
 
     def get_function_ids(self):
         """Return a list with all function ids."""
-        return self._get_ids('functions', 'functionId')
+        return self._get_ids('functions')
 
     def get_observable_ids(self):
         """Return a list with all observable ids."""
-        return self._get_ids('observables', 'observableId')
+        return self._get_ids('observables')
 
     def get_condition_ids(self):
         """Return a list with all conditions ids."""
-        return self._get_ids('conditions', 'conditionId')
+        return self._get_ids('conditions')
 
     def _get_ids(self,
-                 block_key: str,
-                 index_key: str):
+                 block_key: str):
         """
-        Return all ids in the corresponding block.
+        Return all ids in the corresponding block in insertion order.
 
         Arguments:
         block_key:
             name, where the ids should be searched (e.g. 'parameters')
-        index_key:
-            key of the identifier, in that block (e.g. 'parameterId')
 
         Returns:
         res:
             list of ids
         """
-        return [element[index_key] for element in self._yaml_model[block_key]]
+        return list(self._yaml_model[block_key].keys())
 
     # functionalities to get entry by Id:
     def get_parameter_by_id(self,
@@ -514,11 +991,10 @@ class YamlModel:
 
         Raise a `ValueError, if the parameter does not exist.
         """
-        if parameter_id not in self.get_parameter_ids():
+        if parameter_id not in self._yaml_model['parameters']:
             raise IndexError(f'Could not find parameter {parameter_id}.')
 
         return self._get_entry_by_id('parameters',
-                                     'parameterId',
                                      parameter_id)
 
     def get_ode_by_id(self,
@@ -528,11 +1004,10 @@ class YamlModel:
 
         Raise a `ValueError`, if the ODE/state does not exist.
         """
-        if state_id not in self.get_ode_ids():
+        if state_id not in self._yaml_model['odes']:
             raise IndexError(f'Could not find state/ODE {state_id}.')
 
         return self._get_entry_by_id('odes',
-                                     'stateId',
                                      state_id)
 
     def get_assignment_by_id(self,
@@ -542,11 +1017,10 @@ class YamlModel:
 
         Raise a `ValueError`, if the assignment does not exist.
         """
-        if assignment_id not in self.get_assignment_ids():
+        if assignment_id not in self._yaml_model['assignments']:
             raise IndexError(f'Could not find assignment {assignment_id}.')
 
         return self._get_entry_by_id('assignments',
-                                     'assignmentId',
                                      assignment_id)
 
     def get_function_by_id(self,
@@ -556,11 +1030,10 @@ class YamlModel:
 
         Raise a `ValueError`, if the function does not exist.
         """
-        if function_id not in self.get_function_ids():
+        if function_id not in self._yaml_model['functions']:
             raise IndexError(f'Could not find function {function_id}.')
 
         return self._get_entry_by_id('functions',
-                                     'functionId',
                                      function_id)
 
     def get_observable_by_id(self,
@@ -570,11 +1043,10 @@ class YamlModel:
 
         Raise a `ValueError`, if the observable does not exist.
         """
-        if observable_id not in self.get_observable_ids():
+        if observable_id not in self._yaml_model['observables']:
             raise IndexError(f'Could not find observable {observable_id}.')
 
         return self._get_entry_by_id('observables',
-                                     'observableId',
                                      observable_id)
 
     def get_condition_by_id(self,
@@ -584,41 +1056,37 @@ class YamlModel:
 
         Raise a `ValueError`, if the condition does not exist.
         """
-        if condition_id not in self.get_condition_ids():
+        if condition_id not in self._yaml_model['conditions']:
             raise IndexError(f'Could not find condition {condition_id}.')
 
         return self._get_entry_by_id('conditions',
-                                     'conditionId',
                                      condition_id)
 
     def _get_entry_by_id(self,
                          block_key: str,
-                         index_key: str,
                          entry_id: str):
         """
         Get entry by id in corresponding block.
 
         Returns the entry with id 'entry_id' in the block named
-        `block_key` in self._yaml_model. 'index_key' gives the name of the
-        id-key.
+        `block_key` in self._yaml_model.
 
         Arguments:
         block_key:
             Key of the block (e.g. 'parameters')
-        index_key:
-            key of the identifier in that block (e.g. 'parameterId')
         entry_id:
             Id of element, that should be returned
 
         Returns:
-            Entry_dict. None, if entry is not found.
+            Entry_dict. None, if entry is not found. The dict is a copy,
+            changes do not affect the model.
         """
-        # check if block exists.
-        for entry in self._yaml_model[block_key]:
-            if entry[index_key] == entry_id:
-                return entry
+        entry = self._yaml_model[block_key].get(entry_id)
 
-        return None
+        if entry is None:
+            return None
+
+        return dict(entry)
 
     # functionalities to delete entry by Id:
     def delete_parameter(self,
@@ -629,7 +1097,6 @@ class YamlModel:
         Raise a ValueError, if parameter does not exist.
         """
         if not self._delete_entry('parameters',
-                                  'parameterId',
                                   parameter_id):
 
             raise ValueError(f'Could not delete parameter {parameter_id}. '
@@ -643,7 +1110,6 @@ class YamlModel:
         Raise a ValueError, if state does not exist.
         """
         if not self._delete_entry('odes',
-                                  'stateId',
                                   state_id):
 
             raise ValueError(f'Could not delete ODE for state {state_id}. '
@@ -657,7 +1123,6 @@ class YamlModel:
         Raise a ValueError, if assignment does not exist.
         """
         if not self._delete_entry('assignments',
-                                  'assignmentId',
                                   assignment_id):
 
             raise ValueError(f'Could not delete assignment {assignment_id}. '
@@ -671,7 +1136,6 @@ class YamlModel:
         Raise a ValueError, if function does not exist.
         """
         if not self._delete_entry('functions',
-                                  'functionId',
                                   function_id):
 
             raise ValueError(f'Could not delete function {function_id}. '
@@ -685,7 +1149,6 @@ class YamlModel:
         Raise a ValueError, if observable does not exist.
         """
         if not self._delete_entry('observables',
-                                  'observableId',
                                   observable_id):
 
             raise ValueError(f'Could not delete observable {observable_id}. '
@@ -699,7 +1162,6 @@ class YamlModel:
         Raise a ValueError, if condition does not exist.
         """
         if not self._delete_entry('conditions',
-                                  'conditionId',
                                   condition_id):
 
             raise ValueError(f'Could not delete condition {condition_id}. '
@@ -707,35 +1169,100 @@ class YamlModel:
 
     def _delete_entry(self,
                       block_key: str,
-                      index_key: str,
                       deleted_object_id: str):
         """
         Delete entry in block.
 
         Delete the entry with id 'deleted_object_id' in the block named
-        `block_key` in self._yaml_model. 'index_key' gives the name of the
-        id-key.
+        `block_key` in self._yaml_model.
 
         Arguments:
         block_key:
             Key of the block (e.g. 'parameters')
-        index_key:
-            key of the identifier in that block (e.g. 'parameterId')
         deleted_object_id:
             Id of element, that should be deleted
 
         Returns:
             Bool, that indicates, whether deletion was successful.
         """
-        # Check if block exists
-        for i, entry in enumerate(self._yaml_model[block_key]):
+        if deleted_object_id not in self._yaml_model[block_key]:
+            return False
+
+        self._model_modified()
+        del self._yaml_model[block_key][deleted_object_id]
+        self._patch_sbml(_delete_sbml_entry, block_key, deleted_object_id)
+        self._patch_dependency_graph('remove_entry', block_key,
+                                     deleted_object_id)
+
+        return True
+
+
+def _index_block(block_list: list,
+                 block_key: str):
+    """
+    Translate a block list into a dict, that maps ids to entries.
+
+    Arguments:
+    block_list
+        list of entries of the block (e.g. the parameter definitions)
+    block_key
+        Key of the block (e.g. 'parameters')
+
+    Returns:
+        dict, that maps ids to entries in the order of `block_list`.
+
+    Raises:
+        ValueError, if an id occurs multiple times.
+    """
+    index_key = _ID_KEYS[block_key]
+    indexed_block = {}
+
+    for entry in block_list:
+        if entry[index_key] in indexed_block:
+            raise ValueError(f'Could not load {block_key}: {index_key} '
+                             f'{entry[index_key]} occurs multiple times.')
+        indexed_block[entry[index_key]] = entry
+
+    return indexed_block
+
+
+def _to_column(values, n_entries: int = None) -> list:
+    """
+    Translate the values of a column into a list of python objects.
+
+    Arguments:
+    values
+        sequence, NumPy array or pandas Series, or a single value (e.g. a
+        string or a number), that is repeated `n_entries` times.
+    n_entries
+        number of entries, only needed for single values.
+
+    Returns:
+        list of values.
+    """
+    # NumPy arrays/scalars and pandas Series: convert to python types
+    if hasattr(values, 'tolist'):
+        values = values.tolist()
+
+    if isinstance(values, str) or not hasattr(values, '__iter__'):
+        return [values] * n_entries
+
+    return list(values)
 
-            # search for entry and delete
-            if entry[index_key] == deleted_object_id:
-                self._yaml_model[block_key].pop(i)
-                return True
 
-        return False
+def _filter_missing_values(d: dict):
+    """
+    Filter out the key-value pairs with `None` or NaN as value.
+
+    Arguments:
+    d
+        dictionary
+
+    Returns:
+        filtered dictionary.
+    """
+    return {key: value for (key, value) in d.items()
+            if not (value is None or value != value)}
 
 
 def _filter_none_values(d: dict):
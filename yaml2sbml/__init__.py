@@ -8,3 +8,8 @@ from .yaml2sbml import yaml2sbml
 from .yaml2PEtab import yaml2petab, validate_petab_tables
 from .yaml_validation import validate_yaml
 from .YamlModel import YamlModel
+from .conversion_cache import ConversionCache
+from .profiling import Profile
+from .model_diff import get_fingerprints, diff_models
+from .dependency_graph import DependencyGraph
+from .pruning import get_unused_entities
@@ -0,0 +1,321 @@
+"""Convert or validate many YAML models in one process."""
+import argparse
+import collections
+import concurrent.futures
+import glob
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from .conversion_cache import ConversionCache
+from .file_io import COMPRESSION_EXTENSIONS, _strip_compression_extension
+from .yaml2sbml import yaml2sbml, _load_yaml_file, _log_to_console, \
+    _add_cache_arguments, _add_skip_unchanged_argument, \
+    _get_cache_from_args, CHECK_LEVELS
+from .yaml2PEtab import yaml2petab
+from .yaml_validation import _validate_yaml_from_dict
+
+MODES = ('validate', 'sbml', 'petab')
+
+
+def convert_batch(yaml_files: list,
+                  output_dir: str = None,
+                  mode: str = 'sbml',
+                  jobs: Optional[int] = 1,
+                  check_level: str = 'full',
+                  cache: ConversionCache = None,
+                  skip_unchanged: bool = False) -> list:
+    """
+    Convert or validate multiple YAML models.
+
+    The models are processed in the current process (`jobs=1`) or in a pool
+    of `jobs` processes, such that the imports of libsbml, pandas and petab
+    are paid only once per process. A failing model does not stop the
+    processing of the other models.
+
+    In mode 'sbml', the model `<name>.yaml` is written to
+    `<output_dir>/<name>.xml`. In mode 'petab', the PEtab problem is written
+    to `<output_dir>/<name>/`, organized by `<name>.yaml`.
+
+    Arguments:
+        yaml_files: paths to the YAML models.
+        output_dir: directory of the outputs. Not needed for mode 'validate'.
+        mode: one of 'validate', 'sbml' or 'petab'.
+        jobs: number of processes, a positive integer. 0 or None use one
+            process per CPU.
+        check_level: consistency check of the generated SBML, see
+            `yaml2sbml`.
+        cache: conversion cache, see `yaml2sbml`.
+        skip_unchanged: indicates, whether unchanged output files should be
+            left untouched, see `yaml2sbml`.
+
+    Returns:
+        results: one dict per model (in the order of `yaml_files`) with the
+            keys 'yaml_file', 'success', 'time' (in seconds), 'error'
+            (message or None) and 'written_files'.
+
+    Raises:
+        ValueError, if the arguments are invalid or two models would be
+            written to the same output.
+    """
+    if mode not in MODES:
+        raise ValueError(f'Invalid mode {mode}. Valid modes are {MODES}.')
+
+    jobs = _get_number_of_jobs(jobs)
+
+    if mode != 'validate':
+        if output_dir is None:
+            raise ValueError(f'Mode {mode} requires an output_dir.')
+
+        name_counts = collections.Counter(_get_model_name(file)
+                                          for file in yaml_files)
+        duplicates = {name for (name, count) in name_counts.items()
+                      if count > 1}
+        if duplicates:
+            raise ValueError(f'Multiple models with the names '
+                             f'{sorted(duplicates)}. Their outputs would '
+                             f'overwrite each other.')
+
+        os.makedirs(output_dir, exist_ok=True)
+
+    options = {'check_level': check_level,
+               'cache': cache,
+               'skip_unchanged': skip_unchanged}
+
+    if jobs == 1:
+        return [_convert_single(file, output_dir, mode, options)
+                for file in yaml_files]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_convert_single,
+                             yaml_files,
+                             [output_dir] * len(yaml_files),
+                             [mode] * len(yaml_files),
+                             [options] * len(yaml_files)))
+
+
+def _get_number_of_jobs(jobs: Optional[int]) -> int:
+    """
+    Return the number of processes for `convert_batch`.
+
+    Arguments:
+        jobs: a positive integer, or 0 or None for one process per CPU.
+
+    Returns:
+        jobs: a positive integer.
+
+    Raises:
+        ValueError, if `jobs` is negative or no integer.
+    """
+    if jobs is None or jobs == 0:
+        return os.cpu_count() or 1
+
+    if not isinstance(jobs, int) or jobs < 0:
+        raise ValueError(f'Invalid number of jobs {jobs}. jobs should be a '
+                         f'positive integer, 0 or None.')
+
+    return jobs
+
+
+def _convert_single(yaml_file: str,
+                    output_dir: str,
+                    mode: str,
+                    options: dict) -> dict:
+    """
+    Convert or validate a single model of a batch.
+
+    Arguments:
+        yaml_file: path to the YAML model.
+        output_dir: directory of the outputs.
+        mode: one of 'validate', 'sbml' or 'petab'.
+        options: further arguments of `yaml2sbml`/`yaml2petab`.
+
+    Returns:
+        result: dict as described in `convert_batch`.
+    """
+    model_name = _get_model_name(yaml_file)
+    written_files = []
+    error = None
+
+    start_time = time.perf_counter()
+
+    try:
+        if mode == 'validate':
+            _validate_yaml_from_dict(_load_yaml_file(yaml_file))
+
+        elif mode == 'sbml':
+            written_files = yaml2sbml(
+                yaml_file,
+                os.path.join(output_dir, model_name + '.xml'),
+                check_level=options['check_level'],
+                cache=options['cache'],
+                skip_unchanged=options['skip_unchanged'])
+
+        else:
+            written_files = yaml2petab(
+                yaml_file,
+                os.path.join(output_dir, model_name),
+                model_name,
+                petab_yaml_name=model_name + '.yaml',
+                check_level=options['check_level'],
+                cache=options['cache'],
+                skip_unchanged=options['skip_unchanged'])
+
+    # the creation of the SBML document raises SystemExit, if it fails.
+    except (Exception, SystemExit) as e:
+        error = f'{type(e).__name__}: {e}'
+
+    return {'yaml_file': yaml_file,
+            'success': error is None,
+            'time': time.perf_counter() - start_time,
+            'error': error,
+            'written_files': written_files}
+
+
+def _get_model_name(yaml_file: str) -> str:
+    """Return the model name, i.e. the file name without extensions."""
+    return Path(_strip_compression_extension(yaml_file)).stem
+
+
+def _collect_yaml_files(inputs: list,
+                        manifest: str = None,
+                        output_dir: str = None) -> list:
+    """
+    Collect the YAML models from files, directories and a manifest.
+
+    Arguments:
+        inputs: paths to YAML files or to directories, which are searched
+            recursively for `*.yaml`/`*.yml` files, that may be compressed
+            (e.g. `*.yaml.gz`).
+        manifest: path to a text file, that lists one path per line. Relative
+            paths are relative to the manifest. Empty lines and lines
+            starting with '#' are ignored.
+        output_dir: output directory of the batch. Files in it, e.g. the
+            PEtab YAML files of a previous run, are not collected from
+            directories.
+
+    Returns:
+        yaml_files: paths to the YAML models, without duplicates.
+    """
+    inputs = list(inputs)
+
+    if manifest is not None:
+        manifest_dir = os.path.dirname(os.path.abspath(manifest))
+
+        with open(manifest, 'r') as f_in:
+            for line in f_in:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    inputs.append(os.path.join(manifest_dir, line))
+
+    yaml_files = []
+
+    for path in inputs:
+        if os.path.isdir(path):
+            yaml_files.extend(sorted(
+                file for pattern in _get_yaml_patterns()
+                for file in glob.glob(os.path.join(path, '**', pattern),
+                                      recursive=True)
+                if not _is_in_directory(file, output_dir)))
+        else:
+            yaml_files.append(path)
+
+    # remove duplicates, keep order
+    return list(dict.fromkeys(yaml_files))
+
+
+def _is_in_directory(file: str, directory: str = None) -> bool:
+    """Check, whether a file is inside of a directory, if one is given."""
+    if directory is None:
+        return False
+
+    directory = os.path.realpath(directory)
+
+    return os.path.commonpath([os.path.realpath(file), directory]) \
+        == directory
+
+
+def _get_yaml_patterns() -> list:
+    """Return the glob patterns of (compressed) YAML files."""
+    return [pattern + compression
+            for pattern in ['*.yaml', '*.yml']
+            for compression in ('',) + COMPRESSION_EXTENSIONS]
+
+
+def main():
+    """Command-Line Interface."""
+    parser = argparse.ArgumentParser(
+        description='Converts or validates multiple YAML models in one '
+                    'process or a pool of processes.')
+
+    parser.add_argument('inputs', type=str, nargs='*',
+                        help='YAML files or directories, that are searched '
+                             'for *.yaml/*.yml files (optionally compressed, '
+                             'e.g. *.yaml.gz).')
+    parser.add_argument('--manifest', type=str, default=None,
+                        help='Optional argument, text file, that lists one '
+                             'YAML file or directory per line.')
+    parser.add_argument('-m', '--mode', type=str, default='sbml',
+                        choices=MODES,
+                        help='Optional argument, validate the models or '
+                             'convert them to SBML or PEtab. Defaults to '
+                             'sbml.')
+    parser.add_argument('-o', '--output_dir', type=str, default=None,
+                        help='Output directory, required for the modes sbml '
+                             'and petab.')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Optional argument, number of processes. 0 uses '
+                             'one process per CPU. Defaults to 1.')
+    parser.add_argument('-c', '--check_level', type=str, default='full',
+                        choices=CHECK_LEVELS,
+                        help='Optional argument, consistency check of the '
+                             'generated SBML. Defaults to full.')
+    _add_cache_arguments(parser)
+    _add_skip_unchanged_argument(parser)
+
+    args = parser.parse_args()
+    _log_to_console()
+
+    yaml_files = _collect_yaml_files(args.inputs, args.manifest,
+                                     args.output_dir)
+    try:
+        jobs = _get_number_of_jobs(args.jobs)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if not yaml_files:
+        parser.error('No YAML files found.')
+
+    print(f'Processing {len(yaml_files)} models ({args.mode}) '
+          f'with {jobs} process(es)...')
+
+    start_time = time.perf_counter()
+    results = convert_batch(yaml_files,
+                            args.output_dir,
+                            args.mode,
+                            jobs,
+                            args.check_level,
+                            _get_cache_from_args(args),
+                            args.skip_unchanged)
+    wall_time = time.perf_counter() - start_time
+
+    for result in results:
+        if result['success']:
+            print(f'✅ {result["yaml_file"]} ({result["time"]:.2f} s)')
+        else:
+            print(f'❌ {result["yaml_file"]} ({result["time"]:.2f} s): '
+                  f'{result["error"]}')
+
+    n_success = sum(result['success'] for result in results)
+    print(f'{n_success}/{len(results)} models succeeded. Wall time: '
+          f'{wall_time:.2f} s, summed time per model: '
+          f'{sum(result["time"] for result in results):.2f} s.')
+
+    if n_success < len(results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+"""On-disk cache for the outputs of yaml2sbml and yaml2petab."""
+import argparse
+import builtins
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import warnings
+
+from .version import __version__
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'YAML2SBML_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'yaml2sbml'))
+
+# default size limit of the cache in bytes.
+DEFAULT_MAX_SIZE = 512 * 1024 ** 2
+
+# file, that lists the output files and the warnings of a cache entry. It is
+# written last, so entries without manifest are incomplete and ignored.
+MANIFEST = 'manifest.json'
+
+# directory of the package, to tell its warnings from those of dependencies.
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ConversionCache:
+    """
+    Cache for the outputs of a conversion, keyed by a hash of the input.
+
+    The key of a conversion is computed from the content of the YAML file,
+    the options of the conversion and the version of yaml2sbml. Each entry
+    stores the generated output files in a subdirectory of `cache_dir`,
+    together with the warnings of the conversion, which are emitted again,
+    when the entry is used.
+    If the total size of all entries exceeds `max_size`, the least recently
+    used entries are deleted.
+    """
+
+    def __init__(self,
+                 cache_dir: str = None,
+                 max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize the cache.
+
+        Arguments:
+            cache_dir: directory of the cache. Defaults to the environment
+                variable `YAML2SBML_CACHE_DIR` or `~/.cache/yaml2sbml`.
+            max_size: maximal size of the cache in bytes.
+        """
+        if cache_dir is None:
+            cache_dir = DEFAULT_CACHE_DIR
+
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    @staticmethod
+    def get_key(yaml_dir: str, **options) -> str:
+        """
+        Compute the key of a conversion.
+
+        Arguments:
+            yaml_dir: path to the YAML file, that is converted.
+            options: all options, that have an effect on the output.
+
+        Returns:
+            key: hex digest of the hash of YAML content, options and version.
+        """
+        key_hash = hashlib.sha256()
+
+        with open(yaml_dir, 'rb') as f_in:
+            for chunk in iter(lambda: f_in.read(1024 ** 2), b''):
+                key_hash.update(chunk)
+
+        key_hash.update(json.dumps(options, sort_keys=True).encode())
+        key_hash.update(__version__.encode())
+
+        return key_hash.hexdigest()
+
+    def get(self, key: str):
+        """
+        Look up the output files of a conversion.
+
+        The warnings of the cached conversion are emitted again.
+
+        Arguments:
+            key: key of the conversion, see `get_key`.
+
+        Returns:
+            dict, that maps the names of the output files (relative to the
+            `base_dir` of `put`) to their paths in the cache. None, if the
+            conversion is not cached.
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        manifest_dir = os.path.join(entry_dir, MANIFEST)
+
+        try:
+            with open(manifest_dir, 'r') as f_in:
+                manifest = json.load(f_in)
+            # mark the entry as recently used.
+            os.utime(manifest_dir)
+        except (OSError, ValueError):
+            logger.info('Conversion not found in cache.')
+            return None
+
+        logger.info(f'Using cached conversion from {entry_dir}.')
+
+        for (category_name, message) in manifest['warnings']:
+            warnings.warn(message, _get_warning_category(category_name))
+
+        return {file_name: os.path.join(entry_dir, stored_name)
+                for (file_name, stored_name) in manifest['files'].items()}
+
+    def put(self,
+            key: str,
+            output_files: list,
+            base_dir: str,
+            caught_warnings: list = ()):
+        """
+        Store the output files of a conversion.
+
+        Arguments:
+            key: key of the conversion, see `get_key`.
+            output_files: paths to the output files, inside of `base_dir`.
+            base_dir: directory, relative to which the files are restored.
+            caught_warnings: warnings of the conversion, see
+                `_record_warnings`. Only the warnings, that yaml2sbml
+                issued itself, are stored, see `_is_package_warning`.
+
+        Raises:
+            ValueError, if an output file is not inside of `base_dir`.
+        """
+        file_names = [os.path.relpath(file, base_dir) for file in output_files]
+
+        for file_name in file_names:
+            if not _is_inside(file_name):
+                raise ValueError(f'Can not cache {file_name}, since it is not '
+                                 f'inside of {base_dir}.')
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # fill a temporary directory and move it into place at once, such
+        # that other processes never see incomplete entries. The files are
+        # stored under unique flat names.
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix='.tmp_')
+        manifest = {'files': {}, 'warnings': []}
+
+        for (i, (file, file_name)) in enumerate(zip(output_files,
+                                                    file_names)):
+            stored_name = f'{i}_{os.path.basename(file_name)}'
+            shutil.copyfile(file, os.path.join(tmp_dir, stored_name))
+            manifest['files'][file_name] = stored_name
+
+        for caught_warning in filter(_is_package_warning, caught_warnings):
+            manifest['warnings'].append([caught_warning.category.__name__,
+                                         str(caught_warning.message)])
+
+        with open(os.path.join(tmp_dir, MANIFEST), 'w') as f_out:
+            json.dump(manifest, f_out)
+
+        try:
+            os.replace(tmp_dir, os.path.join(self.cache_dir, key))
+        except OSError:
+            # entry was already created, e.g. by a parallel conversion.
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries, until the size limit holds."""
+        entries = self._get_entries()
+        total_size = sum(size for (_, _, size) in entries)
+
+        for (entry_dir, _, size) in sorted(entries, key=lambda e: e[1]):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+
+    def clear(self):
+        """Delete all entries of the cache."""
+        for (entry_dir, _, _) in self._get_entries():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+    def info(self) -> dict:
+        """
+        Summarize the state of the cache.
+
+        Returns:
+            dict with the cache directory, the number of entries, their total
+            size and the size limit in bytes.
+        """
+        entries = self._get_entries()
+
+        return {'cache_dir': self.cache_dir,
+                'n_entries': len(entries),
+                'size': sum(size for (_, _, size) in entries),
+                'max_size': self.max_size}
+
+    def _get_entries(self) -> list:
+        """
+        Collect all complete entries of the cache.
+
+        Returns:
+            list of tuples (entry_dir, last_use, size).
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        entries = []
+
+        for entry in os.scandir(self.cache_dir):
+            manifest_dir = os.path.join(entry.path, MANIFEST)
+
+            if not (entry.is_dir() and os.path.exists(manifest_dir)):
+                continue
+
+            size = sum(file.stat().st_size for file in os.scandir(entry.path))
+            entries.append((entry.path, os.stat(manifest_dir).st_mtime, size))
+
+        return entries
+
+
+@contextlib.contextmanager
+def _record_warnings(record: bool = True):
+    """
+    Record the warnings of a conversion, to store them in the cache.
+
+    The recorded warnings are emitted again, when the context is left, such
+    that the caller sees them as without recording.
+
+    Arguments:
+        record: indicates, if the warnings should be recorded.
+
+    Yields:
+        caught_warnings: list of the recorded `warnings.WarningMessage`s,
+            empty, if `record=False`.
+    """
+    if not record:
+        yield []
+        return
+
+    with warnings.catch_warnings(record=True) as caught_warnings:
+        warnings.simplefilter('always')
+        try:
+            yield caught_warnings
+        finally:
+            recorded_warnings = list(caught_warnings)
+
+    for caught_warning in recorded_warnings:
+        warnings.warn_explicit(caught_warning.message,
+                               caught_warning.category,
+                               caught_warning.filename,
+                               caught_warning.lineno)
+
+
+def _is_package_warning(caught_warning: warnings.WarningMessage) -> bool:
+    """
+    Check, whether yaml2sbml issued a warning about the model.
+
+    Warnings of dependencies, e.g. DeprecationWarnings of pandas, do not
+    depend on the model and are not repeated for cache hits.
+    """
+    file_name = os.path.abspath(caught_warning.filename)
+
+    return issubclass(caught_warning.category, (UserWarning, RuntimeWarning)) \
+        and file_name.startswith(PACKAGE_DIR + os.sep)
+
+
+def _get_warning_category(category_name: str) -> type:
+    """Return a built-in warning category by name, UserWarning otherwise."""
+    category = getattr(builtins, category_name, None)
+
+    if isinstance(category, type) and issubclass(category, Warning):
+        return category
+
+    return UserWarning
+
+
+def _is_inside(file_name: str) -> bool:
+    """Check, whether a relative path stays inside of its base directory."""
+    file_name = os.path.normpath(file_name)
+
+    return not os.path.isabs(file_name) \
+        and file_name != os.pardir \
+        and not file_name.startswith(os.pardir + os.sep)
+
+
+def main():
+    """Command-Line Interface."""
+    parser = argparse.ArgumentParser(
+        description='Inspect or clear the conversion cache of yaml2sbml.')
+
+    parser.add_argument('command', type=str, choices=['info', 'clear'],
+                        help='info: print location and size of the cache. '
+                             'clear: delete all entries of the cache.')
+    parser.add_argument('--cache_dir', type=str, default=None,
+                        help='Optional argument, directory of the cache. '
+                             f'Defaults to {DEFAULT_CACHE_DIR}.')
+
+    args = parser.parse_args()
+    cache = ConversionCache(args.cache_dir)
+
+    if args.command == 'clear':
+        cache.clear()
+        print(f'Cleared cache {cache.cache_dir}.')
+    else:
+        info = cache.info()
+        print(f'Cache directory: {info["cache_dir"]}')
+        print(f'Number of entries: {info["n_entries"]}')
+        print(f'Size: {info["size"] / 1024 ** 2:.1f} MB of '
+              f'{info["max_size"] / 1024 ** 2:.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+"""Index of the symbols, that the formulas of a model refer to."""
+import functools
+import re
+from typing import Union
+
+from .lazy_import import _lazy_import
+from .YamlModel import YamlModel, _ID_KEYS
+
+sbml = _lazy_import('libsbml')
+
+# keys of the entries of each block, whose values are formulas (or ids).
+FORMULA_KEYS = {'odes': ('rightHandSide', 'initialValue'),
+                'parameters': (),
+                'assignments': ('formula',),
+                'functions': ('formula',),
+                'observables': ('observableFormula', 'noiseFormula')}
+
+# keys of conditions, that are no parameters or states.
+CONDITION_KEYS = ('conditionId', 'conditionName')
+
+# identifiers in a formula, that are not part of a number such as 1e-3, and
+# whether they are called as function.
+SYMBOL_PATTERN = re.compile(r'(?<![\w.])([A-Za-z_]\w*)(\s*\()?')
+
+# constants of the formula parser of libsbml, in lower case, since the parser
+# ignores their case.
+CONSTANT_NAMES = frozenset(('time', 'pi', 'exponentiale', 'avogadro', 'true',
+                            'false', 'inf', 'infinity', 'nan', 'notanumber'))
+
+
+class DependencyGraph:
+    """
+    Dependencies between the entities of a model.
+
+    The nodes are the entities of the model, given as pairs of the block and
+    the id, e.g. `('parameters', 'k1')`. The time variable is the node
+    `('time', <variable>)`. For each node, the graph stores the symbols, that
+    its formulas refer to: right-hand sides and initial values of ODEs,
+    formulas of assignments and functions (without their arguments),
+    observable and noise formulas, and the targets and values of conditions.
+    It also stores which nodes define each symbol, and which nodes use it.
+
+    Built-in functions and constants of libsbml, e.g. `exp`, `pi` or `time`,
+    are no symbols. Symbols are not resolved, when entities
+    are added, such that entities can be added in any order. Symbols, that
+    are not defined in the model, are part of the reverse index, but no
+    dependency. Adding and removing an entity costs the size of its formulas.
+    """
+
+    def __init__(self):
+        """Initialize an empty graph."""
+        # dicts are used as ordered sets, such that results are reproducible.
+        # node -> dict of the symbols, that it refers to
+        self._symbols = {}
+        # symbol -> dict of the nodes, that refer to it
+        self._users = {}
+        # symbol -> dict of the nodes, that define it
+        self._definitions = {}
+
+    @staticmethod
+    def from_model(model: Union[str, dict, YamlModel]):
+        """
+        Create the graph of a model.
+
+        Arguments:
+            model: path to a YAML model, a YAML model as dict or a
+                `YamlModel`.
+
+        Returns:
+            graph: the dependency graph.
+        """
+        from .model_diff import _get_indexed_blocks
+
+        graph = DependencyGraph()
+
+        for (block_key, block) in _get_indexed_blocks(model).items():
+            if block_key == 'time':
+                graph.add_block('time', block)
+                continue
+
+            for (entity_id, entry) in block.items():
+                graph._add_node((block_key, entity_id), entry)
+
+        return graph
+
+    def add_block(self, block_key: str, block):
+        """
+        Add all entities of a block.
+
+        Arguments:
+            block_key: name of the block, e.g. 'parameters'.
+            block: the block as in the YAML model. The entries of a list
+                block can also be given as iterator, see `Returns`.
+
+        Returns:
+            block: the block, that should be used instead of `block`, since
+                the entries of an iterator are added, while they are read.
+        """
+        if block_key == 'time':
+            self.add_entry('time', block)
+            return block
+
+        if isinstance(block, list):
+            for entry in block:
+                self.add_entry(block_key, entry)
+            return block
+
+        return self._add_entries_while_reading(block_key, block)
+
+    def add_entry(self, block_key: str, entry: dict):
+        """
+        Add an entity.
+
+        Arguments:
+            block_key: name of the block, e.g. 'parameters'.
+            entry: the entry as in the YAML model, e.g. the time block.
+        """
+        if block_key == 'time':
+            if entry.get('variable') is not None:
+                self._add_node(('time', entry['variable']), {})
+            return
+
+        self._add_node((block_key, entry[_ID_KEYS[block_key]]), entry)
+
+    def remove_entry(self, block_key: str, entity_id: str):
+        """
+        Remove an entity, if it exists.
+
+        Arguments:
+            block_key: name of the block, e.g. 'parameters'.
+            entity_id: id of the entity, the variable for the time.
+        """
+        node = (block_key, entity_id)
+        symbols = self._symbols.pop(node, None)
+
+        if symbols is None:
+            return
+
+        for symbol in symbols:
+            _discard(self._users, symbol, node)
+
+        if block_key != 'conditions':
+            _discard(self._definitions, entity_id, node)
+
+    def get_symbols(self, node: tuple) -> list:
+        """
+        Return the symbols, that an entity refers to.
+
+        Arguments:
+            node: the entity as pair of block and id.
+
+        Returns:
+            symbols in the order of their first occurrence.
+        """
+        return list(self._symbols[node])
+
+    def get_dependencies(self, node: tuple) -> list:
+        """
+        Return the entities, that an entity refers to directly.
+
+        Arguments:
+            node: the entity as pair of block and id.
+
+        Returns:
+            nodes, that define the symbols of `node`.
+        """
+        return [definition for symbol in self._symbols[node]
+                for definition in self._definitions.get(symbol, ())
+                if definition != node]
+
+    def get_users(self, symbol: str) -> list:
+        """
+        Return the entities, that refer to a symbol directly.
+
+        Arguments:
+            symbol: e.g. the id of a parameter.
+
+        Returns:
+            nodes, whose formulas contain `symbol`.
+        """
+        return list(self._users.get(symbol, ()))
+
+    def get_definitions(self, symbol: str) -> list:
+        """
+        Return the entities, that define a symbol.
+
+        Arguments:
+            symbol: e.g. the id of a parameter.
+
+        Returns:
+            nodes with the id `symbol`. Usually one, none for undefined
+            symbols.
+        """
+        return list(self._definitions.get(symbol, ()))
+
+    def get_all_dependencies(self, nodes: list) -> list:
+        """
+        Return the entities, that entities refer to directly or indirectly.
+
+        Arguments:
+            nodes: the entities as pairs of block and id.
+
+        Returns:
+            nodes, that are needed by `nodes`, including `nodes`.
+        """
+        return self._traverse(nodes, self.get_dependencies)
+
+    def get_all_users(self, nodes: list) -> list:
+        """
+        Return the entities, that refer to entities directly or indirectly.
+
+        E.g. the entities, that are affected by a change of `nodes`.
+
+        Arguments:
+            nodes: the entities as pairs of block and id.
+
+        Returns:
+            nodes, that depend on `nodes`, including `nodes`.
+        """
+        return self._traverse(nodes,
+                              lambda node: self.get_users(node[1]))
+
+    def __contains__(self, node: tuple) -> bool:
+        """Check, whether the graph contains an entity."""
+        return node in self._symbols
+
+    def __iter__(self):
+        """Iterate over the entities in the order, they were added."""
+        return iter(self._symbols)
+
+    def __len__(self) -> int:
+        """Return the number of entities."""
+        return len(self._symbols)
+
+    def _add_node(self, node: tuple, entry: dict):
+        """Add an entity with the symbols of its entry, see `add_entry`."""
+        if node in self._symbols:
+            self.remove_entry(*node)
+
+        symbols = dict.fromkeys(_get_entry_symbols(node[0], entry))
+        self._symbols[node] = symbols
+
+        for symbol in symbols:
+            self._users.setdefault(symbol, {})[node] = None
+
+        if node[0] != 'conditions':
+            self._definitions.setdefault(node[1], {})[node] = None
+
+    def _add_entries_while_reading(self, block_key: str, entries):
+        """Add the entries of an iterator, while they are read."""
+        for entry in entries:
+            self.add_entry(block_key, entry)
+            yield entry
+
+    def _traverse(self, nodes: list, get_neighbours) -> list:
+        """Return all nodes, that are reachable from `nodes`."""
+        visited = dict.fromkeys(nodes)
+        stack = list(nodes)
+
+        while stack:
+            for neighbour in get_neighbours(stack.pop()):
+                if neighbour not in visited:
+                    visited[neighbour] = None
+                    stack.append(neighbour)
+
+        return list(visited)
+
+
+def _get_entry_symbols(block_key: str, entry: dict) -> list:
+    """
+    Return the symbols, that an entry refers to.
+
+    Arguments:
+        block_key: name of the block, e.g. 'odes'.
+        entry: the entry as in the YAML model.
+
+    Returns:
+        symbols, possibly with duplicates.
+    """
+    if block_key == 'conditions':
+        # the keys of a condition are the ids of parameters or states.
+        symbols = []
+        for (key, value) in entry.items():
+            if key not in CONDITION_KEYS:
+                symbols.append(key)
+                symbols.extend(_get_formula_symbols(value))
+    else:
+        symbols = [symbol for key in FORMULA_KEYS.get(block_key, ())
+                   if key in entry
+                   for symbol in _get_formula_symbols(entry[key])]
+
+    if block_key == 'functions':
+        arguments = {argument.strip()
+                     for argument in str(entry['arguments']).split(',')}
+        symbols = [symbol for symbol in symbols if symbol not in arguments]
+
+    return symbols
+
+
+def _get_formula_symbols(formula) -> list:
+    """
+    Return the symbols of a formula in the order of their occurrence.
+
+    The identifiers are found by `SYMBOL_PATTERN` instead of parsing the
+    formula with libsbml, which is several times slower for large models.
+    Built-in functions and constants of libsbml are left out.
+    """
+    if isinstance(formula, (int, float)):
+        return []
+
+    return [name for (name, call) in SYMBOL_PATTERN.findall(str(formula))
+            if (_is_user_function(name) if call
+                else name.lower() not in CONSTANT_NAMES)]
+
+
+@functools.lru_cache(maxsize=10000)
+def _is_user_function(name: str) -> bool:
+    """Check, whether libsbml parses a call of `name` as user function."""
+    math_ast = sbml.parseL3Formula(f'{name}(x)')
+
+    return math_ast is not None and math_ast.getType() == sbml.AST_FUNCTION
+
+
+def _discard(index: dict, symbol: str, node: tuple):
+    """Remove a node from the entry of `symbol` in an index."""
+    nodes = index.get(symbol)
+
+    if nodes is not None:
+        nodes.pop(node, None)
+        if not nodes:
+            del index[symbol]
@@ -0,0 +1,294 @@
+"""Reading and writing of the files of yaml2sbml."""
+import bz2
+import filecmp
+import gzip
+import io
+import logging
+import lzma
+import os
+import shutil
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# use the C implementation of PyYAML (libyaml), if PyYAML was built with it.
+# Otherwise, fall back to the pure-Python implementation with the same
+# (safe) semantics.
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# zstandard is an optional dependency for .zst files.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# extensions of compressed files, that are supported transparently.
+COMPRESSION_EXTENSIONS = ('.gz', '.bz2', '.xz', '.zst')
+
+
+def _write_file(file_dir: str,
+                content: str,
+                skip_unchanged: bool = False,
+                newline: str = None) -> bool:
+    """
+    Write `content` to the file `file_dir`.
+
+    If `skip_unchanged=True` and the file already contains `content`, the
+    file is not touched, such that e.g. its modification time is kept and
+    build tools do not consider it as changed.
+
+    Arguments:
+        file_dir: path to the file. Compressed, if it ends with one of
+            `COMPRESSION_EXTENSIONS`.
+        content: content of the file.
+        skip_unchanged: indicates, if an unchanged file should not be
+            rewritten.
+        newline: newline argument of `open`, e.g. '' to write line endings
+            unchanged.
+
+    Returns:
+        written: indicates, whether the file was written.
+    """
+    if skip_unchanged:
+        if _has_content(file_dir, content, newline):
+            logger.info(f'{file_dir} is unchanged and was not rewritten.')
+            return False
+        logger.info(f'{file_dir} has changed and is rewritten.')
+
+    with _open_file(file_dir, 'w', newline=newline) as f_out:
+        f_out.write(content)
+
+    return True
+
+
+def _copy_file(source_dir: str,
+               file_dir: str,
+               skip_unchanged: bool = False) -> bool:
+    """
+    Copy the file `source_dir` to `file_dir`.
+
+    If `skip_unchanged=True` and both files are identical, `file_dir` is not
+    touched.
+
+    Arguments:
+        source_dir: path to the file, that is copied.
+        file_dir: path to the copy.
+        skip_unchanged: indicates, if an unchanged file should not be
+            rewritten.
+
+    Returns:
+        written: indicates, whether the file was written.
+    """
+    if skip_unchanged:
+        if os.path.isfile(file_dir) and \
+                filecmp.cmp(source_dir, file_dir, shallow=False):
+            logger.info(f'{file_dir} is unchanged and was not rewritten.')
+            return False
+        logger.info(f'{file_dir} has changed and is rewritten.')
+
+    shutil.copyfile(source_dir, file_dir)
+
+    return True
+
+
+def _replace_file(source_dir: str,
+                  file_dir: str,
+                  skip_unchanged: bool = False) -> bool:
+    """
+    Move the file `source_dir` to `file_dir`, replacing it.
+
+    If `skip_unchanged=True` and both files are identical, `file_dir` is not
+    touched and `source_dir` is deleted.
+
+    Arguments:
+        source_dir: path to the file, that is moved.
+        file_dir: path to the destination.
+        skip_unchanged: indicates, if an unchanged file should not be
+            rewritten.
+
+    Returns:
+        written: indicates, whether the file was written.
+    """
+    if skip_unchanged:
+        if os.path.isfile(file_dir) and \
+                filecmp.cmp(source_dir, file_dir, shallow=False):
+            logger.info(f'{file_dir} is unchanged and was not rewritten.')
+            os.remove(source_dir)
+            return False
+        logger.info(f'{file_dir} has changed and is rewritten.')
+
+    os.replace(source_dir, file_dir)
+
+    return True
+
+
+class _GzipFile(gzip.GzipFile):
+    """
+    Gzip file without time stamp and file name in the header.
+
+    `gzip.open` always writes both, hence the file is opened here and passed
+    as file object. Since `GzipFile` does not close a passed file object,
+    it is closed together with the gzip file.
+    """
+
+    def __init__(self, file_dir: str, mode: str):
+        """Open the gzip file `file_dir` in the binary `mode`."""
+        self._raw_file = open(file_dir, mode)
+
+        try:
+            super().__init__(filename='', mode=mode, fileobj=self._raw_file,
+                             mtime=0)
+        except BaseException:
+            self._raw_file.close()
+            raise
+
+    def close(self):
+        """Close the gzip file and the underlying file."""
+        try:
+            super().close()
+        finally:
+            self._raw_file.close()
+
+
+def _open_file(file_dir: str, mode: str = 'r', newline: str = None):
+    """
+    Open a file, that is compressed, if its extension says so.
+
+    Files ending with one of `COMPRESSION_EXTENSIONS` are (de)compressed
+    transparently, while they are read or written. Compressed files are
+    written without time stamp or file name in the header, such that
+    identical content gives identical files.
+
+    Arguments:
+        file_dir: path to the file.
+        mode: mode of `open`, e.g. 'r', 'w' or 'rb'.
+        newline: newline argument of `open`, for text mode.
+
+    Returns:
+        the file object.
+
+    Raises:
+        ImportError, if a .zst file is opened without zstandard installed.
+    """
+    compression = _get_compression_extension(file_dir)
+
+    if compression is None:
+        return open(file_dir, mode, newline=newline)
+
+    binary_mode = mode.replace('t', '').replace('b', '') + 'b'
+
+    if compression == '.gz':
+        compressed_file = _GzipFile(file_dir, binary_mode)
+    elif compression == '.bz2':
+        compressed_file = bz2.BZ2File(file_dir, binary_mode)
+    elif compression == '.xz':
+        compressed_file = lzma.LZMAFile(file_dir, binary_mode)
+    else:
+        if zstandard is None:
+            raise ImportError(f'Reading or writing {file_dir} requires '
+                              f'zstandard. Install it e.g. via `pip install '
+                              f'yaml2sbml[zstd]`.')
+        compressed_file = zstandard.open(file_dir, binary_mode)
+
+    if 'b' in mode:
+        return compressed_file
+
+    return io.TextIOWrapper(compressed_file, newline=newline)
+
+
+def _get_compression_extension(file_dir: str):
+    """Return the compression extension of a file, e.g. '.gz', or None."""
+    for extension in COMPRESSION_EXTENSIONS:
+        if file_dir.endswith(extension):
+            return extension
+
+    return None
+
+
+def _strip_compression_extension(file_dir: str) -> str:
+    """Remove the extension of a compressed file, e.g. `model.xml.gz`."""
+    extension = _get_compression_extension(file_dir)
+
+    if extension is None:
+        return file_dir
+
+    return file_dir[:-len(extension)]
+
+
+def _get_tmp_file(file_dir: str) -> str:
+    """
+    Get the path of a temporary file, that later replaces `file_dir`.
+
+    The temporary file is in the same directory, such that it can be moved
+    to `file_dir` at once, and has the same extension.
+    """
+    directory, file_name = os.path.split(file_dir)
+
+    return os.path.join(directory, '.tmp_' + file_name)
+
+
+def _has_content(file_dir: str,
+                 content: str,
+                 newline: str = None) -> bool:
+    """
+    Check, whether the file `file_dir` exists and contains `content`.
+
+    Arguments:
+        file_dir: path to the file.
+        content: expected content of the file.
+        newline: newline argument of `open`, as used for writing.
+
+    Returns:
+        True, if the file exists and has the given content.
+    """
+    if not os.path.isfile(file_dir):
+        return False
+
+    with _open_file(file_dir, 'r', newline=newline) as f_in:
+        return f_in.read() == content
+
+
+def _load_yaml(stream):
+    """
+    Load a YAML document with the fastest available safe loader.
+
+    Arguments:
+        stream: string or open file, that contains the YAML document.
+
+    Returns:
+        the content of the YAML document.
+    """
+    return yaml.load(stream, Loader=_YamlLoader)
+
+
+class _NumpyDumper(_YamlDumper):
+    """Safe YAML dumper, that writes numpy scalars as Python types."""
+
+    def represent_data(self, data):
+        """Represent numpy scalars (e.g. from data frames) as Python types."""
+        # numpy is only imported by the callers, that create numpy data.
+        if type(data).__module__ == 'numpy' and \
+                getattr(data, 'ndim', None) == 0:
+            data = data.item()
+
+        return super().represent_data(data)
+
+
+def _dump_yaml(data, **kwargs) -> str:
+    """
+    Dump data to a YAML string with the fastest available safe dumper.
+
+    Numpy scalars are written as the corresponding Python types.
+
+    Arguments:
+        data: data, that is dumped.
+        kwargs: further arguments of `yaml.dump`, e.g. `sort_keys`.
+
+    Returns:
+        the YAML document as string.
+    """
+    return yaml.dump(data, Dumper=_NumpyDumper, **kwargs)
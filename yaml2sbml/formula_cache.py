@@ -0,0 +1,122 @@
+"""Cache for the parsing of formulas by libsbml."""
+from collections import OrderedDict
+
+from .lazy_import import _lazy_import
+from .sbml_writer import _format_math
+
+sbml = _lazy_import('libsbml')
+
+# default number of distinct formulas, that are kept in the cache.
+DEFAULT_MAX_SIZE = 10000
+
+
+class FormulaCache:
+    """
+    Least recently used cache of parsed formulas.
+
+    Generated models often repeat the same formula strings. Each distinct
+    formula is parsed only once with `libsbml.parseL3Formula`, further
+    requests get a clone of the abstract syntax tree. The MathML, that the
+    direct SBML writer needs, is cached as well. Hits and misses are counted.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize the cache.
+
+        Arguments:
+            max_size: maximal number of formulas in the cache.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # formula -> [abstract syntax tree, MathML or None]
+        self._entries = OrderedDict()
+
+    def parse(self, formula: str, clone: bool = True):
+        """
+        Parse a formula.
+
+        Arguments:
+            formula: formula in the infix notation of libsbml.
+            clone: indicates, if a clone of the cached abstract syntax tree
+                should be returned. Only set to False, if the tree is not
+                modified, e.g. because it is copied by `setMath` anyways.
+
+        Returns:
+            the abstract syntax tree of the formula, None if the formula can
+            not be parsed.
+        """
+        math_ast = self._get_entry(formula)[0]
+
+        if math_ast is None or not clone:
+            return math_ast
+
+        return math_ast.deepCopy()
+
+    def get_mathml(self, formula: str):
+        """
+        Convert a formula to MathML, as written by libsbml for an element.
+
+        Arguments:
+            formula: formula in the infix notation of libsbml.
+
+        Returns:
+            the MathML, None if the formula can not be parsed.
+        """
+        entry = self._get_entry(formula)
+
+        if entry[0] is not None and entry[1] is None:
+            entry[1] = _format_math(entry[0])
+
+        return entry[1]
+
+    def info(self) -> dict:
+        """
+        Summarize the state of the cache.
+
+        Returns:
+            dict with the number of hits, misses, cached formulas and the
+            maximal size.
+        """
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_size': self.max_size}
+
+    def clear(self):
+        """Delete all formulas and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_entry(self, formula: str) -> list:
+        """
+        Look up a formula and parse it, if it is not cached.
+
+        Arguments:
+            formula: formula in the infix notation of libsbml.
+
+        Returns:
+            entry: list of the abstract syntax tree and the MathML.
+        """
+        entry = self._entries.get(formula)
+
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(formula)
+            return entry
+
+        self.misses += 1
+        entry = [sbml.parseL3Formula(formula), None]
+
+        if self.max_size > 0:
+            self._entries[formula] = entry
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return entry
+
+
+# cache, that is used by all conversions of this process.
+FORMULA_CACHE = FormulaCache()
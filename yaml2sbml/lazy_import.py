@@ -0,0 +1,55 @@
+"""Deferred import of heavy dependencies."""
+import importlib
+import sys
+
+
+class _LazyModule:
+    """
+    Stand-in for a module, that is imported at the first attribute access.
+
+    Unlike `importlib.util.LazyLoader`, the stand-in is not registered in
+    `sys.modules`. Hence, code that inspects all imported modules (as libsbml
+    does, while it is imported) does not trigger the import. Accessed
+    attributes are cached, such that further accesses are as fast as for
+    the module itself.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the stand-in.
+
+        Arguments:
+            name: name of the module, e.g. 'libsbml'.
+        """
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        """Import the module and return its attribute `attr`."""
+        value = getattr(importlib.import_module(self._name), attr)
+        setattr(self, attr, value)
+
+        return value
+
+    def __repr__(self):
+        """Represent the stand-in."""
+        return f'<lazily imported module {self._name!r}>'
+
+
+def _lazy_import(name: str):
+    """
+    Import a module, once one of its attributes is accessed.
+
+    libsbml, pandas and petab take most of the import time of yaml2sbml,
+    while e.g. the validation of YAML files does not need them. Modules,
+    that were already imported, are returned as they are.
+
+    Arguments:
+        name: name of the module, e.g. 'libsbml'.
+
+    Returns:
+        module: the module or a stand-in for it.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    return _LazyModule(name)
@@ -0,0 +1,179 @@
+"""Patch the SBML model of a `YamlModel` after each edit."""
+from .yaml2sbml import _create_parameter, _create_species, \
+    _create_rate_rule, _create_assignment, _create_function, _create_time
+from .lazy_import import _lazy_import
+
+sbml = _lazy_import('libsbml')
+
+# blocks, whose ids are identifiers of SBML elements.
+SBML_BLOCKS = ('odes', 'parameters', 'assignments', 'functions')
+
+# identifiers of SBML elements, that every model has, see
+# `_create_compartment`.
+RESERVED_IDS = ('Compartment',)
+
+
+def _add_sbml_entry(model: 'sbml.Model',
+                    yaml_model: dict,
+                    block_key: str,
+                    entry: dict):
+    """
+    Add the SBML elements of an entry, that was appended to a block.
+
+    The elements are inserted at the positions, that they get in a build of
+    the whole model (see `_convert_yaml_blocks_to_sbml`), such that the
+    patched SBML is identical to a rebuilt one. Observables and conditions
+    are not part of the SBML.
+
+    Identifiers are checked against the blocks of `yaml_model`, which are
+    indexed by id, instead of the SBML model. Moving the new elements to
+    their positions costs the number of elements behind them, e.g. nothing
+    for a parameter, if the model has no assignments.
+
+    Arguments:
+        model: SBML model, that represents `yaml_model` without the entry.
+        yaml_model: blocks of the `YamlModel`, including the new entry.
+        block_key: block of the entry, e.g. 'parameters'.
+        entry: the new entry.
+
+    Raises:
+        RuntimeError, if the entry can not be represented in SBML, e.g. due
+            to an invalid identifier or formula, or if its identifier is
+            already used.
+    """
+    n_time_elements = _get_number_of_time_elements(yaml_model['time'])
+
+    if block_key == 'parameters':
+        _check_unused_id(yaml_model, block_key, entry['parameterId'])
+        _create_parameter(model,
+                          entry['parameterId'],
+                          entry.get('nominalValue'))
+
+        # behind the time and the other parameters, before the assignments
+        _move_last(model.getListOfParameters(),
+                   n_time_elements + len(yaml_model['parameters']) - 1)
+
+    elif block_key == 'odes':
+        _check_unused_id(yaml_model, block_key, entry['stateId'])
+        _create_species(model, entry['stateId'], entry['initialValue'])
+        _create_rate_rule(model, entry['stateId'], entry['rightHandSide'])
+
+        # behind the time and the other ODEs, before the assignments
+        _move_last(model.getListOfRules(),
+                   n_time_elements + len(yaml_model['odes']) - 1)
+
+    elif block_key == 'assignments':
+        _check_unused_id(yaml_model, block_key, entry['assignmentId'])
+        _create_assignment(model, entry['assignmentId'], entry['formula'])
+
+    elif block_key == 'functions':
+        _check_unused_id(yaml_model, block_key, entry['functionId'])
+        _create_function(model,
+                         entry['functionId'],
+                         entry['arguments'],
+                         entry['formula'])
+
+
+def _delete_sbml_entry(model: 'sbml.Model',
+                       block_key: str,
+                       entry_id: str):
+    """
+    Remove the SBML elements of an entry, see `_add_sbml_entry`.
+
+    Arguments:
+        model: SBML model.
+        block_key: block of the entry, e.g. 'parameters'.
+        entry_id: identifier of the entry.
+    """
+    if block_key == 'parameters':
+        model.removeParameter(entry_id)
+
+    elif block_key == 'odes':
+        model.removeSpecies(entry_id)
+        model.removeRuleByVariable(entry_id)
+        model.removeInitialAssignment(entry_id)
+
+    elif block_key == 'assignments':
+        model.removeParameter(entry_id)
+        model.removeRuleByVariable(entry_id)
+
+    elif block_key == 'functions':
+        model.removeFunctionDefinition(entry_id)
+
+
+def _set_sbml_time(model: 'sbml.Model',
+                   yaml_model: dict,
+                   old_time_variable: str,
+                   new_time_variable: str):
+    """
+    Replace the time variable of an SBML model, see `_create_time`.
+
+    Arguments:
+        model: SBML model.
+        yaml_model: blocks of the `YamlModel`.
+        old_time_variable: the previous time variable, or None.
+        new_time_variable: the new time variable, or None.
+
+    Raises:
+        RuntimeError, if the new time variable is no valid identifier or
+            already used.
+    """
+    if _get_number_of_time_elements({'variable': old_time_variable}):
+        model.removeParameter(old_time_variable)
+        model.removeRuleByVariable(old_time_variable)
+
+    if _get_number_of_time_elements({'variable': new_time_variable}):
+        _check_unused_id(yaml_model, 'time', new_time_variable)
+        _create_time(model, new_time_variable)
+
+        # the time comes first
+        _move_last(model.getListOfParameters(), 0)
+        _move_last(model.getListOfRules(), 0)
+
+
+def _get_number_of_time_elements(time_block: dict) -> int:
+    """Return the number of parameters (and rules) for the time block."""
+    if time_block.get('variable') in (None, 'time'):
+        return 0
+
+    return 1
+
+
+def _check_unused_id(yaml_model: dict, block_key: str, sbml_id: str):
+    """
+    Raise a RuntimeError, if an identifier is used in the model.
+
+    Only the other blocks are searched, since the ids within a block are
+    unique and `yaml_model` may already contain the new entry.
+
+    Arguments:
+        yaml_model: blocks of the `YamlModel`.
+        block_key: block of the identifier, e.g. 'parameters' or 'time'.
+        sbml_id: the identifier.
+
+    Raises:
+        RuntimeError, if the identifier is used in another block.
+    """
+    used_ids = [sbml_id in yaml_model[key]
+                for key in SBML_BLOCKS if key != block_key]
+
+    if block_key != 'time' \
+            and _get_number_of_time_elements(yaml_model['time']):
+        used_ids.append(sbml_id == yaml_model['time']['variable'])
+
+    if sbml_id in RESERVED_IDS or any(used_ids):
+        raise RuntimeError(f'The identifier {sbml_id} is used multiple '
+                           f'times.')
+
+
+def _move_last(list_of: 'sbml.ListOf', index: int):
+    """
+    Move the last element of an SBML list to `index`.
+
+    Costs the number of elements behind `index`, nothing if the element is
+    already at `index`.
+    """
+    last_index = list_of.size() - 1
+
+    if index != last_index:
+        list_of.insert(index, list_of.remove(last_index))
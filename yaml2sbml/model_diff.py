@@ -0,0 +1,172 @@
+"""Fingerprints of the entities of a model and structural diffs of models."""
+import argparse
+import hashlib
+import json
+import sys
+from typing import Union
+
+from .YamlModel import YamlModel, _ID_KEYS, _index_block
+from .yaml2sbml import _load_yaml_file
+
+# blocks, that are compared, in the order of the YAML format. The time block
+# is compared as the single entity 'variable'.
+BLOCKS = ('time', 'odes', 'parameters', 'assignments', 'functions',
+          'observables', 'conditions')
+
+# canonical JSON of the entities, created once, since `json.dumps` creates a
+# new encoder for each call with options.
+_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
+
+def get_fingerprints(model: Union[str, dict, YamlModel]) -> dict:
+    """
+    Compute a fingerprint for each entity of a model.
+
+    The fingerprint of an entity is the SHA-256 hash of its definition, with
+    sorted keys. It does not depend on the position of the entity, the
+    formatting of the YAML file or the process, and can be stored to detect
+    changes later on.
+
+    Arguments:
+        model: path to a YAML model, a YAML model as dict or a `YamlModel`.
+
+    Returns:
+        fingerprints: dict from the blocks (see `BLOCKS`) to dicts from the
+            ids of the entities to their fingerprints (hex strings). Blocks
+            without entities are empty.
+    """
+    return {block_key: {entity_id: _get_fingerprint(entity)
+                        for (entity_id, entity) in block.items()}
+            for (block_key, block) in _get_indexed_blocks(model).items()}
+
+
+def diff_models(old_model: Union[str, dict, YamlModel],
+                new_model: Union[str, dict, YamlModel]) -> dict:
+    """
+    Compare two models entity by entity.
+
+    The comparison takes linear time in the number of entities. The order
+    of the entities is not compared.
+
+    Arguments:
+        old_model: path to a YAML model, a YAML model as dict, a `YamlModel`
+            or fingerprints, as returned by `get_fingerprints`.
+        new_model: the same for the new model.
+
+    Returns:
+        diff: dict from the blocks (see `BLOCKS`) to dicts with the lists of
+            the 'added', 'removed' and 'changed' entity ids, in the order of
+            the models.
+    """
+    old_fingerprints = _get_fingerprints_of(old_model)
+    new_fingerprints = _get_fingerprints_of(new_model)
+    diff = {}
+
+    for block_key in BLOCKS:
+        old_block = old_fingerprints[block_key]
+        new_block = new_fingerprints[block_key]
+
+        diff[block_key] = {
+            'added': [entity_id for entity_id in new_block
+                      if entity_id not in old_block],
+            'removed': [entity_id for entity_id in old_block
+                        if entity_id not in new_block],
+            'changed': [entity_id for (entity_id, fingerprint)
+                        in new_block.items()
+                        if _is_changed(old_block, entity_id, fingerprint)]}
+
+    return diff
+
+
+def is_unchanged(diff: dict) -> bool:
+    """Check, whether a diff (see `diff_models`) contains no changes."""
+    return not any(entity_ids for block_diff in diff.values()
+                   for entity_ids in block_diff.values())
+
+
+def _is_changed(old_block: dict, entity_id: str, fingerprint: str) -> bool:
+    """Check, whether an entity exists in `old_block` and changed."""
+    return entity_id in old_block and old_block[entity_id] != fingerprint
+
+
+def _get_fingerprints_of(model) -> dict:
+    """Return the fingerprints of a model, or the given fingerprints."""
+    if isinstance(model, dict) and set(model) == set(BLOCKS) and \
+            all(isinstance(block, dict) for block in model.values()):
+        return model
+
+    return get_fingerprints(model)
+
+
+def _get_indexed_blocks(model: Union[str, dict, YamlModel]) -> dict:
+    """
+    Return the entities of a model by block and id.
+
+    Arguments:
+        model: path to a YAML model, a YAML model as dict or a `YamlModel`.
+
+    Returns:
+        dict from all `BLOCKS` to dicts from ids to entities.
+
+    Raises:
+        ValueError, if an id occurs multiple times in a block.
+    """
+    if isinstance(model, YamlModel):
+        # already indexed by id, see `YamlModel.__init__`
+        yaml_model = model._yaml_model
+        indexed_blocks = {block_key: yaml_model[block_key]
+                          for block_key in _ID_KEYS}
+        time_block = yaml_model['time']
+
+    else:
+        if isinstance(model, str):
+            model = _load_yaml_file(model)
+
+        indexed_blocks = {block_key: _index_block(model.get(block_key) or [],
+                                                  block_key)
+                          for block_key in _ID_KEYS}
+        time_block = model.get('time') or {}
+
+    indexed_blocks['time'] = {key: time_block[key] for key in time_block}
+
+    return {block_key: indexed_blocks[block_key] for block_key in BLOCKS}
+
+
+def _get_fingerprint(entity) -> str:
+    """Hash the definition of an entity, independent of the key order."""
+    return hashlib.sha256(_ENCODER.encode(entity).encode()).hexdigest()
+
+
+def main():
+    """Command-Line Interface."""
+    parser = argparse.ArgumentParser(
+        description='Compares two YAML models entity by entity. Exits with 1, '
+                    'if they differ.')
+    parser.add_argument('old_yaml_file', type=str,
+                        help='Path to the old YAML model.')
+    parser.add_argument('new_yaml_file', type=str,
+                        help='Path to the new YAML model.')
+    parser.add_argument('--json', action='store_true',
+                        help='Optional argument, flag, which indicates, if '
+                             'the diff should be printed as JSON.')
+
+    args = parser.parse_args()
+
+    diff = diff_models(args.old_yaml_file, args.new_yaml_file)
+
+    if args.json:
+        print(json.dumps(diff, indent=2))
+    else:
+        for (block_key, block_diff) in diff.items():
+            for (change, symbol) in [('removed', '-'),
+                                     ('added', '+'),
+                                     ('changed', '~')]:
+                for entity_id in block_diff[change]:
+                    print(f'{symbol} {block_key}: {entity_id}')
+
+    if not is_unchanged(diff):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
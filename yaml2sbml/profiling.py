@@ -0,0 +1,201 @@
+"""Wall time and memory of the stages of a conversion."""
+import argparse
+import contextlib
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # e.g. on Windows
+    resource = None
+
+# profiles, that record the stages at the moment, see `Profile.__enter__`.
+_ACTIVE_PROFILES = []
+
+
+class Profile:
+    """
+    Record the wall time and peak memory of the stages of conversions.
+
+    The stages are e.g. loading the YAML, validating it against the schema,
+    building the SBML, checking its consistency and writing it, as well as
+    creating, writing and linting the PEtab tables. Stages are recorded for
+    all conversions and validations inside of the `with` block::
+
+        profile = Profile()
+        with profile:
+            yaml2sbml(yaml_dir, sbml_dir)
+        print(profile.summary())
+
+    The memory is the peak resident set size of the process (which includes
+    libsbml), at the end of each stage. Since it can only grow, the increase
+    during a stage shows, which stage is responsible for the peak. It is not
+    available on Windows.
+
+    In streaming mode, loading and validating the YAML happens, while the
+    SBML is built, and is part of the stage 'build SBML'.
+    """
+
+    def __init__(self, callback=None):
+        """
+        Initialize an empty profile.
+
+        Arguments:
+            callback: optional function, that is called with the record (see
+                `records`) of each stage, once the stage is finished.
+        """
+        self.callback = callback
+        # one dict per finished stage with the keys 'stage', 'time' (in
+        # seconds), 'peak_rss' and 'rss_increase' (in bytes, or None).
+        self.records = []
+
+    def __enter__(self):
+        """Start recording stages."""
+        _ACTIVE_PROFILES.append(self)
+        return self
+
+    def __exit__(self, *args):
+        """Stop recording stages."""
+        _ACTIVE_PROFILES.remove(self)
+
+    def stats(self) -> dict:
+        """
+        Aggregate the records per stage.
+
+        Returns:
+            dict from the stage names (in the order of their first
+            occurrence) to dicts with the number of 'calls', the summed
+            'time', the maximal 'peak_rss' and the summed 'rss_increase'.
+        """
+        stats = {}
+
+        for record in self.records:
+            stage_stats = stats.setdefault(record['stage'],
+                                           {'calls': 0,
+                                            'time': 0.0,
+                                            'peak_rss': None,
+                                            'rss_increase': None})
+            stage_stats['calls'] += 1
+            stage_stats['time'] += record['time']
+
+            if record['peak_rss'] is not None:
+                stage_stats['peak_rss'] = max(stage_stats['peak_rss'] or 0,
+                                              record['peak_rss'])
+                stage_stats['rss_increase'] = \
+                    (stage_stats['rss_increase'] or 0) \
+                    + record['rss_increase']
+
+        return stats
+
+    def summary(self) -> str:
+        """
+        Format the stages as table.
+
+        Returns:
+            summary: one line per stage with the number of calls, the wall
+                time and the peak memory.
+        """
+        return _format_stats(self.stats())
+
+    def _add_record(self, record: dict):
+        """Add the record of a finished stage."""
+        self.records.append(record)
+
+        if self.callback is not None:
+            self.callback(record)
+
+
+def _format_stats(stats: dict) -> str:
+    """Format the aggregated stages, see `Profile.stats`, as table."""
+    lines = [f'{"Stage":<24} {"Calls":>5} {"Time [s]":>9} '
+             f'{"Peak RSS [MB]":>14} {"Increase [MB]":>14}']
+
+    for (stage, stage_stats) in stats.items():
+        line = f'{stage:<24} {stage_stats["calls"]:>5} ' \
+               f'{stage_stats["time"]:>9.3f}'
+
+        if stage_stats['peak_rss'] is not None:
+            line += f' {stage_stats["peak_rss"] / 2**20:>14.1f}' \
+                    f' {stage_stats["rss_increase"] / 2**20:>+14.1f}'
+
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def _stage(name: str):
+    """
+    Record a stage in the active profiles, see `Profile`.
+
+    Does nothing, if no profile is active.
+
+    Arguments:
+        name: name of the stage, e.g. 'load YAML'.
+    """
+    if not _ACTIVE_PROFILES:
+        yield
+        return
+
+    start_rss = _get_peak_rss()
+    start_time = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        stage_time = time.perf_counter() - start_time
+        peak_rss = _get_peak_rss()
+
+        record = {'stage': name,
+                  'time': stage_time,
+                  'peak_rss': peak_rss,
+                  'rss_increase': None if peak_rss is None
+                  else peak_rss - start_rss}
+
+        for profile in list(_ACTIVE_PROFILES):
+            profile._add_record(dict(record))
+
+
+def _add_profile_argument(parser: argparse.ArgumentParser):
+    """Add the argument, that prints a profile of the stages, to a CLI."""
+    parser.add_argument('--profile', action='store_true',
+                        help='Optional argument, flag, which indicates, if '
+                             'the wall time and peak memory of each stage '
+                             '(e.g. loading, validation, SBML construction) '
+                             'should be printed.')
+
+
+@contextlib.contextmanager
+def _print_profile(enabled: bool):
+    """
+    Record the stages inside the `with` block and print their summary.
+
+    Arguments:
+        enabled: indicates, whether the profile should be recorded, e.g. the
+            `--profile` argument of a CLI.
+    """
+    if not enabled:
+        yield
+        return
+
+    profile = Profile()
+
+    try:
+        with profile:
+            yield
+    finally:
+        print(profile.summary())
+
+
+def _get_peak_rss():
+    """Return the peak resident set size of the process in bytes, or None."""
+    if resource is None:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # kilobytes on Linux, bytes on macOS
+    if sys.platform == 'darwin':
+        return peak_rss
+
+    return peak_rss * 1024
@@ -0,0 +1,90 @@
+"""Removal of entities, that the model does not use."""
+import logging
+from typing import Union
+
+from .dependency_graph import DependencyGraph
+from .YamlModel import YamlModel, _ID_KEYS
+
+logger = logging.getLogger(__name__)
+
+# blocks, whose entities are always kept, with everything they refer to.
+ROOT_BLOCKS = ('time', 'odes', 'observables', 'conditions')
+
+# blocks, whose entities are removed, if no root refers to them.
+PRUNED_BLOCKS = ('parameters', 'assignments', 'functions')
+
+
+def get_unused_entities(model: Union[str, dict, YamlModel,
+                                     DependencyGraph]) -> dict:
+    """
+    Find the parameters, assignments and functions, that a model does not use.
+
+    An entity is used, if an ODE (right-hand side or initial value), an
+    observable (observable or noise formula) or a condition refers to it,
+    directly or via other entities.
+
+    Arguments:
+        model: path to a YAML model, a YAML model as dict, a `YamlModel` or
+            its `DependencyGraph`.
+
+    Returns:
+        unused_entities: dict from the blocks (see `PRUNED_BLOCKS`) to the
+            lists of the ids of the unused entities, in the order of the
+            model.
+    """
+    if isinstance(model, YamlModel):
+        graph = model.get_dependency_graph()
+    elif isinstance(model, DependencyGraph):
+        graph = model
+    else:
+        graph = DependencyGraph.from_model(model)
+
+    roots = [node for node in graph if node[0] in ROOT_BLOCKS]
+    used_nodes = set(graph.get_all_dependencies(roots))
+
+    unused_entities = {block_key: [] for block_key in PRUNED_BLOCKS}
+    for node in graph:
+        if node[0] in unused_entities and node not in used_nodes:
+            unused_entities[node[0]].append(node[1])
+
+    return unused_entities
+
+
+def prune_yaml_dict(yaml_dict: dict) -> dict:
+    """
+    Remove the unused entities from a YAML model, see `get_unused_entities`.
+
+    The removed entities are logged.
+
+    Arguments:
+        yaml_dict: a valid YAML model as dict. It is not modified.
+
+    Returns:
+        pruned_yaml_dict: the YAML model without the unused entities.
+    """
+    unused_entities = get_unused_entities(yaml_dict)
+    _log_pruned_entities(unused_entities)
+
+    pruned_yaml_dict = dict(yaml_dict)
+    for (block_key, entity_ids) in unused_entities.items():
+        if entity_ids:
+            entity_ids = set(entity_ids)
+            id_key = _ID_KEYS[block_key]
+            pruned_yaml_dict[block_key] = [
+                entry for entry in yaml_dict[block_key]
+                if entry[id_key] not in entity_ids]
+
+    return pruned_yaml_dict
+
+
+def _log_pruned_entities(pruned_entities: dict):
+    """Log the removed entities, see `get_unused_entities`."""
+    n_pruned = sum(len(entity_ids) for entity_ids in pruned_entities.values())
+    details = '; '.join(f'{block_key}: {", ".join(entity_ids)}'
+                        for (block_key, entity_ids) in pruned_entities.items()
+                        if entity_ids)
+
+    if details:
+        details = f' ({details})'
+
+    logger.info(f'Pruned {n_pruned} unused entities{details}.')
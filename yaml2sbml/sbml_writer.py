@@ -0,0 +1,311 @@
+"""Write SBML L3V1 XML directly, without the object model of libsbml."""
+import math
+import shutil
+import tempfile
+from xml.sax.saxutils import escape
+
+from .lazy_import import _lazy_import
+
+sbml = _lazy_import('libsbml')
+
+# attributes of each SBML element, in the order libsbml writes them.
+ATTRIBUTES = {
+    'functionDefinition': ('id', 'name'),
+    'compartment': ('id', 'name', 'size', 'constant'),
+    'species': ('id', 'name', 'compartment', 'initialAmount',
+                'hasOnlySubstanceUnits', 'boundaryCondition', 'constant'),
+    'parameter': ('id', 'name', 'value', 'constant'),
+    'initialAssignment': ('symbol',),
+    'assignmentRule': ('variable',),
+    'rateRule': ('variable',),
+}
+
+# lists of the SBML model in the order of the specification.
+LISTS = ('listOfFunctionDefinitions', 'listOfCompartments', 'listOfSpecies',
+         'listOfParameters', 'listOfInitialAssignments', 'listOfRules')
+
+LIST_OF_ELEMENT = {
+    'functionDefinition': 'listOfFunctionDefinitions',
+    'compartment': 'listOfCompartments',
+    'species': 'listOfSpecies',
+    'parameter': 'listOfParameters',
+    'initialAssignment': 'listOfInitialAssignments',
+    'assignmentRule': 'listOfRules',
+    'rateRule': 'listOfRules',
+}
+
+SBML_NAMESPACE = 'http://www.sbml.org/sbml/level3/version1/core'
+
+
+class _XMLModel:
+    """
+    Stand-in for `libsbml.Model`, that writes the model as XML.
+
+    Supports the subset of the libsbml API, that is used to convert YAML
+    models. Each element is serialized, as soon as the next element of the
+    same list is created, and is buffered in a temporary file per list.
+    Hence, the memory does not grow with the size of the model. The result
+    is identical to the output of `libsbml.writeSBMLToString`.
+    """
+
+    def __init__(self):
+        """Initialize an empty model."""
+        self._attributes = {}
+        self._list_files = {}
+        self._pending = {}
+
+    def setId(self, sid: str) -> int:
+        """Set the id of the model."""
+        return _set_id(self._attributes, sid)
+
+    def setName(self, name: str) -> int:
+        """Set the name of the model."""
+        self._attributes['name'] = name
+        return sbml.LIBSBML_OPERATION_SUCCESS
+
+    def createFunctionDefinition(self):
+        """Create and add a function definition."""
+        return self._create_element('functionDefinition')
+
+    def createCompartment(self):
+        """Create and add a compartment."""
+        return self._create_element('compartment')
+
+    def createSpecies(self):
+        """Create and add a species."""
+        return self._create_element('species')
+
+    def createParameter(self):
+        """Create and add a parameter."""
+        return self._create_element('parameter')
+
+    def createInitialAssignment(self):
+        """Create and add an initial assignment."""
+        return self._create_element('initialAssignment')
+
+    def createAssignmentRule(self):
+        """Create and add an assignment rule."""
+        return self._create_element('assignmentRule')
+
+    def createRateRule(self):
+        """Create and add a rate rule."""
+        return self._create_element('rateRule')
+
+    def _create_element(self, tag: str):
+        """
+        Create an element and serialize the previous one of the same list.
+
+        Arguments:
+            tag: XML tag of the element.
+
+        Returns:
+            element: the new element.
+        """
+        list_of = LIST_OF_ELEMENT[tag]
+        self._flush(list_of)
+
+        element = _XMLElement(tag)
+        self._pending[list_of] = element
+
+        return element
+
+    def _flush(self, list_of: str):
+        """Serialize the pending element of a list to its temporary file."""
+        element = self._pending.pop(list_of, None)
+
+        if element is None:
+            return
+
+        if list_of not in self._list_files:
+            self._list_files[list_of] = tempfile.TemporaryFile('w+')
+
+        self._list_files[list_of].write(element.to_xml())
+
+    def write(self, f_out):
+        """
+        Write the SBML document to an open text file.
+
+        Arguments:
+            f_out: file object, that the SBML is written to.
+        """
+        for list_of in LISTS:
+            self._flush(list_of)
+
+        f_out.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    f'<sbml xmlns="{SBML_NAMESPACE}" level="3" version="1">\n'
+                    f'  <model{_format_attributes(self._attributes)}')
+
+        if not self._list_files:
+            f_out.write('/>\n</sbml>\n')
+            return
+
+        f_out.write('>\n')
+
+        for list_of in LISTS:
+            if list_of not in self._list_files:
+                continue
+
+            list_file = self._list_files[list_of]
+            list_file.seek(0)
+
+            f_out.write(f'    <{list_of}>\n')
+            shutil.copyfileobj(list_file, f_out)
+            f_out.write(f'    </{list_of}>\n')
+
+        f_out.write('  </model>\n</sbml>\n')
+
+    def close(self):
+        """Delete the temporary files."""
+        for list_file in self._list_files.values():
+            list_file.close()
+
+        self._list_files = {}
+        self._pending = {}
+
+
+class _XMLElement:
+    """Stand-in for a libsbml element (e.g. `libsbml.Parameter`)."""
+
+    def __init__(self, tag: str):
+        """
+        Initialize the element.
+
+        Arguments:
+            tag: XML tag of the element, e.g. 'parameter'.
+        """
+        self.tag = tag
+        self._attributes = {}
+        self._math = None
+
+    def setId(self, sid: str) -> int:
+        """Set the id, see `libsbml.SBase.setId`."""
+        if 'id' not in ATTRIBUTES[self.tag]:
+            return sbml.LIBSBML_UNEXPECTED_ATTRIBUTE
+
+        return _set_id(self._attributes, sid)
+
+    def setName(self, name: str) -> int:
+        """Set the name of the element."""
+        return self._set_attribute('name', name)
+
+    def setCompartment(self, compartment: str) -> int:
+        """Set the compartment of a species."""
+        return self._set_attribute('compartment', compartment)
+
+    def setVariable(self, variable: str) -> int:
+        """Set the variable of a rule."""
+        return self._set_attribute('variable', variable)
+
+    def setSymbol(self, symbol: str) -> int:
+        """Set the symbol of an initial assignment."""
+        return self._set_attribute('symbol', symbol)
+
+    def setSize(self, size: float) -> int:
+        """Set the size of a compartment."""
+        return self._set_attribute('size', _format_double(size))
+
+    def setValue(self, value: float) -> int:
+        """Set the value of a parameter."""
+        return self._set_attribute('value', _format_double(value))
+
+    def setInitialAmount(self, initial_amount: float) -> int:
+        """Set the initial amount of a species."""
+        return self._set_attribute('initialAmount',
+                                   _format_double(initial_amount))
+
+    def setConstant(self, constant: bool) -> int:
+        """Set the constant attribute."""
+        return self._set_attribute('constant', _format_boolean(constant))
+
+    def setBoundaryCondition(self, boundary_condition: bool) -> int:
+        """Set the boundary condition of a species."""
+        return self._set_attribute('boundaryCondition',
+                                   _format_boolean(boundary_condition))
+
+    def setHasOnlySubstanceUnits(self, has_only_substance_units: bool) -> int:
+        """Set, whether a species has only substance units."""
+        return self._set_attribute('hasOnlySubstanceUnits',
+                                   _format_boolean(has_only_substance_units))
+
+    def setMath(self, math_ast: 'sbml.ASTNode') -> int:
+        """Set the math of the element from an abstract syntax tree."""
+        if math_ast is None:
+            self._math = None
+        else:
+            self._math = _format_math(math_ast)
+
+        return sbml.LIBSBML_OPERATION_SUCCESS
+
+    def setMathML(self, mathml: str) -> int:
+        """Set the math of the element as MathML, see `_format_math`."""
+        self._math = mathml
+
+        return sbml.LIBSBML_OPERATION_SUCCESS
+
+    def _set_attribute(self, name: str, value: str) -> int:
+        """Set an attribute, if the element has it."""
+        if name not in ATTRIBUTES[self.tag]:
+            return sbml.LIBSBML_UNEXPECTED_ATTRIBUTE
+
+        self._attributes[name] = value
+
+        return sbml.LIBSBML_OPERATION_SUCCESS
+
+    def to_xml(self) -> str:
+        """Serialize the element, as an entry of a list of the model."""
+        attributes = {name: self._attributes[name]
+                      for name in ATTRIBUTES[self.tag]
+                      if name in self._attributes}
+        start_tag = f'      <{self.tag}{_format_attributes(attributes)}'
+
+        if self._math is None:
+            return start_tag + '/>\n'
+
+        return f'{start_tag}>\n{self._math}      </{self.tag}>\n'
+
+
+def _set_id(attributes: dict, sid: str) -> int:
+    """Set the id in `attributes`, if it is a valid SBML identifier."""
+    if not sbml.SyntaxChecker.isValidSBMLSId(sid):
+        return sbml.LIBSBML_INVALID_ATTRIBUTE_VALUE
+
+    attributes['id'] = sid
+
+    return sbml.LIBSBML_OPERATION_SUCCESS
+
+
+# entities of the XML attribute values, besides &, < and >, as in libsbml.
+_ATTRIBUTE_ENTITIES = {'"': '&quot;', "'": '&apos;'}
+
+
+def _format_attributes(attributes: dict) -> str:
+    """Format XML attributes, escaped as libsbml does (e.g. model names)."""
+    return ''.join(f' {name}="{escape(str(value), _ATTRIBUTE_ENTITIES)}"'
+                   for (name, value) in attributes.items())
+
+
+def _format_double(value: float) -> str:
+    """Format a number as libsbml does."""
+    value = float(value)
+
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return 'INF' if value > 0 else '-INF'
+
+    return f'{value:.15g}'
+
+
+def _format_boolean(value: bool) -> str:
+    """Format a boolean as XML."""
+    return 'true' if value else 'false'
+
+
+def _format_math(math_ast: 'sbml.ASTNode') -> str:
+    """Convert an abstract syntax tree to MathML, indented for an element."""
+    mathml = sbml.writeMathMLToString(math_ast)
+
+    # remove the XML declaration
+    lines = mathml.split('\n')[1:]
+
+    return ''.join(f'        {line}\n' for line in lines)
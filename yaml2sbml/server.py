@@ -0,0 +1,625 @@
+"""
+Long-running conversion server and its client.
+
+The server keeps libsbml, pandas and petab imported, the schema compiled
+and the formula cache warm, such that validations and conversions only cost
+the work on the model itself. Requests and responses are JSON objects, one
+per line, over a Unix socket (by default, see `DEFAULT_SOCKET_PATH`) or a
+TCP connection to localhost. A request is e.g.::
+
+    {"command": "sbml",
+     "arguments": {"yaml_file": "/abs/model.yaml",
+                   "sbml_file": "/abs/model.xml"}}
+
+and the response::
+
+    {"success": true, "error": null, "time": 0.012, "warnings": [],
+     "written_files": ["/abs/model.xml"]}
+
+Commands (arguments as in the corresponding Python functions):
+    ping: check, that the server runs, returns the 'version'.
+    validate: `yaml_file`.
+    sbml: `yaml_file`, `sbml_file` and the options of `yaml2sbml`.
+    petab: `yaml_file`, `output_dir`, `sbml_name` and the options of
+        `yaml2petab`.
+    shutdown: stop the server.
+
+With `"profile": true` in a request, the response contains the stages of
+the conversion, see `Profile.stats`. Paths should be absolute, since the
+server may run in a different working directory. Requests are processed
+one at a time.
+
+Access: the Unix socket is only accessible by the user, that started the
+server. Since every local user can connect to a TCP port, a TCP server
+requires a shared token, that each request has to contain as `"token"`.
+The server only reads and writes files below its root directory.
+"""
+import argparse
+import hmac
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+from .conversion_cache import ConversionCache
+from .profiling import Profile, _format_stats
+from .version import __version__
+from .yaml2sbml import yaml2sbml, _load_yaml_file, _add_cache_arguments, \
+    _get_cache_from_args, CHECK_LEVELS, WRITERS
+from .yaml2PEtab import yaml2petab
+from .yaml_validation import _validate_yaml_from_dict, _get_schema_validator
+
+COMMANDS = ('ping', 'validate', 'sbml', 'petab', 'shutdown')
+
+# arguments of requests, that are paths and made absolute by the client.
+PATH_ARGUMENTS = ('yaml_file', 'sbml_file', 'output_dir')
+
+# arguments of requests, that are file names relative to the output_dir.
+FILE_NAME_ARGUMENTS = ('sbml_name', 'petab_yaml_name',
+                       'measurement_table_name')
+
+HOST = '127.0.0.1'
+
+# environment variable, that the CLIs read the token from.
+TOKEN_VARIABLE = 'YAML2SBML_SERVER_TOKEN'
+
+# Unix socket, that the server listens on and the client connects to, if
+# neither a socket nor a port is given.
+DEFAULT_SOCKET_PATH = os.path.join(
+    tempfile.gettempdir(),
+    f'yaml2sbml-{os.getuid() if hasattr(os, "getuid") else "server"}.sock')
+
+
+def serve(socket_path: str = None,
+          port: int = None,
+          cache: ConversionCache = None,
+          token: str = None,
+          root_dir: str = None):
+    """
+    Run the conversion server, until it receives the command 'shutdown'.
+
+    Arguments:
+        socket_path: path of the Unix socket, that the server listens on,
+            `DEFAULT_SOCKET_PATH` if neither `socket_path` nor `port` is
+            given. The socket is only accessible by the current user.
+        port: alternatively, TCP port on localhost, that the server listens
+            on. Requires a `token`.
+        cache: conversion cache, see `yaml2sbml`.
+        token: shared secret, that each request has to contain. Optional
+            for a Unix socket.
+        root_dir: directory, below which the server reads and writes
+            files. Relative paths of requests are relative to it. Defaults
+            to the current working directory.
+
+    Raises:
+        ValueError, if both `socket_path` and `port` are given, or `port`
+            without `token`.
+        RuntimeError, if another server listens on `socket_path`.
+    """
+    _run_server(_create_server(socket_path, port, cache, token, root_dir))
+
+
+def _run_server(server):
+    """Serve, until the server is shut down, and remove its socket."""
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        socket_path = server.server_address
+        if isinstance(socket_path, str) and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def _create_server(socket_path: str = None,
+                   port: int = None,
+                   cache: ConversionCache = None,
+                   token: str = None,
+                   root_dir: str = None):
+    """
+    Create the server and load everything, that conversions need.
+
+    Arguments:
+        see `serve`. The port 0 selects a free port.
+
+    Returns:
+        server: the `socketserver` server, not yet serving.
+    """
+    if socket_path is not None and port is not None:
+        raise ValueError('Specify either socket_path or port.')
+
+    if port is not None and not token:
+        raise ValueError('A TCP server requires a token, since every local '
+                         'user can connect to its port.')
+
+    if port is None and socket_path is None:
+        socket_path = DEFAULT_SOCKET_PATH
+
+    # import the dependencies and compile the schema once.
+    _get_schema_validator()
+    _warm_up()
+
+    if socket_path is not None:
+        if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+            raise RuntimeError('Unix sockets are not supported on this '
+                               'platform, use a port instead.')
+
+        if os.path.exists(socket_path):
+            if _is_listening(socket_path):
+                raise RuntimeError(f'Another server listens on '
+                                   f'{socket_path}.')
+            os.remove(socket_path)
+
+        # the socket is created with the permissions 0600 by `bind`, before
+        # the server listens on it.
+        old_umask = os.umask(0o177)
+        try:
+            server = _UnixServer(socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+    else:
+        server = _TCPServer((HOST, port), _RequestHandler)
+
+    server.cache = cache
+    server.token = token
+    server.root_dir = os.path.realpath(root_dir or os.getcwd())
+    server.lock = threading.Lock()
+
+    return server
+
+
+def _warm_up():
+    """Import libsbml, pandas and petab, that are imported lazily."""
+    from . import yaml2PEtab
+
+    yaml2PEtab.sbml.SBMLDocument
+    yaml2PEtab.pd.DataFrame
+    yaml2PEtab.petab.lint
+
+
+def _is_listening(socket_path: str) -> bool:
+    """Check, whether a server accepts connections on a Unix socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+
+    return True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answer the requests of a connection, one JSON object per line."""
+
+    def handle(self):
+        """Read requests, until the client closes the connection."""
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                request = None
+                authorized = True
+                response = _get_response(error=f'Invalid JSON: {e}')
+            else:
+                authorized = _has_valid_token(request, self.server.token)
+
+            if not authorized:
+                response = _get_response(
+                    error='PermissionError: Invalid token.')
+            elif request is not None:
+                # conversions share caches and libsbml, hence one at a time.
+                with self.server.lock:
+                    response = _handle_request(request, self.server.cache,
+                                               self.server.root_dir)
+
+            self.wfile.write((json.dumps(response) + '\n').encode())
+            self.wfile.flush()
+
+            # connections without the token are closed.
+            if not authorized:
+                return
+
+            if isinstance(request, dict) \
+                    and request.get('command') == 'shutdown':
+                # `shutdown` waits for `serve_forever`, hence another thread.
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        """Server on a Unix socket, with a thread per connection."""
+
+        daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    """Server on a TCP port, with a thread per connection."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _has_valid_token(request, token: str = None) -> bool:
+    """Check the token of a request, if the server requires one."""
+    if token is None:
+        return True
+
+    request_token = request.get('token') if isinstance(request, dict) \
+        else None
+
+    if not isinstance(request_token, str):
+        return False
+
+    return hmac.compare_digest(request_token.encode(), token.encode())
+
+
+def _handle_request(request: dict,
+                    cache: ConversionCache = None,
+                    root_dir: str = None) -> dict:
+    """
+    Execute a request.
+
+    Arguments:
+        request: dict with the 'command', optional 'arguments' and an
+            optional flag 'profile'.
+        cache: conversion cache, see `yaml2sbml`.
+        root_dir: directory, below which the paths of the request have to
+            be, see `_resolve_paths`. None for no restriction.
+
+    Returns:
+        response: dict with the keys 'success', 'error' (message or None),
+            'time' (in seconds), 'warnings' and the results of the command.
+    """
+    start_time = time.perf_counter()
+    profile = Profile()
+
+    try:
+        if not isinstance(request, dict):
+            raise ValueError('The request has to be a JSON object.')
+
+        command = request.get('command')
+        arguments = request.get('arguments', {})
+
+        if command not in COMMANDS:
+            raise ValueError(f'Invalid command {command}. Valid commands '
+                             f'are {COMMANDS}.')
+
+        with warnings.catch_warnings(record=True) as caught_warnings, \
+                profile:
+            warnings.simplefilter('always')
+            if root_dir is not None:
+                arguments = _resolve_paths(arguments, root_dir)
+            results = _run_command(command, arguments, cache)
+
+        results['warnings'] = [str(warning.message)
+                               for warning in caught_warnings]
+
+        if request.get('profile', False):
+            results['profile'] = profile.stats()
+
+    except Exception as e:
+        return _get_response(time.perf_counter() - start_time,
+                             f'{type(e).__name__}: {e}')
+
+    return _get_response(time.perf_counter() - start_time, **results)
+
+
+def _get_response(request_time: float = 0.,
+                  error: str = None,
+                  **results) -> dict:
+    """Create a response with the common keys and the results."""
+    return {'success': error is None,
+            'error': error,
+            'time': request_time,
+            'warnings': [],
+            **results}
+
+
+def _resolve_paths(arguments: dict, root_dir: str) -> dict:
+    """
+    Resolve the paths of a request, that have to be below `root_dir`.
+
+    Relative paths are relative to `root_dir`. Symbolic links are resolved,
+    such that they do not lead outside of `root_dir`.
+
+    Arguments:
+        arguments: arguments of the request.
+        root_dir: the resolved root directory of the server.
+
+    Returns:
+        arguments: copy of `arguments` with the resolved paths.
+
+    Raises:
+        PermissionError, if a path is outside of `root_dir`.
+    """
+    arguments = dict(arguments)
+
+    for name in PATH_ARGUMENTS:
+        if arguments.get(name) is not None:
+            arguments[name] = _resolve_path(arguments[name], root_dir)
+
+    # file names of yaml2petab may contain directories.
+    for name in FILE_NAME_ARGUMENTS:
+        if arguments.get(name) is not None:
+            _resolve_path(os.path.join(arguments.get('output_dir', ''),
+                                       arguments[name]),
+                          root_dir)
+
+    return arguments
+
+
+def _resolve_path(path: str, root_dir: str) -> str:
+    """Resolve a path and check, that it is below `root_dir`."""
+    resolved_path = os.path.realpath(os.path.join(root_dir, str(path)))
+
+    if os.path.commonpath([resolved_path, root_dir]) != root_dir:
+        raise PermissionError(f'{path} is outside of the root directory '
+                              f'{root_dir} of the server.')
+
+    return resolved_path
+
+
+def _run_command(command: str,
+                 arguments: dict,
+                 cache: ConversionCache = None) -> dict:
+    """
+    Run a command of the server.
+
+    Arguments:
+        command: one of `COMMANDS`.
+        arguments: arguments of the command.
+        cache: conversion cache, see `yaml2sbml`.
+
+    Returns:
+        results: dict with the results of the command.
+    """
+    if command == 'ping':
+        return {'version': __version__}
+
+    if command == 'shutdown':
+        return {}
+
+    if command == 'validate':
+        _validate_yaml_from_dict(_load_yaml_file(arguments['yaml_file']))
+        return {}
+
+    arguments = dict(arguments)
+
+    if command == 'sbml':
+        return {'written_files': yaml2sbml(arguments.pop('yaml_file'),
+                                           arguments.pop('sbml_file'),
+                                           cache=cache,
+                                           **arguments)}
+
+    return {'written_files': yaml2petab(arguments.pop('yaml_file'),
+                                        arguments.pop('output_dir'),
+                                        arguments.pop('sbml_name'),
+                                        cache=cache,
+                                        **arguments)}
+
+
+class Client:
+    """
+    Client of the conversion server, see `serve`.
+
+    The connection is kept open for all requests of the client, e.g.::
+
+        with Client() as client:
+            response = client.request('sbml',
+                                      yaml_file='model.yaml',
+                                      sbml_file='model.xml')
+    """
+
+    def __init__(self,
+                 socket_path: str = None,
+                 port: int = None,
+                 timeout: float = None,
+                 token: str = None):
+        """
+        Connect to the server.
+
+        Arguments:
+            socket_path: path of the Unix socket of the server,
+                `DEFAULT_SOCKET_PATH` if neither `socket_path` nor `port` is
+                given.
+            port: alternatively, TCP port of the server on localhost.
+            timeout: timeout for the connection and each request in seconds,
+                None to wait without limit.
+            token: token of the server, see `serve`.
+        """
+        if socket_path is not None and port is not None:
+            raise ValueError('Specify either socket_path or port.')
+
+        if port is None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            self._socket.connect(socket_path or DEFAULT_SOCKET_PATH)
+        else:
+            self._socket = socket.create_connection((HOST, port), timeout)
+
+        self._file = self._socket.makefile('rwb')
+        self._token = token
+
+    def request(self, command: str, profile: bool = False,
+                **arguments) -> dict:
+        """
+        Send a request and wait for the response.
+
+        Arguments:
+            command: one of `COMMANDS`.
+            profile: indicates, whether the response should contain the
+                stages of the conversion.
+            arguments: arguments of the command, e.g. `yaml_file`. Relative
+                paths are made absolute.
+
+        Returns:
+            response: dict as described in `yaml2sbml.server`.
+
+        Raises:
+            ConnectionError, if the server closed the connection.
+        """
+        for name in PATH_ARGUMENTS:
+            if arguments.get(name) is not None:
+                arguments[name] = os.path.abspath(arguments[name])
+
+        request = {'command': command,
+                   'arguments': arguments,
+                   'profile': profile}
+
+        if self._token is not None:
+            request['token'] = self._token
+
+        self._file.write((json.dumps(request) + '\n').encode())
+        self._file.flush()
+
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError('The server closed the connection.')
+
+        return json.loads(line)
+
+    def close(self):
+        """Close the connection."""
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        """Return the client."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the connection."""
+        self.close()
+
+
+def _add_address_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments for the address of the server to a CLI."""
+    address = parser.add_mutually_exclusive_group()
+    address.add_argument('--socket', type=str, default=None,
+                         help=f'Path of the Unix socket of the server. '
+                              f'Default: {DEFAULT_SOCKET_PATH}.')
+    address.add_argument('--port', type=int, default=None,
+                         help=f'TCP port of the server on localhost. '
+                              f'Requires the token in the environment '
+                              f'variable {TOKEN_VARIABLE}.')
+
+
+def main():
+    """Command-Line Interface of the server."""
+    parser = argparse.ArgumentParser(
+        description='Runs a server, that validates and converts YAML '
+                    'models without starting Python for each model. See '
+                    '`yaml2sbml_client`.')
+    _add_address_arguments(parser)
+    parser.add_argument('--root_dir', type=str, default=None,
+                        help='Optional argument, directory, below which the '
+                             'server reads and writes files. Default: the '
+                             'current working directory.')
+    _add_cache_arguments(parser)
+
+    args = parser.parse_args()
+    token = os.environ.get(TOKEN_VARIABLE) or None
+
+    if args.port is not None and token is None:
+        parser.error(f'--port requires the token in the environment '
+                     f'variable {TOKEN_VARIABLE}.')
+
+    print('Starting the server...')
+    server = _create_server(args.socket, args.port,
+                            _get_cache_from_args(args), token, args.root_dir)
+    print(f'Listening on {server.server_address}. Stop via '
+          f'`yaml2sbml_client shutdown` or Ctrl+C.', flush=True)
+
+    try:
+        _run_server(server)
+    except KeyboardInterrupt:
+        pass
+
+
+def client_main():
+    """Command-Line Interface of the client."""
+    parser = argparse.ArgumentParser(
+        description='Sends a request to a running `yaml2sbml_server`.')
+    _add_address_arguments(parser)
+    parser.add_argument('--json', action='store_true',
+                        help='Optional argument, print the response as '
+                             'JSON.')
+    parser.add_argument('--profile', action='store_true',
+                        help='Optional argument, print the wall time and '
+                             'peak memory of each stage.')
+
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    commands.add_parser('ping', help='Check, that the server runs.')
+    commands.add_parser('shutdown', help='Stop the server.')
+
+    validate_parser = commands.add_parser('validate',
+                                          help='Validate a YAML model.')
+    validate_parser.add_argument('yaml_file', type=str)
+
+    sbml_parser = commands.add_parser('sbml', help='Convert to SBML.')
+    sbml_parser.add_argument('yaml_file', type=str)
+    sbml_parser.add_argument('sbml_file', type=str)
+    sbml_parser.add_argument('-o', '--observables_as_assignments',
+                             action='store_true')
+    sbml_parser.add_argument('-w', '--writer', type=str, default='libsbml',
+                             choices=WRITERS)
+    sbml_parser.add_argument('--streaming', action='store_true')
+
+    petab_parser = commands.add_parser('petab', help='Convert to PEtab.')
+    petab_parser.add_argument('yaml_file', type=str)
+    petab_parser.add_argument('output_dir', type=str)
+    petab_parser.add_argument('sbml_name', type=str)
+    petab_parser.add_argument('-y', '--petab_yaml_name', type=str)
+    petab_parser.add_argument('-m', '--measurement_table_name', type=str)
+
+    for command_parser in [sbml_parser, petab_parser]:
+        command_parser.add_argument('-c', '--check_level', type=str,
+                                    default='full', choices=CHECK_LEVELS)
+        command_parser.add_argument('-s', '--skip_unchanged',
+                                    action='store_true')
+
+    args = vars(parser.parse_args())
+    client_options = {name: args.pop(name)
+                      for name in ['socket', 'port', 'json', 'profile',
+                                   'command']}
+
+    with Client(client_options['socket'], client_options['port'],
+                token=os.environ.get(TOKEN_VARIABLE) or None) as client:
+        response = client.request(client_options['command'],
+                                  client_options['profile'],
+                                  **args)
+
+    if client_options['json']:
+        print(json.dumps(response, indent=2))
+    else:
+        _print_response(response)
+
+    if not response['success']:
+        sys.exit(1)
+
+
+def _print_response(response: dict):
+    """Print a response of the server for humans."""
+    for warning in response['warnings']:
+        print(f'Warning: {warning}')
+
+    for file in response.get('written_files', []):
+        print(f'Written: {file}')
+
+    if 'profile' in response:
+        print(_format_stats(response['profile']))
+
+    if response['success']:
+        print(f'✅ ({response["time"] * 1000:.1f} ms)')
+    else:
+        print(f'❌ {response["error"]}')
@@ -0,0 +1,454 @@
+"""
+Rebuild the SBML and the PEtab tables, whenever the YAML model changes.
+
+The watch mode of `yaml2sbml` and `yaml2petab` keeps the model, the SBML
+document and the PEtab tables in memory. After a change of the YAML file,
+the new model is compared to the previous one block by block, and only the
+outputs, that depend on a changed block, are rebuilt. E.g. if only the
+conditions changed, only the condition table is created and written again,
+without building and checking the SBML.
+"""
+import logging
+import os
+import time
+import warnings
+from pathlib import Path
+
+from .file_io import _write_file, _strip_compression_extension
+from .lazy_import import _lazy_import
+from .profiling import _stage
+from .yaml2sbml import _create_sbml_document, _write_sbml_document, \
+    _load_yaml_file
+from .yaml2PEtab import _get_petab_model_files, _get_petab_table_names, \
+    _create_parameter_table, _create_observable_table, \
+    _create_condition_table, _create_petab_problem_yaml, \
+    _validate_petab_tables_from_dfs
+from .yaml_streaming import _get_block_validator, _validate
+from .yaml_validation import _validate_yaml_from_dict, _validate_structure
+
+pd = _lazy_import('pandas')
+petab = _lazy_import('petab')
+
+logger = logging.getLogger(__name__)
+
+# blocks of the YAML model, that the SBML is built from. Observables are
+# only part of the SBML, if they are represented as assignments.
+SBML_BLOCKS = ('time', 'parameters', 'assignments', 'functions', 'odes')
+
+# blocks of the YAML model, that the PEtab tables are created from. The
+# columns of the condition table are checked against parameters and ODEs.
+TABLE_BLOCKS = {'parameters': ('parameters',),
+                'observables': ('observables',),
+                'conditions': ('conditions', 'parameters', 'odes')}
+
+# functions, that create the PEtab tables from the YAML model.
+TABLE_CREATORS = {'parameters': _create_parameter_table,
+                  'observables': _create_observable_table,
+                  'conditions': _create_condition_table}
+
+
+class SBMLBuilder:
+    """
+    Keep a YAML model in memory and rebuild its SBML, if it is affected.
+
+    Outputs are only written, if their content changed, see
+    `skip_unchanged` of `yaml2sbml`.
+    """
+
+    def __init__(self,
+                 sbml_dir: str,
+                 observables_as_assignments: bool = False,
+                 check_level: str = 'full'):
+        """
+        Initialize the builder without a model.
+
+        Arguments:
+            sbml_dir: path of the SBML file, see `yaml2sbml`.
+            observables_as_assignments: see `yaml2sbml`.
+            check_level: consistency check of the generated SBML, see
+                `yaml2sbml`.
+        """
+        if not _strip_compression_extension(sbml_dir).endswith(('.xml',
+                                                                '.sbml')):
+            raise ValueError('sbml_dir should end with .xml or .sbml.')
+
+        self.sbml_dir = sbml_dir
+        self.model_name = Path(_strip_compression_extension(sbml_dir)).stem
+        self.observables_as_assignments = observables_as_assignments
+        self.check_level = check_level
+
+        self.sbml_blocks = set(SBML_BLOCKS)
+        if observables_as_assignments:
+            self.sbml_blocks.add('observables')
+
+        # the model of the last successful build and its SBML document.
+        self.yaml_dict = None
+        self.sbml_document = None
+
+    def update(self, yaml_dict: dict) -> list:
+        """
+        Rebuild the outputs, that are affected by the changes of the model.
+
+        The first call validates the model and builds all outputs, further
+        calls only validate the changed blocks. If an error occurs, the
+        previous model is kept, such that the next call rebuilds all
+        outputs, that differ from it.
+
+        Arguments:
+            yaml_dict: the new YAML model. It is kept as reference for the
+                next call and must not be modified afterwards.
+
+        Returns:
+            written_files: paths of the output files, that were (re)written.
+        """
+        # an empty file, e.g. while it is saved, is no model.
+        if yaml_dict is None:
+            logger.warning('The YAML file is empty, the rebuild is skipped.')
+            return []
+
+        changed_blocks = _get_changed_blocks(self.yaml_dict, yaml_dict)
+
+        if self.yaml_dict is None:
+            _validate_yaml_from_dict(yaml_dict)
+        else:
+            _validate_blocks(yaml_dict, changed_blocks)
+
+        written_files = self._rebuild(yaml_dict, changed_blocks)
+        self.yaml_dict = yaml_dict
+
+        return written_files
+
+    def _rebuild(self, yaml_dict: dict, changed_blocks: set) -> list:
+        """Rebuild the SBML, if it depends on one of `changed_blocks`."""
+        if self.sbml_document is not None \
+                and not changed_blocks & self.sbml_blocks:
+            return []
+
+        self.sbml_document = _create_sbml_document(
+            yaml_dict,
+            self.model_name,
+            self.observables_as_assignments,
+            self.check_level)
+
+        with _stage('write SBML'):
+            written = _write_sbml_document(self.sbml_document,
+                                           self.sbml_dir,
+                                           skip_unchanged=True)
+
+        return [self.sbml_dir] if written else []
+
+
+class PEtabBuilder(SBMLBuilder):
+    """
+    Keep a YAML model in memory and rebuild the affected PEtab files.
+
+    The SBML, each PEtab table and the PEtab YAML are rebuilt only, if the
+    blocks of the model, that they are created from, changed. The tables
+    are linted after each rebuild, against the SBML model in memory.
+    """
+
+    def __init__(self,
+                 output_dir: str,
+                 sbml_name: str,
+                 petab_yaml_name: str = None,
+                 measurement_table_name: str = None,
+                 check_level: str = 'full'):
+        """
+        Initialize the builder without a model.
+
+        Arguments:
+            output_dir: directory of the PEtab problem, see `yaml2petab`.
+            sbml_name: name of the SBML model, see `yaml2petab`.
+            petab_yaml_name: name of the PEtab YAML, see `yaml2petab`.
+            measurement_table_name: name of the measurement table in
+                `output_dir`, see `yaml2petab`.
+            check_level: consistency check of the generated SBML, see
+                `yaml2petab`.
+        """
+        sbml_dir, model_name, compression = \
+            _get_petab_model_files(output_dir, sbml_name)
+        super().__init__(sbml_dir, check_level=check_level)
+
+        self.output_dir = output_dir
+        self.model_name = model_name
+        self.compression = compression
+        self.petab_yaml_name = petab_yaml_name
+        self.measurement_table_name = measurement_table_name
+
+        if petab_yaml_name is None and measurement_table_name is not None:
+            warnings.warn('Since no petab_yaml_file_name is specified, the '
+                          'specified measurement_table_name will have no '
+                          'effect.', RuntimeWarning)
+
+        self.table_files = dict(zip(
+            TABLE_CREATORS,
+            [os.path.join(output_dir, table_name) for table_name
+             in _get_petab_table_names(model_name, compression)]))
+        # the PEtab tables as data frames, None if not part of the model.
+        self.tables = dict.fromkeys(TABLE_CREATORS)
+
+    def _rebuild(self, yaml_dict: dict, changed_blocks: set) -> list:
+        """Rebuild the SBML and the PEtab files, that are affected."""
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        sbml_document = self.sbml_document
+
+        # observables and conditions are not part of the SBML.
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=UserWarning)
+            written_files = super()._rebuild(yaml_dict, changed_blocks)
+
+        tables = dict(self.tables)
+        if self.yaml_dict is None:
+            changed_tables = list(TABLE_BLOCKS)
+        else:
+            changed_tables = [table_id for (table_id, blocks)
+                              in TABLE_BLOCKS.items()
+                              if changed_blocks & set(blocks)]
+
+        with _stage('create PEtab tables'):
+            for table_id in changed_tables:
+                tables[table_id] = TABLE_CREATORS[table_id](yaml_dict) \
+                    if table_id in yaml_dict else None
+
+        # lint the tables, that depend on a change, before writing them.
+        lint_tables = set(changed_tables)
+        if self.sbml_document is not sbml_document:
+            lint_tables.update(['parameters', 'conditions'])
+        if 'observables' in changed_tables:
+            lint_tables.add('parameters')
+
+        _validate_petab_tables_from_dfs(self.sbml_document.getModel(),
+                                        tables['parameters'],
+                                        tables['observables'],
+                                        tables['conditions'],
+                                        tuple(lint_tables))
+        self.tables = tables
+
+        with _stage('write PEtab tables'):
+            for table_id in changed_tables:
+                table_dir = self.table_files[table_id]
+
+                # write line endings unchanged, as in `yaml2petab`.
+                if tables[table_id] is not None and \
+                        _write_file(table_dir,
+                                    tables[table_id].to_csv(sep='\t',
+                                                            index=False),
+                                    skip_unchanged=True,
+                                    newline=''):
+                    written_files.append(table_dir)
+
+        # the PEtab YAML only lists the tables, that exist.
+        petab_yaml_changed = self.yaml_dict is None \
+            or any((block_key in self.yaml_dict) != (block_key in yaml_dict)
+                   for block_key in ('observables', 'conditions'))
+
+        if self.petab_yaml_name is not None and petab_yaml_changed:
+            with _stage('write PEtab YAML'):
+                if _create_petab_problem_yaml(yaml_dict,
+                                              self.output_dir,
+                                              self.sbml_dir,
+                                              self.petab_yaml_name,
+                                              self.model_name,
+                                              self.measurement_table_name,
+                                              skip_unchanged=True,
+                                              compression=self.compression):
+                    written_files.append(os.path.join(self.output_dir,
+                                                      self.petab_yaml_name))
+
+        return written_files
+
+    def get_measurement_table_dir(self):
+        """Return the path of the measurement table, or None."""
+        if self.measurement_table_name is None:
+            return None
+
+        return os.path.join(self.output_dir, self.measurement_table_name)
+
+    def check_measurement_table(self):
+        """
+        Lint the measurement table against the observables in memory.
+
+        Does nothing, if there is no measurement table (yet).
+
+        Raises:
+            Errors are raised by lint, if the measurement table is invalid.
+        """
+        measurement_table_dir = self.get_measurement_table_dir()
+        if measurement_table_dir is None or \
+                not os.path.isfile(measurement_table_dir):
+            return
+
+        observable_df = self.tables['observables']
+        if observable_df is not None:
+            observable_df = observable_df.set_index(petab.OBSERVABLE_ID)
+
+        with _stage('lint PEtab tables'):
+            petab.lint.check_measurement_df(
+                pd.read_csv(measurement_table_dir, sep='\t'),
+                observable_df)
+
+
+def watch_yaml2sbml(yaml_dir: str,
+                    sbml_dir: str,
+                    observables_as_assignments: bool = False,
+                    check_level: str = 'full',
+                    interval: float = 1.,
+                    max_rebuilds: int = None):
+    """
+    Convert a YAML model to SBML, whenever the YAML file changes.
+
+    The SBML is only rebuilt, if a block changed, that it depends on, and
+    only written, if it changed. See `yaml2sbml` for the arguments and
+    `watch` for `interval` and `max_rebuilds`.
+    """
+    builder = SBMLBuilder(sbml_dir, observables_as_assignments, check_level)
+
+    def rebuild(changed_files):
+        _log_written_files(builder.update(_load_yaml_file(yaml_dir)))
+
+    watch([yaml_dir], rebuild, interval, max_rebuilds)
+
+
+def watch_yaml2petab(yaml_dir: str,
+                     output_dir: str,
+                     sbml_name: str,
+                     petab_yaml_name: str = None,
+                     measurement_table_name: str = None,
+                     check_level: str = 'full',
+                     interval: float = 1.,
+                     max_rebuilds: int = None):
+    """
+    Convert a YAML model to PEtab, whenever the YAML file changes.
+
+    Only the SBML and the PEtab files are rebuilt, that depend on a changed
+    block, see `PEtabBuilder`. The measurement table in `output_dir` is
+    watched as well and linted against the observables, whenever it or the
+    model changes. See `yaml2petab` for the arguments and `watch` for
+    `interval` and `max_rebuilds`.
+    """
+    builder = PEtabBuilder(output_dir, sbml_name, petab_yaml_name,
+                           measurement_table_name, check_level)
+    files = [yaml_dir]
+
+    measurement_table_dir = builder.get_measurement_table_dir()
+    if measurement_table_dir is not None:
+        files.append(measurement_table_dir)
+
+    def rebuild(changed_files):
+        if yaml_dir in changed_files:
+            _log_written_files(builder.update(_load_yaml_file(yaml_dir)))
+
+        builder.check_measurement_table()
+
+    watch(files, rebuild, interval, max_rebuilds)
+
+
+def watch(files: list,
+          rebuild,
+          interval: float = 1.,
+          max_rebuilds: int = None):
+    """
+    Call `rebuild` initially and whenever one of `files` changes.
+
+    Changes are detected by polling the modification time and the size of
+    the files, such that no further dependency is needed. Errors of
+    `rebuild`, e.g. of a half-saved or invalid model, are logged and
+    watching continues.
+
+    Arguments:
+        files: paths of the watched files. They do not need to exist.
+        rebuild: function, that is called with the list of the changed
+            files (all files for the initial call).
+        interval: time between two polls, in seconds.
+        max_rebuilds: number of calls of `rebuild`, after which watching
+            stops. None to watch until interrupted.
+    """
+    # no state is known initially, such that all files count as changed.
+    file_states = dict.fromkeys(files, ())
+    n_rebuilds = 0
+
+    while True:
+        new_file_states = {file: _get_file_state(file) for file in files}
+        changed_files = [file for file in files
+                         if new_file_states[file] != file_states[file]]
+
+        if changed_files:
+            file_states = new_file_states
+            n_rebuilds += 1
+            start_time = time.perf_counter()
+
+            try:
+                rebuild(changed_files)
+            except Exception as e:
+                logger.error(f'Rebuild failed: {type(e).__name__}: {e}')
+            else:
+                logger.info(f'Rebuilt in '
+                            f'{time.perf_counter() - start_time:.3f} s.')
+
+            if max_rebuilds is not None and n_rebuilds >= max_rebuilds:
+                break
+
+        time.sleep(interval)
+
+
+def _get_changed_blocks(old_yaml_dict: dict, new_yaml_dict: dict) -> set:
+    """
+    Compare two YAML models block by block.
+
+    Arguments:
+        old_yaml_dict: the previous model, or None.
+        new_yaml_dict: the new model.
+
+    Returns:
+        changed_blocks: keys of the blocks, that were added, removed or
+            changed. All blocks, if the order of the blocks changed, since
+            it determines the order of the SBML.
+    """
+    if old_yaml_dict is None or \
+            [key for key in old_yaml_dict if key in new_yaml_dict] != \
+            [key for key in new_yaml_dict if key in old_yaml_dict]:
+        return set(new_yaml_dict) | set(old_yaml_dict or {})
+
+    return {block_key for block_key
+            in set(old_yaml_dict) | set(new_yaml_dict)
+            if old_yaml_dict.get(block_key) != new_yaml_dict.get(block_key)}
+
+
+def _validate_blocks(yaml_dict: dict, block_keys: set):
+    """
+    Validate some blocks of a model and its structure against the schema.
+
+    Arguments:
+        yaml_dict: YAML model, whose other blocks are known to be valid.
+        block_keys: blocks, that are validated.
+
+    Raises:
+        jsonschema.exceptions.ValidationError, if the model is invalid.
+    """
+    with _stage('validate schema'):
+        _validate_structure(yaml_dict)
+
+        for block_key in block_keys:
+            if block_key in yaml_dict:
+                _validate(_get_block_validator(block_key),
+                          yaml_dict[block_key],
+                          [block_key])
+
+
+def _get_file_state(file: str):
+    """Return the modification time and size of a file, or None."""
+    try:
+        stat = os.stat(file)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _log_written_files(written_files: list):
+    """Log the output files, that were rewritten by a rebuild."""
+    if written_files:
+        logger.info('Written: ' + ', '.join(written_files))
+    else:
+        logger.info('All outputs are up to date.')
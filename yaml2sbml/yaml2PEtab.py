@@ -1,24 +1,41 @@
 """Translate ODEs in the YAML format into PEtab."""
 import argparse
+import numbers
 import os
 import warnings
 
-import libsbml as sbml
-import pandas as pd
-import petab
-import yaml
 from pathlib import Path
 
 
-from .yaml2sbml import _parse_yaml_dict, _load_yaml_file
+from .conversion_cache import ConversionCache, _record_warnings, _is_inside
+from .file_io import _write_file, _copy_file, _dump_yaml, \
+    _get_compression_extension, _strip_compression_extension
+from .yaml2sbml import _create_sbml_document, _write_sbml_document, \
+    _read_sbml_document, _load_yaml_file, _log_to_console, \
+    _add_cache_arguments, _add_skip_unchanged_argument, _get_cache_from_args, \
+    _add_watch_arguments, _add_prune_argument, CHECK_LEVELS
 from .yaml_validation import _validate_yaml_from_dict
+from .lazy_import import _lazy_import
+from .profiling import _stage, _add_profile_argument, _print_profile
+
+# libsbml, pandas and petab are only loaded, when they are used.
+sbml = _lazy_import('libsbml')
+pd = _lazy_import('pandas')
+petab = _lazy_import('petab')
+
+# PEtab tables, that are created from the YAML model.
+PETAB_TABLES = ('parameters', 'observables', 'conditions')
 
 
 def yaml2petab(yaml_dir: str,
                output_dir: str,
                sbml_name: str,
                petab_yaml_name: str = None,
-               measurement_table_name: str = None):
+               measurement_table_name: str = None,
+               check_level: str = 'full',
+               cache: ConversionCache = None,
+               skip_unchanged: bool = False,
+               prune: bool = False) -> list:
     """
     Translate a YAML model into a PEtab model.
 
@@ -33,23 +50,84 @@ def yaml2petab(yaml_dir: str,
     Arguments:
         yaml_dir : path to the YAML file with the ODEs specification
         output_dir: path the output file(s) are be written out
-        sbml_name: name of SBML model
+        sbml_name: name of SBML model. If it ends with .gz, .bz2, .xz or
+            .zst, the SBML and the PEtab tables are compressed.
         petab_yaml_name: name of YAML organizing the PEtab problem.
+            Compressed, if it ends with .gz, .bz2, .xz or .zst.
         measurement_table_name: Name of measurement table
+        check_level: consistency check of the generated SBML, one of
+            'none' (no check), 'identifiers' (only check identifiers) or
+            'full' (all checks of libsbml except for units).
+        cache: conversion cache. If given, cached outputs for the same YAML
+            content and options are reused, without parsing, validating and
+            checking the model again. Warnings of the conversion are emitted
+            again. Not used with `prune=True` or output files outside of
+            `output_dir`.
+        skip_unchanged: indicates, whether existing output files, that are
+            identical to the generated ones, should be left untouched (e.g.
+            to keep their modification time for build tools).
+        prune: indicates, whether parameters, assignments and functions,
+            that no ODE, observable or condition refers to, should be left
+            out of the SBML and the parameter table, see
+            `pruning.get_unused_entities`. The removed entities are logged.
+            Parameters, that are only used in the measurement table, are
+            removed as well.
+
+    Returns:
+        written_files: paths of the output files, that were (re)written.
     """
-    yaml_model_dict = _load_yaml_file(yaml_dir)
-    _yaml2petab(yaml_model_dict,
-                output_dir,
-                sbml_name,
-                petab_yaml_name,
-                measurement_table_name)
+    # the report of pruning is logged and not reproduced from the cache.
+    if prune or not all(_is_inside(file_name)
+                        for file_name in [sbml_name, petab_yaml_name]
+                        if file_name is not None):
+        cache = None
+
+    if cache is not None:
+        cache_key = cache.get_key(
+            yaml_dir,
+            converter='yaml2petab',
+            sbml_name=sbml_name,
+            petab_yaml_name=petab_yaml_name,
+            measurement_table_name=measurement_table_name,
+            check_level=check_level)
+        cached_files = cache.get(cache_key)
+
+        if cached_files is not None:
+            written_files = []
+
+            for (file_name, cached_file) in cached_files.items():
+                file = os.path.join(output_dir, file_name)
+                os.makedirs(os.path.dirname(file), exist_ok=True)
+                if _copy_file(cached_file, file, skip_unchanged):
+                    written_files.append(file)
+
+            return written_files
+
+    with _record_warnings(cache is not None) as caught_warnings:
+        yaml_model_dict = _load_yaml_file(yaml_dir)
+        output_files, written_files = _yaml2petab(yaml_model_dict,
+                                                  output_dir,
+                                                  sbml_name,
+                                                  petab_yaml_name,
+                                                  measurement_table_name,
+                                                  check_level,
+                                                  skip_unchanged,
+                                                  prune)
+
+    if cache is not None:
+        cache.put(cache_key, output_files, output_dir, caught_warnings)
+
+    return written_files
 
 
 def _yaml2petab(yaml_model_dict: dict,
                 output_dir: str,
                 model_name: str,
                 petab_yaml_name: str = None,
-                measurement_table_name: str = None):
+                measurement_table_name: str = None,
+                check_level: str = 'full',
+                skip_unchanged: bool = False,
+                prune: bool = False):
     """
     Similar to 'yaml2petab', but takes a yaml_model_dict as input.
 
@@ -63,34 +141,53 @@ def _yaml2petab(yaml_model_dict: dict,
         model_name: name of SBML model
         petab_yaml_name: name of yaml organizing the PEtab problem.
         measurement_table_name: Name of measurement table
+        check_level: consistency check of the generated SBML, see
+            `yaml2sbml._check_consistency`.
+        skip_unchanged: indicates, whether unchanged output files should be
+            left untouched.
+        prune: indicates, whether unused entities should be removed, see
+            `pruning.prune_yaml_dict`.
+
+    Returns:
+        output_files: paths to all output files.
+        written_files: paths to the output files, that were (re)written.
     """
     # validate yaml
     _validate_yaml_from_dict(yaml_model_dict)
 
+    if prune:
+        from .pruning import prune_yaml_dict
+        yaml_model_dict = prune_yaml_dict(yaml_model_dict)
+
     # output make directory, if it doesn't exist yet.
     if not os.path.exists(output_dir):
         os.mkdir(output_dir)
 
-    if model_name.endswith('.xml') or model_name.endswith('.sbml'):
-        sbml_dir = os.path.join(output_dir, model_name)
-    else:
-        sbml_dir = os.path.join(output_dir, model_name + '.xml')
+    sbml_dir, model_name, compression = _get_petab_model_files(output_dir,
+                                                               model_name)
 
     with warnings.catch_warnings():
         warnings.simplefilter("ignore", category=UserWarning)
-        sbml_as_string = _parse_yaml_dict(yaml_model_dict,
-                                          model_name)
+        sbml_document = _create_sbml_document(yaml_model_dict,
+                                              model_name,
+                                              check_level=check_level)
 
-    with open(sbml_dir, 'w') as f_out:
-        f_out.write(sbml_as_string)
+    output_files = [sbml_dir]
+    written_files = []
 
-    # create petab tsv files:
-    if model_name.endswith('.xml') or model_name.endswith('.sbml'):
-        model_name = Path(model_name).stem
+    with _stage('write SBML'):
+        if _write_sbml_document(sbml_document, sbml_dir, skip_unchanged):
+            written_files.append(sbml_dir)
 
-    _create_petab_tables_from_yaml(yaml_model_dict,
-                                   output_dir,
-                                   model_name)
+    # create petab tsv files:
+    petab_tables, table_files, written_table_files = \
+        _create_petab_tables_from_yaml(yaml_model_dict,
+                                       output_dir,
+                                       model_name,
+                                       skip_unchanged,
+                                       compression)
+    output_files.extend(table_files)
+    written_files.extend(written_table_files)
 
     # create yaml file, that organizes the petab problem:
     if (petab_yaml_name is None) and (measurement_table_name is not None):
@@ -100,19 +197,60 @@ def _yaml2petab(yaml_model_dict: dict,
                       RuntimeWarning)
 
     elif petab_yaml_name is not None:
-        _create_petab_problem_yaml(yaml_model_dict,
-                                   output_dir,
-                                   sbml_dir,
-                                   petab_yaml_name,
-                                   model_name,
-                                   measurement_table_name)
-    # validate PEtab tables:
-    validate_petab_tables(sbml_dir, output_dir)
+        petab_yaml_dir = os.path.join(output_dir, petab_yaml_name)
+        output_files.append(petab_yaml_dir)
+
+        with _stage('write PEtab YAML'):
+            if _create_petab_problem_yaml(yaml_model_dict,
+                                          output_dir,
+                                          sbml_dir,
+                                          petab_yaml_name,
+                                          model_name,
+                                          measurement_table_name,
+                                          skip_unchanged,
+                                          compression):
+                written_files.append(petab_yaml_dir)
+
+    # validate PEtab tables, that are still in memory:
+    _validate_petab_tables_from_dfs(sbml_document.getModel(),
+                                    *petab_tables)
+
+    return output_files, written_files
+
+
+def _get_petab_model_files(output_dir: str, sbml_name: str) -> tuple:
+    """
+    Return the path of the SBML and the naming of the PEtab tables.
+
+    Arguments:
+        output_dir: directory of the PEtab problem.
+        sbml_name: name of the SBML model, see `yaml2petab`.
+
+    Returns:
+        sbml_dir: path of the SBML file.
+        model_name: name of the model without extensions, that the PEtab
+            tables are named after.
+        compression: extension of the compression of the SBML and the
+            PEtab tables, e.g. '.gz', or ''.
+    """
+    # the SBML and the PEtab tables are compressed in the same way.
+    compression = _get_compression_extension(sbml_name) or ''
+    model_name = _strip_compression_extension(sbml_name)
+
+    if model_name.endswith('.xml') or model_name.endswith('.sbml'):
+        sbml_dir = os.path.join(output_dir, model_name + compression)
+        model_name = Path(model_name).stem
+    else:
+        sbml_dir = os.path.join(output_dir, model_name + '.xml' + compression)
+
+    return sbml_dir, model_name, compression
 
 
 def _create_petab_tables_from_yaml(yaml_dict: dict,
                                    output_dir: str,
-                                   model_name: str):
+                                   model_name: str,
+                                   skip_unchanged: bool = False,
+                                   compression: str = ''):
     """
     Parse the YAML dict to a PEtab observable/parameter table.
 
@@ -124,29 +262,71 @@ def _create_petab_tables_from_yaml(yaml_dict: dict,
     Arguments:
         yaml_dict: dict, that contains the yaml file.
         output_dir: directory, where the PEtab tables should be written.
+        model_name: name of the model, in order to name the PEtab tables.
+        skip_unchanged: indicates, whether unchanged tables should not be
+            rewritten.
+        compression: extension of the compression of the tables, e.g.
+            '.gz', or '' for uncompressed tables.
+
+    Returns:
+        petab_tables: The parameter, observable and condition table as
+            pandas data frames. None for the observable/condition table,
+            if the corresponding block is not contained in the YAML.
+        table_files: paths to all PEtab tables.
+        written_files: paths to the PEtab tables, that were (re)written.
     """
-    parameter_table = _create_parameter_table(yaml_dict)
-    parameter_table.to_csv(os.path.join(output_dir,
-                                        f'parameters_{model_name}.tsv'),
-                           sep='\t',
-                           index=False)
+    with _stage('create PEtab tables'):
+        parameter_table = _create_parameter_table(yaml_dict)
+        observable_table = None
+        condition_table = None
 
-    # create PEtab observable table, if observables occur in the yaml file.
-    if 'observables' in yaml_dict.keys():
-        observable_table = _create_observable_table(yaml_dict)
-        observable_table.to_csv(os.path.join(output_dir,
-                                             f'observables_{model_name}.tsv'),
-                                sep='\t',
-                                index=False)
+        # create PEtab observable table, if observables occur in the yaml.
+        if 'observables' in yaml_dict.keys():
+            observable_table = _create_observable_table(yaml_dict)
 
-    # create PEtab condition table, if conditions occur in the yaml file.
-    if 'conditions' in yaml_dict.keys():
-        condition_table = _create_condition_table(yaml_dict)
-        condition_table.to_csv(
-            os.path.join(output_dir,
-                         f'experimental_conditions_{model_name}.tsv'),
-            sep='\t',
-            index=False)
+        # create PEtab condition table, if conditions occur in the yaml.
+        if 'conditions' in yaml_dict.keys():
+            condition_table = _create_condition_table(yaml_dict)
+
+    petab_tables = (parameter_table, observable_table, condition_table)
+    table_files = []
+    written_files = []
+
+    with _stage('write PEtab tables'):
+        for (table_name, table) in zip(_get_petab_table_names(model_name,
+                                                              compression),
+                                       petab_tables):
+            if table is None:
+                continue
+
+            table_dir = os.path.join(output_dir, table_name)
+            table_files.append(table_dir)
+
+            # write line endings unchanged, as `pd.DataFrame.to_csv` does.
+            if _write_file(table_dir,
+                           table.to_csv(sep='\t', index=False),
+                           skip_unchanged,
+                           newline=''):
+                written_files.append(table_dir)
+
+    return petab_tables, table_files, written_files
+
+
+def _get_petab_table_names(model_name: str,
+                           compression: str = '') -> tuple:
+    """
+    Return the file names of the PEtab tables for the model `model_name`.
+
+    Arguments:
+        model_name: name of the model.
+        compression: extension of the compression, e.g. '.gz'.
+
+    Returns:
+        file names of the parameter, observable and condition table.
+    """
+    return (f'parameters_{model_name}.tsv{compression}',
+            f'observables_{model_name}.tsv{compression}',
+            f'experimental_conditions_{model_name}.tsv{compression}')
 
 
 def _create_petab_problem_yaml(yaml_dict: dict,
@@ -154,10 +334,15 @@ def _create_petab_problem_yaml(yaml_dict: dict,
                                sbml_dir: str,
                                petab_yaml_name: str,
                                model_name: str,
-                               measurement_table_name: str = None):
+                               measurement_table_name: str = None,
+                               skip_unchanged: bool = False,
+                               compression: str = '') -> bool:
     """
     Create a YAML file, that can be used for defining a PEtab problem.
 
+    The SBML and the PEtab tables are referred to relative to the YAML file,
+    which can be in a subdirectory of `output_dir`.
+
     Arguments:
         yaml_dict: dict, that contains the YAML file.
         output_dir: directory, where the PEtab tables should be written.
@@ -165,30 +350,45 @@ def _create_petab_problem_yaml(yaml_dict: dict,
         petab_yaml_name: name of file, where PEtab YAML is written.
         model_name: name of the model, in order to name the PEtab tables.
         measurement_table_name: directory of the  measurement table.
+        skip_unchanged: indicates, whether an unchanged file should not be
+            rewritten.
+        compression: extension of the compression of the PEtab tables.
+
+    Returns:
+        written: indicates, whether the file was written.
     """
-    petab_yaml_dict = {'format_version': 1,
-                       'parameter_file': f'parameters_{model_name}.tsv',
-                       'problems': [{'sbml_files':
-                                         [os.path.basename(sbml_dir)]}]}
+    petab_yaml_dir = os.path.join(output_dir, petab_yaml_name)
+    petab_yaml_parent_dir = os.path.dirname(petab_yaml_dir)
+    os.makedirs(petab_yaml_parent_dir, exist_ok=True)
+
+    parameter_table_name, observable_table_name, condition_table_name = [
+        os.path.relpath(os.path.join(output_dir, table_name),
+                        petab_yaml_parent_dir)
+        for table_name in _get_petab_table_names(model_name, compression)]
+
+    petab_yaml_dict = {
+        'format_version': 1,
+        'parameter_file': parameter_table_name,
+        'problems': [{'sbml_files': [
+            os.path.relpath(sbml_dir, petab_yaml_parent_dir)]}]}
 
     # fill the corresponding entries, if they are contained in the yaml/input.
 
     if 'observables' in yaml_dict.keys():
         petab_yaml_dict['problems'][0]['observable_files'] = \
-            [f'observables_{model_name}.tsv']
+            [observable_table_name]
 
     if 'conditions' in yaml_dict.keys():
         petab_yaml_dict['problems'][0]['condition_files'] = \
-            [f'experimental_conditions_{model_name}.tsv']
+            [condition_table_name]
 
     if measurement_table_name is not None:
         petab_yaml_dict['problems'][0]['measurement_files'] = \
             [measurement_table_name]
 
-    petab_yaml_dir = os.path.join(output_dir, petab_yaml_name)
-
-    with open(petab_yaml_dir, 'w') as file:
-        yaml.dump(petab_yaml_dict, file)
+    return _write_file(petab_yaml_dir,
+                       _dump_yaml(petab_yaml_dict),
+                       skip_unchanged)
 
 
 def _create_parameter_table(yaml_dict: dict):
@@ -253,47 +453,111 @@ def validate_petab_tables(sbml_dir: str,
     standard.
 
     Arguments:
-        sbml_dir: directory of the sbml
+        sbml_dir: directory of the sbml. If it is compressed, the PEtab
+            tables are expected to be compressed in the same way.
         output_dir: output directory for petab files
 
     Raises:
         Errors are raised by lint, if PEtab files are invalid...
     """
-    model = sbml.readSBML(sbml_dir).getModel()
+    model = _read_sbml_document(sbml_dir).getModel()
     model_name = model.getId()
+    observable_df = None
+    condition_df = None
 
-    parameter_file_dir = \
-        os.path.join(output_dir, f'parameters_{model_name}.tsv')
-    observable_file_dir = \
-        os.path.join(output_dir, f'observables_{model_name}.tsv')
-    condition_table_dir = \
-        os.path.join(output_dir, f'experimental_conditions_{model_name}.tsv')
+    parameter_file_dir, observable_file_dir, condition_table_dir = \
+        [os.path.join(output_dir, table_name)
+         for table_name in _get_petab_table_names(
+             model_name, _get_compression_extension(sbml_dir) or '')]
 
-    # check observable table, if the table exists
+    # read observable table, if the table exists
     if os.path.exists(observable_file_dir):
         observable_df = pd.read_csv(observable_file_dir,
                                     sep='\t',
                                     index_col='observableId')
-        petab.lint.check_observable_df(observable_df)
 
-    else:
-        observable_df = None
-
-    # check condition table, if the table exists
+    # read condition table, if the table exists
     if os.path.exists(condition_table_dir):
         condition_df = pd.read_csv(condition_table_dir,
                                    sep='\t',
                                    index_col='conditionId')
-        petab.lint.check_condition_df(condition_df, model)
 
-    # check parameter table
+    # read parameter table
     parameter_df = pd.read_csv(parameter_file_dir,
                                sep='\t',
                                index_col='parameterId')
 
-    petab.lint.check_parameter_df(parameter_df,
-                                  sbml_model=model,
-                                  observable_df=observable_df)
+    _lint_petab_tables(model, parameter_df, observable_df, condition_df)
+
+
+def _validate_petab_tables_from_dfs(sbml_model: 'sbml.Model',
+                                    parameter_table: 'pd.DataFrame',
+                                    observable_table: 'pd.DataFrame' = None,
+                                    condition_table: 'pd.DataFrame' = None,
+                                    tables: tuple = PETAB_TABLES):
+    """
+    Validate PEtab tables, that are given as data frames, via `petab.lint`.
+
+    In contrast to `validate_petab_tables`, the SBML model and the tables
+    are not read from disk, but taken as created by `_yaml2petab`.
+
+    Arguments:
+        sbml_model: SBML model (libsbml)
+        parameter_table: parameter table as created by
+            `_create_parameter_table`.
+        observable_table: observable table as created by
+            `_create_observable_table`, if any.
+        condition_table: condition table as created by
+            `_create_condition_table`, if any.
+        tables: tables, that are checked, see `_lint_petab_tables`.
+
+    Raises:
+        Errors are raised by lint, if PEtab tables are invalid...
+    """
+    if observable_table is not None:
+        observable_table = observable_table.set_index(petab.OBSERVABLE_ID)
+
+    if condition_table is not None:
+        condition_table = condition_table.set_index(petab.CONDITION_ID)
+
+    _lint_petab_tables(sbml_model,
+                       parameter_table.set_index(petab.PARAMETER_ID),
+                       observable_table,
+                       condition_table,
+                       tables)
+
+
+def _lint_petab_tables(sbml_model: 'sbml.Model',
+                       parameter_df: 'pd.DataFrame',
+                       observable_df: 'pd.DataFrame' = None,
+                       condition_df: 'pd.DataFrame' = None,
+                       tables: tuple = PETAB_TABLES):
+    """
+    Check the PEtab tables, that are indexed by their id column.
+
+    Arguments:
+        sbml_model: SBML model (libsbml)
+        parameter_df: PEtab parameter table
+        observable_df: PEtab observable table, if any.
+        condition_df: PEtab condition table, if any.
+        tables: tables, that are checked, a subset of `PETAB_TABLES`. The
+            others are only used as reference, e.g. to check the parameter
+            table against the observables.
+
+    Raises:
+        Errors are raised by lint, if PEtab tables are invalid...
+    """
+    with _stage('lint PEtab tables'):
+        if observable_df is not None and 'observables' in tables:
+            petab.lint.check_observable_df(observable_df)
+
+        if condition_df is not None and 'conditions' in tables:
+            petab.lint.check_condition_df(condition_df, sbml_model)
+
+        if 'parameters' in tables:
+            petab.lint.check_parameter_df(parameter_df,
+                                          sbml_model=sbml_model,
+                                          observable_df=observable_df)
 
 
 def _create_petab_table(block_list: list,
@@ -302,6 +566,11 @@ def _create_petab_table(block_list: list,
     """
     Create a PEtab table from the block_list in the yaml_dict.
 
+    The table is created in one shot from the entries of the block. The
+    columns are the mandatory columns, followed by all further keys in the
+    order of their first occurrence in `block_list`. Entries, that do not
+    specify a column, are left empty.
+
     Arguments:
         block_list: entry from yaml_dict.
         mandatory_id_list: list of mandatory ids in the PEtab table
@@ -310,37 +579,60 @@ def _create_petab_table(block_list: list,
     Returns:
         petab_table: pandas data frame containing the petab table.
     """
-    petab_table = pd.DataFrame({col_id: [] for col_id in mandatory_id_list})
-
+    # dicts keep insertion order and give unique keys
+    columns = dict.fromkeys(mandatory_id_list)
     for row in block_list:
-        _petab_table_add_row(petab_table, row)
+        columns.update(dict.fromkeys(row))
+
+    petab_table = pd.DataFrame(block_list, columns=list(columns))
+
+    # keep the values as previous versions, that filled the table cell by
+    # cell, such that the written tables stay identical, see
+    # `_get_cell_by_cell_values`.
+    for col_name in petab_table.columns:
+        column = petab_table[col_name]
+        if pd.api.types.is_integer_dtype(column):
+            petab_table[col_name] = column.astype(float)
+        elif column.dtype == object:
+            petab_table[col_name] = _get_cell_by_cell_values(column)
 
     # check if every column is part of PEtab standard.
-    for col_name in petab_table.head():
-        if not (col_name in mandatory_id_list or col_name in optional_id_list):
+    optional_ids = set(optional_id_list)
+    for col_name in petab_table.columns:
+        if not (col_name in mandatory_id_list or col_name in optional_ids):
             warnings.warn(f'PEtab warning: {col_name} is not part of the '
                           f'PEtab standard and hence might have noe effect.')
     return petab_table
 
 
-def _petab_table_add_row(petab_table: pd.DataFrame, row_dict: dict):
+def _get_cell_by_cell_values(column: 'pd.Series') -> list:
     """
-    Add a row defined by row_dict to the petab_table given by petab_table.
-
-    After the function call the last row of petab_table has the entries
+    Return the values of a column, as if it was filled cell by cell.
 
-        petab_table[-1, key] = row_dict[key]
-
-    for all keys of row_dict.
+    A column, that is filled cell by cell, is numeric, until it gets its
+    first value, that is no number (e.g. a formula). Integers, that it gets
+    before, are converted to float (and written e.g. as 10.0), later ones
+    are kept.
 
     Arguments:
-        petab_table: pd.DataFrame containing the current petab table.
-        row_dict: dict, that contains the values of the new row.
+        column: column of the table in the order of the rows.
+
+    Returns:
+        values: the converted values.
     """
-    n_rows = petab_table.shape[0]
+    values = []
+    is_numeric = True
 
-    for key in row_dict.keys():
-        petab_table.loc[n_rows + 1, key] = row_dict[key]
+    for value in column:
+        if is_numeric and isinstance(value, numbers.Number) \
+                and not isinstance(value, bool):
+            value = float(value)
+        elif value is not None:
+            is_numeric = False
+
+        values.append(value)
+
+    return values
 
 
 def main():
@@ -356,20 +648,56 @@ def main():
                         help='Optional argument, creates a petab .yml')
     parser.add_argument('-m', '--measurement_table', type=str,
                         help='Optional argument, path to measurement table')
+    parser.add_argument('-c', '--check_level', type=str, default='full',
+                        choices=CHECK_LEVELS,
+                        help='Optional argument, consistency check of the '
+                             'generated SBML. Defaults to full.')
+    _add_cache_arguments(parser)
+    _add_skip_unchanged_argument(parser)
+    _add_profile_argument(parser)
+    _add_watch_arguments(parser)
+    _add_prune_argument(parser)
 
     args = parser.parse_args()
 
+    if args.prune and args.watch:
+        parser.error('--prune is not possible with --watch.')
+
+    _log_to_console()
+
     print(f'Path to yaml file: {args.yaml_file}')
     print(f'Output directory: {args.output_dir}')
     print(f'Path to sbml/petab files: {args.model_name}')
 
+    if args.watch:
+        from .watch import watch_yaml2petab
+
+        print('Watching for changes, stop with Ctrl+C...')
+        with _print_profile(args.profile):
+            try:
+                watch_yaml2petab(args.yaml_file,
+                                 args.output_dir,
+                                 args.model_name,
+                                 args.petab_yaml,
+                                 args.measurement_table,
+                                 args.check_level,
+                                 args.watch_interval)
+            except KeyboardInterrupt:
+                pass
+        return
+
     print('Converting...')
 
-    yaml2petab(args.yaml_file,
-               args.output_dir,
-               args.model_name,
-               args.petab_yaml,
-               args.measurement_table)
+    with _print_profile(args.profile):
+        yaml2petab(args.yaml_file,
+                   args.output_dir,
+                   args.model_name,
+                   args.petab_yaml,
+                   args.measurement_table,
+                   args.check_level,
+                   _get_cache_from_args(args),
+                   args.skip_unchanged,
+                   args.prune)
 
 
 if __name__ == '__main__':
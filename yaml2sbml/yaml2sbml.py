@@ -1,18 +1,52 @@
 """Translate ODEs in the YAML format into SBML."""
 import argparse
+import io
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
 import warnings
 from pathlib import Path
 
-import libsbml as sbml
-import yaml
 from yaml.scanner import ScannerError
 
+from .conversion_cache import ConversionCache, _record_warnings
+from .file_io import _copy_file, _replace_file, _load_yaml, _open_file, \
+    _strip_compression_extension, _get_compression_extension, _get_tmp_file
+from .formula_cache import FORMULA_CACHE
+from .lazy_import import _lazy_import
+from .profiling import _stage, _add_profile_argument, _print_profile
+from .sbml_writer import _XMLModel, _XMLElement
 from .yaml_validation import _validate_yaml_from_dict
+from .yaml_streaming import _stream_yaml_blocks
+
+# libsbml is only loaded, when a model is converted.
+sbml = _lazy_import('libsbml')
+
+logger = logging.getLogger(__name__)
+
+# check levels for the SBML consistency check, see `_check_consistency`.
+CHECK_LEVELS = ('none', 'identifiers', 'full')
+
+# writers of the SBML file, see `yaml2sbml`.
+WRITERS = ('libsbml', 'direct')
+
+# handler, that prints the log messages in the CLIs, see `_log_to_console`.
+_CONSOLE_HANDLER = logging.StreamHandler(sys.stdout)
+_CONSOLE_HANDLER.setFormatter(logging.Formatter('%(message)s'))
 
 
 def yaml2sbml(yaml_dir: str,
               sbml_dir: str,
-              observables_as_assignments: bool = False):
+              observables_as_assignments: bool = False,
+              check_level: str = 'full',
+              cache: ConversionCache = None,
+              skip_unchanged: bool = False,
+              streaming: bool = False,
+              writer: str = 'libsbml',
+              prune: bool = False) -> list:
     """
     Parse a YAML file with the specification of ODEs and write it to SBML.
 
@@ -22,28 +56,106 @@ def yaml2sbml(yaml_dir: str,
 
     Arguments:
         yaml_dir: directory to the YAML file with the ODEs specification
-        sbml_dir: directory to the SBML file to be written out
+        sbml_dir: directory to the SBML file to be written out. If it ends
+            with .gz, .bz2, .xz or .zst, the SBML is compressed.
         observables_as_assignments: indicates whether there should be
             parameter assignments of the form `observable_<observable_id>`.
+        check_level: consistency check of the generated SBML, one of
+            'none' (no check), 'identifiers' (only check identifiers) or
+            'full' (all checks of libsbml except for units).
+        cache: conversion cache. If given, a cached SBML for the same YAML
+            content and options is reused, without parsing, validating and
+            checking the model again. Warnings of the conversion are emitted
+            again. Not used with `prune=True`.
+        skip_unchanged: indicates, whether an existing SBML file, that is
+            identical to the generated one, should be left untouched (e.g.
+            to keep its modification time for build tools).
+        streaming: indicates, whether the YAML file should be converted
+            while it is parsed, entry by entry, instead of loading the whole
+            model first. This reduces the memory for very large models.
+        writer: 'libsbml' builds the model with libsbml and serializes it.
+            'direct' writes the XML of each entity directly to the file,
+            which is faster and needs less memory for very large models. The
+            SBML is the same. The consistency check reads the file again
+            with libsbml, consider `check_level='none'` for large models.
+        prune: indicates, whether parameters, assignments and functions,
+            that no ODE, observable or condition refers to, should be left
+            out, see `pruning.get_unused_entities`. The removed entities are
+            logged. Not possible with `streaming=True`.
+
+    Returns:
+        written_files: list containing `sbml_dir`, if the file was written,
+            empty if it was unchanged.
     """
     # check file extension in sbml_dir
-    if not (sbml_dir.endswith('.xml') or sbml_dir.endswith('.sbml')):
+    if not _strip_compression_extension(sbml_dir).endswith(('.xml', '.sbml')):
         raise ValueError('sbml_dir should end with .xml or .sbml.')
 
-    model_name = Path(sbml_dir).stem
+    if writer not in WRITERS:
+        raise ValueError(f'Invalid writer {writer}. Valid writers are '
+                         f'{WRITERS}.')
+
+    if prune and streaming:
+        raise ValueError('Pruning needs the whole model and is not possible '
+                         'with streaming=True.')
+
+    model_name = Path(_strip_compression_extension(sbml_dir)).stem
+
+    # the report of pruning is logged and not reproduced from the cache.
+    if prune:
+        cache = None
+
+    if cache is not None:
+        cache_key = cache.get_key(
+            yaml_dir,
+            converter='yaml2sbml',
+            sbml_name=os.path.basename(sbml_dir),
+            observables_as_assignments=observables_as_assignments,
+            check_level=check_level)
+        cached_files = cache.get(cache_key)
+
+        if cached_files is not None:
+            written = _copy_file(cached_files[os.path.basename(sbml_dir)],
+                                 sbml_dir,
+                                 skip_unchanged)
+            return [sbml_dir] if written else []
+
+    with _record_warnings(cache is not None) as caught_warnings:
+        if writer == 'direct':
+            written = _write_sbml_direct(yaml_dir,
+                                         sbml_dir,
+                                         observables_as_assignments,
+                                         check_level,
+                                         streaming,
+                                         skip_unchanged,
+                                         prune)
+        else:
+            sbml_document = _create_sbml_document(
+                _load_yaml_model(yaml_dir, streaming, prune),
+                model_name,
+                observables_as_assignments,
+                check_level)
+
+            # write sbml file
+            with _stage('write SBML'):
+                written = _write_sbml_document(sbml_document,
+                                               sbml_dir,
+                                               skip_unchanged)
 
-    sbml_as_string = _parse_yaml(yaml_dir,
-                                 model_name,
-                                 observables_as_assignments)
+    if cache is not None:
+        cache.put(cache_key,
+                  [sbml_dir],
+                  os.path.dirname(sbml_dir) or os.curdir,
+                  caught_warnings)
 
-    # write sbml file
-    with open(sbml_dir, 'w') as f_out:
-        f_out.write(sbml_as_string)
+    return [sbml_dir] if written else []
 
 
 def _parse_yaml(yaml_dir: str,
                 model_name: str,
-                observables_as_assignments: bool = False) -> str:
+                observables_as_assignments: bool = False,
+                check_level: str = 'full',
+                streaming: bool = False) -> str:
     """
     Parse a YAML file with the specification of ODEs to SBML.
 
@@ -54,6 +166,10 @@ def _parse_yaml(yaml_dir: str,
         model_name: model name as specified in the SBML
         observables_as_assignments: indicates if observables should be
             translated into parameter assignments
+        check_level: consistency check of the generated SBML, see
+            `_check_consistency`.
+        streaming: indicates, if the model should be converted entry by
+            entry, while the file is parsed, see `_stream_yaml_blocks`.
 
     Returns:
         sbml_string: a string containing the ODEs in SBML format
@@ -61,19 +177,115 @@ def _parse_yaml(yaml_dir: str,
     Raises:
         SystemExit
     """
-    yaml_dict = _load_yaml_file(yaml_dir)
-    _validate_yaml_from_dict(yaml_dict)
+    yaml_dict = _load_yaml_model(yaml_dir, streaming)
 
     sbml_string = _parse_yaml_dict(yaml_dict,
                                    model_name,
-                                   observables_as_assignments)
+                                   observables_as_assignments,
+                                   check_level)
 
     return sbml_string
 
 
+def _load_yaml_model(yaml_dir: str,
+                     streaming: bool = False,
+                     prune: bool = False):
+    """
+    Load and validate a YAML model.
+
+    Arguments:
+        yaml_dir: path to the YAML file with the ODEs specification
+        streaming: indicates, if the model should be read entry by entry,
+            while it is converted, see `_stream_yaml_blocks`.
+        prune: indicates, if unused entities should be removed, see
+            `pruning.prune_yaml_dict`. Ignored, if `streaming=True`.
+
+    Returns:
+        yaml_dict: the model as dict, or as iterator of (block_key, block)
+            pairs, if `streaming=True`.
+    """
+    if streaming:
+        return _stream_yaml_blocks(yaml_dir)
+
+    yaml_dict = _load_yaml_file(yaml_dir)
+    _validate_yaml_from_dict(yaml_dict)
+
+    if prune:
+        from .pruning import prune_yaml_dict
+        yaml_dict = prune_yaml_dict(yaml_dict)
+
+    return yaml_dict
+
+
+def _write_sbml_direct(yaml_dir: str,
+                       sbml_dir: str,
+                       observables_as_assignments: bool = False,
+                       check_level: str = 'full',
+                       streaming: bool = False,
+                       skip_unchanged: bool = False,
+                       prune: bool = False) -> bool:
+    """
+    Convert a YAML model to SBML, writing the XML directly, see `_XMLModel`.
+
+    The SBML is written to a temporary file, that replaces `sbml_dir` after
+    the conversion succeeded.
+
+    Arguments:
+        yaml_dir: path to the YAML file with the ODEs specification
+        sbml_dir: path to the SBML file
+        observables_as_assignments: indicates if observables should be
+            translated into parameter assignments
+        check_level: consistency check of the generated SBML, see
+            `_check_consistency`.
+        streaming: indicates, if the model should be converted entry by
+            entry, while the file is parsed, see `_stream_yaml_blocks`.
+        skip_unchanged: indicates, if an unchanged SBML file should not be
+            rewritten.
+        prune: indicates, if unused entities should be removed, see
+            `pruning.prune_yaml_dict`.
+
+    Returns:
+        written: indicates, whether `sbml_dir` was written.
+    """
+    if check_level not in CHECK_LEVELS:
+        raise ValueError(f'Invalid check_level {check_level}. Valid check '
+                         f'levels are {CHECK_LEVELS}.')
+
+    yaml_dict = _load_yaml_model(yaml_dir, streaming, prune)
+    model_name = Path(_strip_compression_extension(sbml_dir)).stem
+
+    model = _XMLModel()
+    model.setId(model_name)
+    model.setName(model_name)
+    _create_compartment(model)
+
+    sbml_dir_tmp = _get_tmp_file(sbml_dir)
+
+    try:
+        _convert_yaml_blocks_to_sbml(model,
+                                     yaml_dict,
+                                     observables_as_assignments)
+
+        with _stage('write SBML'), _open_file(sbml_dir_tmp, 'w') as f_out:
+            model.write(f_out)
+
+        if check_level != 'none':
+            with _stage('check consistency'):
+                _check_consistency(_read_sbml_document(sbml_dir_tmp),
+                                   check_level)
+
+        return _replace_file(sbml_dir_tmp, sbml_dir, skip_unchanged)
+
+    finally:
+        model.close()
+        if os.path.exists(sbml_dir_tmp):
+            os.remove(sbml_dir_tmp)
+
+
 def _parse_yaml_dict(yaml_dict: dict,
                      model_name: str,
-                     observables_as_assignments: bool = False) -> str:
+                     observables_as_assignments: bool = False,
+                     check_level: str = 'full') -> str:
     """
     Generate a string, containing the SBML from a `yaml_dict.
 
@@ -83,11 +295,54 @@ def _parse_yaml_dict(yaml_dict: dict,
         model_name: model name as specified in the SBML
         observables_as_assignments: indicates if observables should be
             translated into parameter assignments
+        check_level: consistency check of the generated SBML, see
+            `_check_consistency`.
 
     Returns:
         sbml_string: a string containing the ODEs in SBML format.
 
     """
+    document = _create_sbml_document(yaml_dict,
+                                     model_name,
+                                     observables_as_assignments,
+                                     check_level)
+
+    with _stage('write SBML'):
+        sbml_string = sbml.writeSBMLToString(document)
+
+    return sbml_string
+
+
+def _create_sbml_document(yaml_dict: dict,
+                          model_name: str,
+                          observables_as_assignments: bool = False,
+                          check_level: str = 'full',
+                          dependency_graph=None) -> 'sbml.SBMLDocument':
+    """
+    Generate an SBML document from a `yaml_dict` and check its consistency.
+
+    Arguments:
+        yaml_dict: dictionary, containing to the YAML file with the ODEs
+                   specification. Alternatively, an iterable of
+                   (block_key, block) pairs, see `_stream_yaml_blocks`.
+        model_name: model name as specified in the SBML
+        observables_as_assignments: indicates if observables should be
+            translated into parameter assignments
+        check_level: consistency check of the generated SBML, see
+            `_check_consistency`.
+        dependency_graph: optional `DependencyGraph`, that is built, while
+            the model is converted.
+
+    Returns:
+        document: the SBML document.
+
+    Raises:
+        SystemExit
+    """
+    if check_level not in CHECK_LEVELS:
+        raise ValueError(f'Invalid check_level {check_level}. Valid check '
+                         f'levels are {CHECK_LEVELS}.')
+
     try:
         document = sbml.SBMLDocument(3, 1)
     except ValueError:
@@ -106,11 +361,136 @@ def _parse_yaml_dict(yaml_dict: dict,
 
     _convert_yaml_blocks_to_sbml(model,
                                  yaml_dict,
-                                 observables_as_assignments)
+                                 observables_as_assignments,
+                                 dependency_graph)
+
+    with _stage('check consistency'):
+        _check_consistency(document, check_level)
+
+    return document
+
+
+def _write_sbml_document(document: 'sbml.SBMLDocument',
+                         sbml_file,
+                         skip_unchanged: bool = False) -> bool:
+    """
+    Write an SBML document to a file, without creating the SBML string.
+
+    libsbml serializes the document directly to the file, such that the
+    document and its serialization are not in memory at the same time.
+
+    Arguments:
+        document: the SBML document.
+        sbml_file: path to the SBML file, that is compressed, if it ends
+            with .gz, .bz2, .xz or .zst. Alternatively, a file-like object in
+            text or binary mode.
+        skip_unchanged: indicates, if an unchanged SBML file should not be
+            rewritten. Only used, if `sbml_file` is a path.
+
+    Returns:
+        written: indicates, whether the file was written.
+
+    Raises:
+        RuntimeError, if libsbml can not write the file.
+    """
+    if hasattr(sbml_file, 'write'):
+        # libsbml can only write to paths, hence the SBML is copied from a
+        # temporary file in chunks.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sbml_dir_tmp = os.path.join(tmp_dir, 'model.xml')
+            _write_sbml_document(document, sbml_dir_tmp)
+
+            mode = 'r' if isinstance(sbml_file, io.TextIOBase) else 'rb'
+            with open(sbml_dir_tmp, mode) as f_in:
+                shutil.copyfileobj(f_in, sbml_file)
 
-    # check consistency and give warnings for errors in SBML:
+        return True
+
+    sbml_dir_tmp = _get_tmp_file(sbml_file)
+
+    try:
+        if _is_native_sbml_file(sbml_file):
+            if not sbml.writeSBMLToFile(document, sbml_dir_tmp):
+                raise RuntimeError(f'Unable to write the SBML file '
+                                   f'{sbml_file}.')
+        else:
+            with _open_file(sbml_dir_tmp, 'wb') as f_out:
+                _write_sbml_document(document, f_out)
+
+        return _replace_file(sbml_dir_tmp, sbml_file, skip_unchanged)
+
+    finally:
+        if os.path.exists(sbml_dir_tmp):
+            os.remove(sbml_dir_tmp)
+
+
+def _read_sbml_document(sbml_dir: str) -> 'sbml.SBMLDocument':
+    """
+    Read an SBML file, that may be compressed.
+
+    Arguments:
+        sbml_dir: path to the SBML file.
+
+    Returns:
+        document: the SBML document.
+    """
+    if _is_native_sbml_file(sbml_dir):
+        return sbml.readSBMLFromFile(sbml_dir)
+
+    with _open_file(sbml_dir, 'r') as f_in:
+        return sbml.readSBMLFromString(f_in.read())
+
+
+def _is_native_sbml_file(sbml_dir: str) -> bool:
+    """
+    Check, whether libsbml itself can read and write the SBML file.
+
+    libsbml supports uncompressed files, and gzip and bzip2 compressed
+    files, if it was built with zlib and bzip2, respectively.
+    """
+    compression = _get_compression_extension(sbml_dir)
+
+    return compression is None \
+        or (compression == '.gz' and sbml.SBMLWriter.hasZlib()) \
+        or (compression == '.bz2' and sbml.SBMLWriter.hasBzip2())
+
+
+def _check_consistency(document: 'sbml.SBMLDocument',
+                       check_level: str = 'full'):
+    """
+    Check the consistency of the SBML and give warnings for errors.
+
+    The check level determines, which checks of libsbml are performed:
+        'none': no checks.
+        'identifiers': only the consistency of identifiers is checked.
+        'full': all checks, except for the consistency of units.
+
+    The time of the check is logged. It is recorded in profiles by the
+    callers, see `profiling.Profile`.
+
+    Arguments:
+        document: SBML document
+        check_level: one of 'none', 'identifiers' or 'full'
+    """
+    if check_level == 'none':
+        return
+
+    # consistency of units is never checked.
     document.setConsistencyChecks(sbml.LIBSBML_CAT_UNITS_CONSISTENCY, False)
 
+    # set all categories, since a document, that is checked repeatedly (see
+    # `YamlModel`), keeps them.
+    for category in [sbml.LIBSBML_CAT_GENERAL_CONSISTENCY,
+                     sbml.LIBSBML_CAT_MATHML_CONSISTENCY,
+                     sbml.LIBSBML_CAT_SBO_CONSISTENCY,
+                     sbml.LIBSBML_CAT_OVERDETERMINED_MODEL,
+                     sbml.LIBSBML_CAT_MODELING_PRACTICE]:
+        document.setConsistencyChecks(category, check_level == 'full')
+
+    document.getErrorLog().clearLog()
+
+    start_time = time.perf_counter()
+
     if document.checkConsistency():
 
         for error_num in range(document.getErrorLog().getNumErrors()):
@@ -119,12 +499,12 @@ def _parse_yaml_dict(yaml_dict: dict,
                     document.getErrorLog().getError(error_num).getMessage(),
                     RuntimeWarning)
 
-    sbml_string = sbml.writeSBMLToString(document)
-
-    return sbml_string
+    check_time = time.perf_counter() - start_time
+    logger.info(f'SBML consistency check ({check_level}) took '
+                f'{check_time:.3f} s.')
 
 
-def _create_compartment(model: sbml.Model):
+def _create_compartment(model: 'sbml.Model'):
     """
     Create a default compartment for the model.
 
@@ -159,9 +539,8 @@ def _load_yaml_file(yaml_file: str) -> dict:
     """
     try:
 
-        with open(yaml_file, 'r') as f_in:
-            yaml_contents = f_in.read()
-            yaml_dict = yaml.full_load(yaml_contents)
+        with _stage('load YAML'), _open_file(yaml_file, 'r') as f_in:
+            yaml_dict = _load_yaml(f_in)
 
     except ScannerError:
         raise RuntimeError('YAML file can not be parsed due to a Scanner '
@@ -171,15 +550,21 @@ def _load_yaml_file(yaml_file: str) -> dict:
     return yaml_dict
 
 
-def _convert_yaml_blocks_to_sbml(model: sbml.Model,
+def _convert_yaml_blocks_to_sbml(model: 'sbml.Model',
                                  yaml_dict: dict,
-                                 observables_as_assignments):
+                                 observables_as_assignments,
+                                 dependency_graph=None):
     """
     Convert each block in the YAML dictionary to SBML.
 
     Arguments:
         model: SBML model
-        yaml_dict: dictionary with YAML contents
+        yaml_dict: dictionary with YAML contents, or an iterable of
+            (block_key, block) pairs, see `_stream_yaml_blocks`.
+        observables_as_assignments: indicates if observables should be
+            translated into parameter assignments
+        dependency_graph: optional `DependencyGraph`, to which the entities
+            are added, while the blocks are read.
 
     Returns:
         model: SBML model with added entities
@@ -198,13 +583,34 @@ def _convert_yaml_blocks_to_sbml(model: sbml.Model,
                      'odes': _read_odes_block,
                      'conditions': _read_conditions_block}
 
-    for block in yaml_dict:
-        function_dict[block](model, yaml_dict[block])
+    if isinstance(yaml_dict, dict):
+        yaml_dict = yaml_dict.items()
+
+    cache_info = FORMULA_CACHE.info()
+
+    with _stage('build SBML'):
+        for block_key, block in yaml_dict:
+            if dependency_graph is None:
+                function_dict[block_key](model, block)
+                continue
+
+            block = dependency_graph.add_block(block_key, block)
+            function_dict[block_key](model, block)
+
+            # streamed entries, that the block was not read for, e.g. the
+            # conditions, are added to the graph here.
+            if not isinstance(block, (dict, list)):
+                for _ in block:
+                    pass
+
+    logger.info(f'Formula cache: '
+                f'{FORMULA_CACHE.hits - cache_info["hits"]} hits, '
+                f'{FORMULA_CACHE.misses - cache_info["misses"]} misses.')
 
     return model
 
 
-def _read_time_block(model: sbml.Model, time_dic: dict):
+def _read_time_block(model: 'sbml.Model', time_dic: dict):
     """
     Read and process the time block.
 
@@ -218,7 +624,7 @@ def _read_time_block(model: sbml.Model, time_dic: dict):
         _create_time(model, time_dic['variable'])
 
 
-def _create_time(model: sbml.Model, time_var: str):
+def _create_time(model: 'sbml.Model', time_var: str):
     """
     Create the time variable, add assignment to 'time'.
 
@@ -241,10 +647,10 @@ def _create_time(model: sbml.Model, time_var: str):
 
     time_assignment = model.createAssignmentRule()
     time_assignment.setVariable(time_var)
-    time_assignment.setMath(sbml.parseL3Formula('time'))
+    _set_math(time_assignment, 'time')
 
 
-def _read_parameters_block(model: sbml.Model, parameter_list: list):
+def _read_parameters_block(model: 'sbml.Model', parameter_list: list):
     """
     Read and process the parameters block in the YAML file.
 
@@ -264,7 +670,9 @@ def _read_parameters_block(model: sbml.Model, parameter_list: list):
             _create_parameter(model, parameter_def['parameterId'])
 
 
-def _create_parameter(model: sbml.Model, parameter_id: str, value: str = None):
+def _create_parameter(model: 'sbml.Model',
+                      parameter_id: str,
+                      value: str = None):
     """
     Create a parameter and add it to the given SBML model.
 
@@ -286,7 +694,7 @@ def _create_parameter(model: sbml.Model, parameter_id: str, value: str = None):
         k.setValue(float(value))
 
 
-def _read_assignments_block(model: sbml.Model, assignment_list: list):
+def _read_assignments_block(model: 'sbml.Model', assignment_list: list):
     """
     Read and process the assignments block in the YAML file.
 
@@ -306,7 +714,7 @@ def _read_assignments_block(model: sbml.Model, assignment_list: list):
                            assignment_def['formula'])
 
 
-def _create_assignment(model: sbml.Model, assignment_id: str, formula: str):
+def _create_assignment(model: 'sbml.Model', assignment_id: str, formula: str):
     """
     Create an assignment rule, that assigns <id> to <formula>.
 
@@ -327,17 +735,13 @@ def _create_assignment(model: sbml.Model, assignment_id: str, formula: str):
     assignment_rule = model.createAssignmentRule()
     assignment_rule.setVariable(assignment_id)
 
-    sbml_formula = sbml.parseL3Formula(formula)
-
-    if sbml_formula is not None:
-        assignment_rule.setMath(sbml.parseL3Formula(formula))
-    else:
+    if not _set_math(assignment_rule, formula):
         raise RuntimeError(f'Unable to generate assignment for formula '
                            f'{formula}, libsbml can not parse the given '
                            f'expression.')
 
 
-def _read_functions_block(model: sbml.Model, functions_list: list):
+def _read_functions_block(model: 'sbml.Model', functions_list: list):
     """
     Read and process the functions block in the YAML file.
 
@@ -358,7 +762,7 @@ def _read_functions_block(model: sbml.Model, functions_list: list):
                          function_def['formula'])
 
 
-def _create_function(model: sbml.Model,
+def _create_function(model: 'sbml.Model',
                      function_id: str,
                      arguments: str,
                      formula: str):
@@ -377,18 +781,14 @@ def _create_function(model: sbml.Model,
         raise RuntimeError(f'Unable to generate function with id '
                            f'{function_id}. Invalid SBML identifier.')
 
-    math = sbml.parseL3Formula('lambda(' + arguments + ', ' + formula + ')')
-
-    if math is not None:
-        f.setMath(math)
-    else:
+    if not _set_math(f, 'lambda(' + arguments + ', ' + formula + ')'):
         raise RuntimeError(f'Unable to generate assignment for funtion '
                            f'{function_id}, libsbml can not parse the given '
                            f'function expression, given by '
                            f'lambda({arguments} , {formula}).')
 
 
-def _read_odes_block(model: sbml.Model, odes_list: list):
+def _read_odes_block(model: 'sbml.Model', odes_list: list):
     """
     Read and process the odes block in the YAML file.
 
@@ -408,7 +808,7 @@ def _read_odes_block(model: sbml.Model, odes_list: list):
         _create_rate_rule(model, ode_def['stateId'], ode_def['rightHandSide'])
 
 
-def _create_species(model: sbml.Model, species_id: str, initial_amount: str):
+def _create_species(model: 'sbml.Model', species_id: str, initial_amount: str):
     """
     Create a species and add it to the SBML model.
 
@@ -431,7 +831,7 @@ def _create_species(model: sbml.Model, species_id: str, initial_amount: str):
         init = model.createInitialAssignment()
         init.setId('init_' + species_id)
         init.setSymbol(species_id)
-        init.setMath(sbml.parseL3Formula(initial_amount))
+        _set_math(init, initial_amount)
 
     s.setConstant(False)
     s.setBoundaryCondition(False)
@@ -441,7 +841,7 @@ def _create_species(model: sbml.Model, species_id: str, initial_amount: str):
     return s
 
 
-def _create_rate_rule(model: sbml.Model, species_id: str, formula: str):
+def _create_rate_rule(model: 'sbml.Model', species_id: str, formula: str):
     """
     Create an SBML rateRule for a species and add it to the SBML model.
 
@@ -455,15 +855,44 @@ def _create_rate_rule(model: sbml.Model, species_id: str, formula: str):
     r = model.createRateRule()
     r.setId('d_dt_' + species_id)
     r.setVariable(species_id)
-    math_ast = sbml.parseL3Formula(formula)
-    if math_ast is None:
+    if not _set_math(r, formula):
         raise RuntimeError(f'Unable to generate the rate rule for the state '
                            f'{species_id}, libsbml can not parse the right-'
                            f'hand side, given by {formula}).')
-    r.setMath(math_ast)
 
 
-def _read_observables_block(model: sbml.Model,
+def _set_math(sbml_element, formula: str) -> bool:
+    """
+    Set the math of an SBML element to a formula.
+
+    The formula is parsed via the `FORMULA_CACHE`, such that repeated
+    formulas are parsed only once. Elements of the direct writer get the
+    cached MathML.
+
+    Arguments:
+        sbml_element: SBML element with math, e.g. a rate rule.
+        formula: the formula in the infix notation of libsbml.
+
+    Returns:
+        False, if libsbml can not parse the formula, True otherwise.
+    """
+    if isinstance(sbml_element, _XMLElement):
+        mathml = FORMULA_CACHE.get_mathml(formula)
+        if mathml is None:
+            return False
+        sbml_element.setMathML(mathml)
+
+    else:
+        # setMath copies the tree, a clone is not necessary.
+        math_ast = FORMULA_CACHE.parse(formula, clone=False)
+        if math_ast is None:
+            return False
+        sbml_element.setMath(math_ast)
+
+    return True
+
+
+def _read_observables_block(model: 'sbml.Model',
                             observable_list: list,
                             observables_as_assignments: bool):
     """
@@ -490,7 +919,7 @@ def _read_observables_block(model: sbml.Model,
             'have an effect on the output when called via yaml2petab')
 
 
-def _read_conditions_block(model: sbml.Model, conditions_list: list):
+def _read_conditions_block(model: 'sbml.Model', conditions_list: list):
     """
     Read and process the conditions block in the YAML file.
 
@@ -519,17 +948,135 @@ def main():
                         help='Optional argument, flag, which indicates, if '
                              'observables should be represented in the SBML'
                              'as assignments. Potential Values: 1/0 (yes/no).')
+    parser.add_argument('-c', '--check_level', type=str, default='full',
+                        choices=CHECK_LEVELS,
+                        help='Optional argument, consistency check of the '
+                             'generated SBML. Defaults to full.')
+    parser.add_argument('-w', '--writer', type=str, default='libsbml',
+                        choices=WRITERS,
+                        help='Optional argument, libsbml builds the model '
+                             'with libsbml, direct writes the XML directly, '
+                             'which is faster for large models. Defaults to '
+                             'libsbml.')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Optional argument, flag, which indicates, if '
+                             'the model should be converted while the YAML '
+                             'file is parsed. Reduces the memory for very '
+                             'large models.')
+    _add_cache_arguments(parser)
+    _add_skip_unchanged_argument(parser)
+    _add_profile_argument(parser)
+    _add_watch_arguments(parser)
+    _add_prune_argument(parser)
 
     args = parser.parse_args()
 
+    if args.watch and (args.streaming or args.writer != 'libsbml'):
+        parser.error('--watch keeps the model in memory and requires the '
+                     'writer libsbml without --streaming.')
+
+    if args.prune and (args.streaming or args.watch):
+        parser.error('--prune is not possible with --streaming or --watch.')
+
+    _log_to_console()
+
     print(f'Path to YAML file: {args.yaml_file}')
     print(f'Path to SBML file: {args.sbml_file}')
 
+    if args.watch:
+        from .watch import watch_yaml2sbml
+
+        print('Watching for changes, stop with Ctrl+C...')
+        with _print_profile(args.profile):
+            try:
+                watch_yaml2sbml(args.yaml_file,
+                                args.sbml_file,
+                                args.observables_as_assignments,
+                                args.check_level,
+                                args.watch_interval)
+            except KeyboardInterrupt:
+                pass
+        return
+
     print('Converting...')
 
-    yaml2sbml(args.yaml_file,
-              args.sbml_file,
-              args.observables_as_assignments)
+    with _print_profile(args.profile):
+        yaml2sbml(args.yaml_file,
+                  args.sbml_file,
+                  args.observables_as_assignments,
+                  args.check_level,
+                  _get_cache_from_args(args),
+                  args.skip_unchanged,
+                  args.streaming,
+                  args.writer,
+                  args.prune)
+
+
+def _add_cache_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments, that enable the conversion cache, to a CLI."""
+    parser.add_argument('--cache', action='store_true',
+                        help='Optional argument, flag, which indicates, if '
+                             'the conversion cache should be used. See '
+                             '`yaml2sbml_cache` to inspect or clear it.')
+    parser.add_argument('--cache_dir', type=str, default=None,
+                        help='Optional argument, directory of the conversion '
+                             'cache. Implies --cache.')
+
+
+def _add_skip_unchanged_argument(parser: argparse.ArgumentParser):
+    """Add the argument, that skips writing unchanged files, to a CLI."""
+    parser.add_argument('-s', '--skip_unchanged', action='store_true',
+                        help='Optional argument, flag, which indicates, if '
+                             'existing output files, that would not change, '
+                             'should be left untouched.')
+
+
+def _add_watch_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments of the watch mode, see `watch.py`, to a CLI."""
+    parser.add_argument('--watch', action='store_true',
+                        help='Optional argument, flag, which indicates, if '
+                             'the outputs should be rebuilt, whenever the '
+                             'input changes, until interrupted. Only the '
+                             'outputs, that are affected by a change, are '
+                             'rebuilt and only changed files are written. '
+                             'The cache is not used.')
+    parser.add_argument('--watch_interval', type=float, default=1.,
+                        help='Optional argument, seconds between two checks '
+                             'for changes in watch mode. Defaults to 1.')
+
+
+def _add_prune_argument(parser: argparse.ArgumentParser):
+    """Add the argument, that removes unused entities, to a CLI."""
+    parser.add_argument('--prune', action='store_true',
+                        help='Optional argument, flag, which indicates, if '
+                             'parameters, assignments and functions, that '
+                             'no ODE, observable or condition refers to, '
+                             'should be removed. The removed entities are '
+                             'printed.')
+
+
+def _get_cache_from_args(args: argparse.Namespace):
+    """Create the conversion cache, if enabled via the CLI arguments."""
+    if args.cache or args.cache_dir is not None:
+        return ConversionCache(args.cache_dir)
+
+    return None
+
+
+def _log_to_console():
+    """
+    Print information of yaml2sbml, e.g. timings, in the CLIs.
+
+    The handler is only added once, such that repeated calls in the same
+    process (e.g. in tests) do not print each message multiple times.
+    """
+    # the current stdout, which might have been replaced since the last call.
+    _CONSOLE_HANDLER.stream = sys.stdout
+
+    package_logger = logging.getLogger('yaml2sbml')
+    if _CONSOLE_HANDLER not in package_logger.handlers:
+        package_logger.addHandler(_CONSOLE_HANDLER)
+    package_logger.setLevel(logging.INFO)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,255 @@
+"""Read the blocks of a YAML model entry by entry, without loading it."""
+import functools
+
+import jsonschema
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.resolver import Resolver
+from yaml.scanner import ScannerError
+
+from .file_io import _open_file
+from .yaml_validation import _get_schema_validator, _validate_structure
+
+# Composing single nodes is not supported by the C loader of PyYAML. Hence,
+# the events are produced by the C parser (libyaml), if available, and nodes
+# are composed and constructed in Python, with the semantics of the safe
+# loader.
+try:
+    from yaml.cyaml import CParser
+
+    class _StreamingLoader(CParser, Composer, SafeConstructor, Resolver):
+        """Safe loader, that uses libyaml for parsing."""
+
+        def __init__(self, stream):
+            """Initialize the loader for a stream."""
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+
+except ImportError:
+    _StreamingLoader = yaml.SafeLoader
+
+
+def _stream_yaml_blocks(yaml_file: str):
+    """
+    Read the blocks of a YAML model, while the file is parsed.
+
+    Instead of building the dict of the whole model, the YAML events are
+    consumed block by block. Blocks, that are lists, are yielded as iterators
+    over their entries, which are parsed and validated against the schema
+    one at a time. Hence, only a single entry of the model is kept in memory
+    by this function. An iterator is exhausted, before the next block is
+    read.
+
+    The names of the blocks are read in a first pass over the file, such
+    that unknown and missing blocks are reported before any block is
+    yielded, with the same error as for the whole model.
+
+    Arguments:
+        yaml_file: path to the YAML model.
+
+    Yields:
+        (block_key, block): name and content of each block, where the
+            content of list blocks is an iterator over the entries.
+
+    Raises:
+        jsonschema.exceptions.ValidationError, if the model is invalid.
+        RuntimeError, if the YAML can not be parsed.
+        ValueError, if a block appears twice.
+    """
+    _validate_structure(dict.fromkeys(_parse_file(yaml_file,
+                                                  _read_block_keys)))
+
+    yield from _parse_file(yaml_file, _read_blocks)
+
+
+def _parse_file(yaml_file: str, read):
+    """
+    Parse a YAML file with the streaming loader.
+
+    Arguments:
+        yaml_file: path to the YAML model.
+        read: generator function, that is called with the loader.
+
+    Yields:
+        The items of `read`.
+    """
+    with _open_file(yaml_file, 'r') as f_in:
+        loader = _StreamingLoader(f_in)
+
+        try:
+            yield from read(loader)
+
+        except ScannerError:
+            raise RuntimeError('YAML file can not be parsed due to a Scanner '
+                               'Error. This commonly happens if formulas '
+                               'begin with a minus. Please set them inside of '
+                               'brackets "(...)" or quotation marks.')
+        finally:
+            loader.dispose()
+
+
+def _read_block_keys(loader: _StreamingLoader):
+    """
+    Read the names of the blocks of a YAML model, skipping their content.
+
+    Arguments:
+        loader: YAML loader of the model file.
+
+    Yields:
+        block_key: name of each block.
+    """
+    _read_mapping_start(loader)
+    block_keys = set()
+
+    while not loader.check_event(yaml.MappingEndEvent):
+        block_key = _read_node(loader)
+
+        if block_key in block_keys:
+            raise ValueError(f'Block {block_key} appears twice in the YAML '
+                             f'file.')
+        block_keys.add(block_key)
+        yield block_key
+
+        _skip_node(loader)
+
+
+def _read_blocks(loader: _StreamingLoader):
+    """
+    Read the top level mapping of a YAML model, see `_stream_yaml_blocks`.
+
+    The names of the blocks are expected to be checked already, see
+    `_read_block_keys`.
+
+    Arguments:
+        loader: YAML loader of the model file.
+
+    Yields:
+        (block_key, block): name and content of each block.
+    """
+    schema = _get_schema_validator().schema
+    _read_mapping_start(loader)
+
+    while not loader.check_event(yaml.MappingEndEvent):
+        block_key = _read_node(loader)
+        event = loader.peek_event()
+
+        if isinstance(event, yaml.SequenceStartEvent) \
+                and event.anchor is None \
+                and schema['properties'][block_key].get('type') == 'array':
+            loader.get_event()
+
+            entries = _read_entries(loader, block_key)
+            yield block_key, entries
+            # skip entries, that were not consumed.
+            for _ in entries:
+                pass
+
+            loader.get_event()
+
+        else:
+            block = _read_node(loader)
+            _validate(_get_block_validator(block_key), block, [block_key])
+            yield block_key, block
+
+
+def _read_mapping_start(loader: _StreamingLoader):
+    """
+    Read the events up to the top level mapping of a YAML model.
+
+    Arguments:
+        loader: YAML loader of the model file.
+
+    Raises:
+        jsonschema.exceptions.ValidationError, if the model is no mapping.
+    """
+    # stream and document start
+    loader.get_event()
+    if loader.check_event(yaml.DocumentStartEvent):
+        loader.get_event()
+
+    if not loader.check_event(yaml.MappingStartEvent):
+        raise jsonschema.exceptions.ValidationError(
+            'The YAML model has to be a mapping of blocks.')
+
+    loader.get_event()
+
+
+def _read_entries(loader: _StreamingLoader, block_key: str):
+    """
+    Read and validate the entries of a list block one by one.
+
+    Arguments:
+        loader: YAML loader, positioned after the start of the list.
+        block_key: name of the block.
+
+    Yields:
+        entry: the next entry of the block.
+    """
+    validator = _get_entry_validator(block_key)
+    index = 0
+
+    while not loader.check_event(yaml.SequenceEndEvent):
+        entry = _read_node(loader)
+        _validate(validator, entry, [block_key, index])
+
+        yield entry
+        index += 1
+
+
+def _read_node(loader: _StreamingLoader):
+    """Compose and construct the next node of the YAML file."""
+    return loader.construct_document(loader.compose_node(None, None))
+
+
+def _skip_node(loader: _StreamingLoader):
+    """Skip the events of the next node, without composing it."""
+    depth = 0
+
+    while True:
+        event = loader.get_event()
+
+        if isinstance(event, yaml.CollectionStartEvent):
+            depth += 1
+        elif isinstance(event, yaml.CollectionEndEvent):
+            depth -= 1
+
+        if depth == 0:
+            return
+
+
+def _validate(validator, instance, path: list):
+    """
+    Validate a part of the model.
+
+    Arguments:
+        validator: jsonschema validator for this part.
+        instance: part of the model.
+        path: position of the part in the model, e.g. ['odes', 3].
+
+    Raises:
+        jsonschema.exceptions.ValidationError, if the part is invalid.
+    """
+    error = jsonschema.exceptions.best_match(validator.iter_errors(instance))
+
+    if error is not None:
+        error.path.extendleft(reversed(path))
+        raise error
+
+
+@functools.lru_cache(maxsize=None)
+def _get_block_validator(block_key: str):
+    """Get a validator for a whole block of the model."""
+    validator = _get_schema_validator()
+
+    return type(validator)(validator.schema['properties'][block_key])
+
+
+@functools.lru_cache(maxsize=None)
+def _get_entry_validator(block_key: str):
+    """Get a validator for a single entry of a list block."""
+    validator = _get_schema_validator()
+
+    return type(validator)(validator.schema['properties'][block_key]['items'])
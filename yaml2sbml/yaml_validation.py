@@ -1,10 +1,13 @@
 """Validator of the input yaml."""
+import functools
 import os
-import yaml
 import jsonschema
 from yaml.scanner import ScannerError
 import argparse
 
+from .file_io import _load_yaml, _open_file
+from .profiling import _stage, _add_profile_argument, _print_profile
+
 
 SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)),
                       "yaml_schema.yaml")
@@ -22,9 +25,8 @@ def validate_yaml(yaml_dir: str):
     """
     try:
 
-        with open(yaml_dir, 'r') as f_in:
-            yaml_contents = f_in.read()
-            yaml_dict = yaml.full_load(yaml_contents)
+        with _stage('load YAML'), _open_file(yaml_dir, 'r') as f_in:
+            yaml_dict = _load_yaml(f_in)
 
     except ScannerError:
         raise RuntimeError('YAML file can not be parsed due to a Scanner '
@@ -43,15 +45,74 @@ def _validate_yaml_from_dict(yaml_dict: dict):
     Arguments:
         yaml_dict: YAML model as dict.
 
+    Raises:
+        jsonschema.exceptions.ValidationError, if the model is invalid.
+    """
+    validator = _get_schema_validator()
+
+    # raise the most relevant error, as done by `jsonschema.validate`
+    with _stage('validate schema'):
+        error = jsonschema.exceptions.best_match(
+            validator.iter_errors(yaml_dict))
+    if error is not None:
+        raise error
+
+
+@functools.lru_cache(maxsize=None)
+def _get_schema_validator():
+    """
+    Load the SCHEMA and compile it into a validator.
+
+    The schema is read, checked and compiled only once per process, the
+    validator is reused for all further validations.
+
     Returns:
-        jsonschema.validate
+        validator: jsonschema validator for the yaml2sbml format.
     """
-    # read in SCHEMA
     with open(SCHEMA, 'r') as f_in:
-        yaml_contents = f_in.read()
-        schema = yaml.full_load(yaml_contents)
+        schema = _load_yaml(f_in)
+
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
 
-    jsonschema.validate(instance=yaml_dict, schema=schema)
+    return validator_class(schema)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_structure_validator():
+    """
+    Compile the top level of the SCHEMA into a validator.
+
+    The blocks are accepted with any content, such that only the names of
+    the blocks and the required blocks are checked.
+
+    Returns:
+        validator: jsonschema validator for the blocks of a model.
+    """
+    validator = _get_schema_validator()
+    schema = dict(validator.schema)
+    schema['properties'] = {block_key: {}
+                            for block_key in schema['properties']}
+
+    return type(validator)(schema)
+
+
+def _validate_structure(yaml_dict: dict):
+    """
+    Validate the names of the blocks of a model, but not their content.
+
+    Arguments:
+        yaml_dict: YAML model as dict, or a dict with the block names as
+            keys.
+
+    Raises:
+        jsonschema.exceptions.ValidationError, if a block is unknown or a
+            required block is missing.
+    """
+    error = jsonschema.exceptions.best_match(
+        _get_structure_validator().iter_errors(yaml_dict))
+    if error is not None:
+        raise error
 
 
 def main():
@@ -63,13 +124,15 @@ def main():
     parser.add_argument('yaml_file', type=str,
                         help='Directory of yaml file, that '
                              'should be validated.')
+    _add_profile_argument(parser)
 
     args = parser.parse_args()
 
     print(f'Path to yaml file: {args.yaml_file}')
     print('Validating...')
 
-    validate_yaml(args.yaml_file)
+    with _print_profile(args.profile):
+        validate_yaml(args.yaml_file)
 
 
 if __name__ == '__main__':